@@ -0,0 +1,245 @@
+"""
+Feature Spec
+Declarative feature definitions compiled into one deduplicated computation graph.
+
+A spec is a list of (name, op, inputs, params) entries:
+    ('sma_fast', 'mean', ['close'], {'window': 10})
+    ('sma_ratio', 'div', ['sma_fast', 'sma_slow'], {})
+Inputs are other entries, candle columns or numeric constants.
+
+compile_spec():
+- builds the DAG and merges entries that compute the same thing (same op, params and
+  inputs after merging), so a rolling mean declared as 'sma_20' and as the Bollinger
+  middle band is computed once
+- run() / frame() evaluate the nodes the requested outputs need in one pass, in an order
+  that keeps few intermediate arrays alive; each array is released after its last use
+
+Windowed and arithmetic ops run on ta_kernels arrays; indicator ops go through ta_compat
+(backend switch, 'ta' fallback and cache_scope memoization apply).
+"""
+
+import numpy as np
+import pandas as pd
+import ta_compat as ta
+import ta_kernels as _k
+
+
+class Op:
+    """fn(*inputs, **params) -> array. series=True: inputs/result are Series on the frame index."""
+
+    def __init__(self, fn, series: bool = False, commutative: bool = False):
+        self.fn = fn
+        self.series = series
+        self.commutative = commutative
+
+
+def _divide(a, b):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.true_divide(a, b)
+
+
+def _pct_change(x, periods: int = 1):
+    """pandas pct_change(periods): x / x.shift(periods) - 1."""
+    return _divide(x, _k.shift(x, periods)) - 1
+
+
+OPS = {
+    # elementwise
+    'add': Op(np.add, commutative=True),
+    'sub': Op(np.subtract),
+    'mul': Op(np.multiply, commutative=True),
+    'div': Op(_divide),
+    'lt': Op(lambda x, y: np.less(x, y).astype(np.float64)),
+    'gt': Op(lambda x, y: np.greater(x, y).astype(np.float64)),
+    # windows
+    'shift': Op(_k.shift),
+    'pct_change': Op(_pct_change),
+    'mean': Op(_k.rolling_mean),
+    'std': Op(_k.rolling_std),
+    'min': Op(_k.rolling_min),
+    'max': Op(_k.rolling_max),
+    # indicators
+    'rsi': Op(lambda close, length: ta.rsi(close, length=length), series=True),
+    'roc': Op(lambda close, length: ta.roc(close, length=length), series=True),
+    'ema': Op(lambda close, length: ta.ema(close, length=length), series=True),
+    'atr': Op(lambda high, low, close, length: ta.atr(high, low, close, length=length), series=True),
+    'adx': Op(lambda high, low, close, length: ta.adx(high, low, close, length=length)[f'ADX_{length}'],
+              series=True),
+    'macd_hist': Op(lambda close, fast, slow, signal: ta.macd(close, fast=fast, slow=slow, signal=signal)
+                    .filter(like='MACDh').iloc[:, 0], series=True),
+}
+
+
+def register_op(name: str, fn, series: bool = False, commutative: bool = False):
+    """Make a new op available to specs."""
+    OPS[name] = Op(fn, series, commutative)
+
+
+class Plan:
+    """Evaluation order of the nodes behind a set of outputs, with their release points."""
+
+    def __init__(self, steps: list, release: list, outputs: dict):
+        self.steps = steps        # node keys in evaluation order
+        self.release = release    # per step: node keys whose last use it is
+        self.outputs = outputs    # output name -> node key
+
+    @property
+    def peak(self) -> int:
+        """Most computed arrays alive at once (outputs included)."""
+        live = peak = 0
+        for released in self.release:
+            live += 1
+            peak = max(peak, live)
+            live -= len(released)
+        return peak
+
+
+class FeatureGraph:
+    """Compiled spec: unique nodes {key: (op, input keys, params)} and name -> key."""
+
+    def __init__(self, nodes: dict, names: dict, declared: int):
+        self.nodes = nodes
+        self.names = names
+        self.declared = declared  # spec entries before merging
+        self._plans = {}
+
+    def plan(self, outputs=None) -> Plan:
+        """Evaluation plan for 'outputs' (all names by default); cached per output list."""
+        outputs = tuple(self.names if outputs is None else outputs)
+        plan = self._plans.get(outputs)
+        if plan is None:
+            plan = self._plans[outputs] = self._schedule(outputs)
+        return plan
+
+    def _need(self, key, memo: dict) -> int:
+        """Registers needed to evaluate a node (Sethi-Ullman number; sources and constants need none)."""
+        if key not in self.nodes:
+            return 0
+        if key not in memo:
+            needs = sorted((self._need(k, memo) for k in self.nodes[key][1]), reverse=True)
+            memo[key] = max([1] + [n + i for i, n in enumerate(needs)])
+        return memo[key]
+
+    def _schedule(self, outputs: tuple) -> Plan:
+        missing = [name for name in outputs if name not in self.names]
+        if missing:
+            raise KeyError(f"Unknown feature(s): {missing}")
+        targets = {name: self.names[name] for name in outputs}
+        memo, steps, seen = {}, [], set()
+
+        def visit(key):
+            if key in seen or key not in self.nodes:
+                return
+            seen.add(key)
+            # Costlier inputs first: their temporaries are gone before the cheap ones are built
+            for k in sorted(self.nodes[key][1], key=lambda k: -self._need(k, memo)):
+                visit(k)
+            steps.append(key)
+
+        for key in targets.values():
+            visit(key)
+
+        last_use = {}
+        for i, key in enumerate(steps):
+            for k in self.nodes[key][1]:
+                last_use[k] = i
+        kept = set(targets.values())
+        release = [[] for _ in steps]
+        for i, key in enumerate(steps):
+            if key not in kept:
+                release[last_use.get(key, i)].append(key)
+        return Plan(steps, release, targets)
+
+    def run(self, frame: pd.DataFrame, outputs=None) -> dict:
+        """{output name: float array} for the candle frame."""
+        plan = self.plan(outputs)
+        values = {}
+
+        def value(key):
+            kind, item = key[0], key[1]
+            if kind == 'const':
+                return item
+            if kind == 'col':
+                if item not in frame.columns:
+                    raise KeyError(f"Feature input column '{item}' not in frame")
+                return _k.as_array(frame[item])
+            return values[key]
+
+        for key, released in zip(plan.steps, plan.release):
+            op, inputs, params = self.nodes[key]
+            args = [value(k) for k in inputs]
+            if op.series:
+                # copy=False: the Series wraps the frame's own buffer, so cache_scope memoization can key on it
+                args = [pd.Series(a, index=frame.index, copy=False) if isinstance(a, np.ndarray) else a
+                        for a in args]
+                values[key] = op.fn(*args, **dict(params)).to_numpy(dtype=np.float64)
+            else:
+                values[key] = op.fn(*args, **dict(params))
+            for k in released:
+                del values[k]
+        return {name: values[key] for name, key in plan.outputs.items()}
+
+    def frame(self, frame: pd.DataFrame, outputs=None) -> pd.DataFrame:
+        """run() as a DataFrame on the frame's index, columns in 'outputs' order."""
+        return pd.DataFrame(self.run(frame, outputs), index=frame.index)
+
+    def stats(self) -> dict:
+        return {'declared': self.declared, 'nodes': len(self.nodes), 'peak': self.plan().peak}
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def compile_spec(spec: list) -> FeatureGraph:
+    """Build the deduplicated graph of a spec. Raises ValueError on unknown ops, duplicate names or cycles."""
+    entries = {}
+    for name, op, inputs, params in spec:
+        if name in entries:
+            raise ValueError(f"Feature '{name}' declared twice")
+        if op not in OPS:
+            raise ValueError(f"Unknown op '{op}' for feature '{name}'")
+        entries[name] = (op, list(inputs), dict(params or {}))
+
+    nodes, names, by_signature = {}, {}, {}
+    resolving = set()
+
+    def resolve(name):
+        if name in names:
+            return names[name]
+        if name in resolving:
+            raise ValueError(f"Cycle through feature '{name}'")
+        resolving.add(name)
+        op, inputs, params = entries[name]
+        keys = [('const', float(i)) if isinstance(i, (int, float)) else
+                resolve(i) if i in entries else ('col', i) for i in inputs]
+        if OPS[op].commutative:
+            keys.sort(key=repr)
+        signature = (op, tuple(keys), _freeze(params))
+        key = by_signature.get(signature)
+        if key is None:
+            key = by_signature[signature] = ('node', name)
+            nodes[key] = (OPS[op], tuple(keys), _freeze(params))
+        resolving.discard(name)
+        names[name] = key
+        return key
+
+    for name in entries:
+        resolve(name)
+    return FeatureGraph(nodes, names, len(entries))
+
+
+_compiled = {}
+
+
+def compiled(spec: list) -> FeatureGraph:
+    """compile_spec() cached by spec contents (specs built per call share one graph)."""
+    key = _freeze(spec)
+    graph = _compiled.get(key)
+    if graph is None:
+        graph = _compiled[key] = compile_spec(spec)
+    return graph
@@ -150,6 +150,7 @@ async def get_candles(symbol: str, timeframe: str = "1h", limit: int = 100):
         raise HTTPException(status_code=500, detail=str(e))
 
 from strategies import get_strategy
+from utils.batch_inference import analyze_many
 
 class StrategyRequest(BaseModel):
     strategy_id: str
@@ -158,7 +159,9 @@ class StrategyRequest(BaseModel):
     parameters: dict = {}
 
 @app.post("/api/v1/strategy/run")
-async def run_strategy(req: StrategyRequest):
+def run_strategy(req: StrategyRequest):
+    # Plain def: FastAPI runs it in the threadpool, so analyze_many's wait for the batch window
+    # doesn't block the event loop and concurrent requests can join one micro-batch
     try:
         # 1. Fetch Data
         formatted_symbol = f"{req.symbol.upper()}/USDT"
@@ -173,8 +176,8 @@ async def run_strategy(req: StrategyRequest):
         if not strategy:
             raise HTTPException(status_code=404, detail="Strategy not found")
             
-        # 3. Analyze
-        result = strategy.analyze(df)
+        # 3. Analyze (model call joins the current inference batch)
+        result = analyze_many([(strategy, df)])[0]
         
         return {
             "strategy": strategy.name,
@@ -185,6 +188,13 @@ async def run_strategy(req: StrategyRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+from utils.model_registry import model_registry
+
+@app.get("/api/v1/models/stats")
+def model_stats():
+    """Model registry shared by the API handlers and the trader thread."""
+    return model_registry.stats()
+
 from backtest_engine import SimpleBacktester
 
 class BacktestRequest(BaseModel):
@@ -9,7 +9,8 @@ import pandas as pd
 from datetime import datetime
 from paper_config import PAPER_PORTFOLIO, CAPITAL_PER_ASSET
 from strategies import get_strategy
-from utils.data_loader import fetch_crypto, fetch_macro_data, merge_data
+from utils.data_loader import fetch_crypto, fetch_crypto_many, fetch_macro_data, merge_data
+from utils.model_registry import model_registry
 import warnings
 import firebase_admin
 from firebase_admin import credentials, firestore
@@ -152,19 +153,20 @@ def run_live_cycle():
     portfolio_stats = pm.get_stats()
     print(f"[PORTFOLIO] Balance: ${portfolio_stats['balance']:.2f} | Trades: {portfolio_stats['total_trades']} | Win Rate: {portfolio_stats['win_rate']:.1f}%")
     
-    macro_df = fetch_macro_data() # Refresh macro once per cycle
+    macro_df = fetch_macro_data() # Cached; only stale series are refreshed
+    
+    # 1. Fetch Real-time Data for the whole portfolio in one concurrent stage
+    crypto_frames = fetch_crypto_many([item['symbol'] for item in PAPER_PORTFOLIO])
     
     current_prices = {}
     signals = []
+    ready = []
     
     for item in PAPER_PORTFOLIO:
         sym = item['symbol']
         strat_name = item['strategy']
-        desc = item['desc']
         
-        # 1. Fetch Real-time Data (Simulated via OHLCV for now)
-        # In real prod, this would hit specific 'ticker' endpoint
-        crypto_df = fetch_crypto(sym)
+        crypto_df = crypto_frames.get(sym)
         if crypto_df is None: continue
         
         full_df = merge_data(crypto_df, macro_df)
@@ -173,7 +175,7 @@ def run_live_cycle():
         # Use simple string concatenation or path join relative to DATA_DIR
         import os
         model_dir = os.path.join(DATA_DIR, f"paper_{strat_name}_{sym.replace('/', '_')}")
-        strategy = get_strategy(strat_name, {"model_dir": model_dir})
+        strategy = get_strategy(strat_name, {"model_dir": model_dir, "stream_features": True})
         
         # Check if model exists/trained
         # Accessing internal dict just to check
@@ -185,10 +187,18 @@ def run_live_cycle():
              except Exception as e:
                  print(f"  [!] Training failed for {sym}: {e}")
                  continue
-             
-        # 3. Predict (Live Candle)
-        # We pass the full history up to NOW
+        
+        ready.append((item, strategy, full_df))
+    
+    # 3. Predict (Live Candle)
+    # We pass the full history up to NOW. Sequential on purpose: every symbol has its own
+    # model_dir, so no two symbols share a model and the micro-batcher (utils/batch_inference)
+    # would only add a thread hop and its wait window per symbol.
+    for item, strategy, full_df in ready:
         result = strategy.analyze(full_df)
+        sym = item['symbol']
+        strat_name = item['strategy']
+        desc = item['desc']
         
         signal = result.get('signal', 'NEUTRAL')
         conf = result.get('confidence', 0)
@@ -218,6 +228,11 @@ def run_live_cycle():
         # 4. Execute Paper Trade
         pm.execute_trade(sym, signal, price, conf)
         
+    # Models stay loaded across cycles; only changed files are read again
+    models = model_registry.stats()
+    print(f"[MODELS] {models['entries']} cached ({models['bytes'] / 1e6:.1f} MB) | "
+          f"hits {models['hits']} | loads {models['loads']} | reloads {models['reloads']}")
+
     # Save portfolio snapshot
     if current_prices:
         pm.save_snapshot(current_prices)
@@ -8,6 +8,7 @@ Usage:
 """
 
 import argparse
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from strategies import get_strategy
@@ -28,6 +29,14 @@ HYBRID_PORTFOLIO = {
     "Golden List (Std)": {"assets": std_assets, "strategy": "adaptive_ai"}
 }
 
+def signal_history(strategy, df, positions):
+    """Result of analyze(df.iloc[:p + 1]) for every row position p, from one batched pass."""
+    if hasattr(strategy, 'predict_history'):
+        history = strategy.predict_history(df, positions)
+    else:
+        history = strategy.generate_signals(df).iloc[positions]
+    return history.to_dict('records')
+
 def run_strategy(df, strategy_name, symbol, start_date, end_date, capital):
     """Run a single strategy backtest"""
     # Filter for test period
@@ -50,12 +59,12 @@ def run_strategy(df, strategy_name, symbol, start_date, end_date, capital):
     current_capital = capital
     trades_log = []
     
-    for i in range(20, len(test_df)):
+    # Each test day sees the data up to its date only (no lookahead): df[df['date'] <= date]
+    positions = np.searchsorted(df['date'].to_numpy(), test_df['date'].to_numpy()[20:], side='right') - 1
+    results = signal_history(strategy, df, positions)
+    
+    for i, result in zip(range(20, len(test_df)), results):
         current_date_val = test_df.iloc[i]['date']
-        # Feed data up to current point to prevent lookahead
-        window = df[df['date'] <= current_date_val]
-        
-        result = strategy.analyze(window)
         signal = result.get('signal', 'NEUTRAL')
         confidence = result.get('confidence', 0)
         mode = result.get('mode', 'unknown')
@@ -4,8 +4,10 @@ Scans top assets to find the best performers for AI strategies in the last 30 da
 """
 
 import ccxt
+import numpy as np
 import pandas as pd
 from strategies import get_strategy
+from run_backtest import signal_history
 from utils.data_loader import fetch_macro_data, merge_data
 import warnings
 from datetime import datetime, timedelta
@@ -55,14 +57,12 @@ def quick_backtest(symbol, df, strategy_name):
     trades = 0
     wins = 0
     
-    for i in range(len(test_df)):
-        # No lookahead: window is all data up to current test day
-        # But for speed in scanner, we just pass the row context simply or small window
-        # To be accurate we need full window.
-        current_date = test_df.iloc[i]['date']
-        window = df[df['date'] <= current_date]
-        
-        result = strategy.analyze(window)
+    # No lookahead: each test day sees all data up to its date (df[df['date'] <= date]),
+    # predicted for the whole test period in one batched pass
+    positions = np.searchsorted(df['date'].to_numpy(), test_df['date'].to_numpy(), side='right') - 1
+    results = signal_history(strategy, df, positions)
+    
+    for i, result in enumerate(results):
         signal = result.get('signal', 'NEUTRAL')
         price = test_df.iloc[i]['close']
         
@@ -10,6 +10,7 @@ import warnings
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.proteus_neo import ProteusNeo
+from utils.panel import panel_from_frames
 
 warnings.filterwarnings('ignore')
 
@@ -43,8 +44,6 @@ def run_showdown():
         df = df[df['date'] >= START_DATE].set_index('date').sort_index()
         if not df.empty: all_data[symbol] = df
 
-    master_timeline = pd.to_datetime(sorted(list(set().union(*[df.index for df in all_data.values()]))))
-    
     # Bots
     bots = {
         "Hunter 🦅": {"balance": INITIAL_CAPITAL, "asset": None, "units": 0, "trades": 0},
@@ -79,42 +78,37 @@ def run_showdown():
                 df.loc[idx, 'pred'] = np.argmax(probs, axis=1)
                 df.loc[idx, 'conf'] = np.max(probs, axis=1)
 
+    # One aligned panel: valid[r, j] replaces 'ts in df.index' on the union timeline;
+    # off-session bars (stale stock quotes) are invalid and session-less hours are dropped
+    panel = panel_from_frames(all_data, ('close', 'pred', 'conf'), timeframe='1h')
+    close, pred, conf, valid = panel['close'], panel['pred'], panel['conf'], panel.valid
+    best = {"Hunter 🦅": panel.best(conf, pred == 1), "Sniper 🎯": panel.best(conf, (pred == 1) & (conf > 0.85))}
+
     print("[*] Simulation Start...")
-    for ts in master_timeline[::4]: 
+    for r in range(0, len(panel.index), 4):
         for name, bot in bots.items():
-            if bot['asset']:
-                if ts in all_data[bot['asset']].index:
-                    row = all_data[bot['asset']].loc[ts]
-                    exit_signal = False
-                    if name == "Hunter 🦅" and row['pred'] == 0: exit_signal = True
-                    elif name == "Sniper 🎯" and row['conf'] < 0.6: exit_signal = True
-                    
-                    if exit_signal:
-                        bot['balance'] = bot['units'] * row['close'] * (1 - COMMISSION_RATE)
-                        bot['asset'] = None
-                        bot['units'] = 0
-            
-            if not bot['asset']:
-                best_s, best_c = None, 0
-                for s, df in all_data.items():
-                    if ts in df.index:
-                        r = df.loc[ts]
-                        if name == "Hunter 🦅" and r['pred'] == 1:
-                            if r['conf'] > best_c: best_s, best_c = s, r['conf']
-                        elif name == "Sniper 🎯" and r['pred'] == 1 and r['conf'] > 0.85:
-                            if r['conf'] > best_c: best_s, best_c = s, r['conf']
+            j = bot['asset']
+            if j is not None and valid[r, j]:
+                exit_signal = False
+                if name == "Hunter 🦅" and pred[r, j] == 0: exit_signal = True
+                elif name == "Sniper 🎯" and conf[r, j] < 0.6: exit_signal = True
                 
-                if best_s:
-                    bot['units'] = (bot['balance'] * (1 - COMMISSION_RATE)) / all_data[best_s].loc[ts, 'close']
-                    bot['asset'] = best_s
-                    bot['balance'] = 0
-                    bot['trades'] += 1
+                if exit_signal:
+                    bot['balance'] = bot['units'] * close[r, j] * (1 - COMMISSION_RATE)
+                    bot['asset'] = None
+                    bot['units'] = 0
+            
+            if bot['asset'] is None and best[name][r] >= 0:
+                bot['asset'] = int(best[name][r])
+                bot['units'] = (bot['balance'] * (1 - COMMISSION_RATE)) / close[r, bot['asset']]
+                bot['balance'] = 0
+                bot['trades'] += 1
 
     print("\n" + "="*80)
     print(f"🏁 FINAL SHOWDOWN RESULTS (2026)")
     print("="*80)
     for name, bot in bots.items():
-        val = bot['balance'] if not bot['asset'] else bot['units'] * all_data[bot['asset']].iloc[-1]['close']
+        val = bot['balance'] if bot['asset'] is None else bot['units'] * panel.last('close', panel.symbols[bot['asset']])
         tl_real = (val * USDTRY_2026) / TR_CUMULATIVE_INFLATION
         gain = (tl_real - (INITIAL_CAPITAL * USDTRY_2015)) / (INITIAL_CAPITAL * USDTRY_2015) * 100
         print(f"🤖 {name} | USD: ${val:,.2f} | Real 2015 TL: {tl_real:,.2f} TL | Net Real: {gain:+.2f}% | Trades: {bot['trades']}")
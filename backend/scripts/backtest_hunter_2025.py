@@ -9,6 +9,7 @@ import warnings
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.proteus_neo import ProteusNeo
+from utils.panel import panel_from_frames
 
 warnings.filterwarnings('ignore')
 
@@ -27,7 +28,7 @@ def run_master_hunter_2025():
 
     strategy = ProteusNeo({"model_dir": MODEL_DIR})
     csv_files = glob.glob(os.path.join(DATA_DIR, "*_1h.csv"))
-    all_signals, all_prices = {}, {}
+    all_data = {}
     
     print("[*] Global Market Sync initiated...")
     for file_path in csv_files:
@@ -61,32 +62,29 @@ def run_master_hunter_2025():
                 probs = strategy.models[mode].predict_proba(X)
                 df.loc[mode_idx, 'signal'] = np.where(np.argmax(probs, axis=1) == 1, 1, -1)
         
-        all_signals[symbol] = df['signal']
-        all_prices[symbol] = df['close']
+        all_data[symbol] = df[['close', 'signal']]
 
-    master_timeline = pd.to_datetime(sorted(list(set().union(*[df.index for df in all_signals.values()]))))
+    # One aligned panel: valid[r, j] replaces 'ts in df.index' on the union timeline;
+    # off-session bars (stale stock quotes) are invalid and session-less hours are dropped
+    panel = panel_from_frames(all_data, ('close', 'signal'), timeframe='1h')
+    close, signal, valid = panel['close'], panel['signal'], panel.valid
+    first_buy = panel.best((signal == 1).astype(float))  # first symbol with a buy signal per hour
     balance = INITIAL_CAPITAL
-    current_asset, units, trade_count = None, 0, 0
+    current, units, trade_count = -1, 0, 0
 
-    print(f"[*] Hunter is scanning {len(master_timeline)} hourly windows...")
-    for ts in master_timeline:
-        if current_asset:
-            if ts in all_signals[current_asset].index:
-                if all_signals[current_asset].loc[ts] == -1:
-                    balance = units * all_prices[current_asset].loc[ts] * (1 - COMMISSION_RATE)
-                    current_asset, units = None, 0
+    print(f"[*] Hunter is scanning {len(panel.index)} hourly windows...")
+    for r in range(len(panel.index)):
+        if current >= 0 and valid[r, current] and signal[r, current] == -1:
+            balance = units * close[r, current] * (1 - COMMISSION_RATE)
+            current, units = -1, 0
         
-        if not current_asset:
-            for symbol in all_signals:
-                if ts in all_signals[symbol].index:
-                    if all_signals[symbol].loc[ts] == 1:
-                        current_asset = symbol
-                        units = (balance * (1 - COMMISSION_RATE)) / all_prices[current_asset].loc[ts]
-                        balance, trade_count = 0, trade_count + 1
-                        break
+        if current < 0 and first_buy[r] >= 0:
+            current = first_buy[r]
+            units = (balance * (1 - COMMISSION_RATE)) / close[r, current]
+            balance, trade_count = 0, trade_count + 1
 
-    if current_asset:
-        balance = units * all_prices[current_asset].iloc[-1]
+    if current >= 0:
+        balance = units * panel.last('close', panel.symbols[current])
 
     roi = (balance - INITIAL_CAPITAL) / INITIAL_CAPITAL * 100
     print("\n" + "="*80)
@@ -1,6 +1,5 @@
 import sys
 import os
-import glob
 import pandas as pd
 import numpy as np
 import json
@@ -10,10 +9,11 @@ import warnings
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.proteus_neo import ProteusNeo
+from utils.ohlcv_store import store
+from utils.panel import panel_from_frames
 
 warnings.filterwarnings('ignore')
 
-DATA_DIR = '../data/raw'
 MODEL_DIR = '../data/proteus_neo'
 START_DATE = '2015-01-01'
 INITIAL_CAPITAL = 10.0
@@ -31,17 +31,12 @@ def run_master_decider():
     print("="*80)
 
     # 1. Load Data
-    csv_files = glob.glob(os.path.join(DATA_DIR, "*_1h.csv"))
     all_data = {}
     print("[*] Syncing global markets...")
-    for f in csv_files:
-        symbol = os.path.basename(f).replace("_1h.csv", "")
-        df = pd.read_csv(f)
-        df['date'] = pd.to_datetime(df['time'], unit='ms')
-        df = df[df['date'] >= START_DATE].set_index('date').sort_index()
+    for symbol in store.symbols('1h'):
+        df = store.read(symbol, '1h', start=START_DATE).set_index('date')
         if not df.empty: all_data[symbol] = df
 
-    master_timeline = pd.to_datetime(sorted(list(set().union(*[df.index for df in all_data.values()]))))
     strategy = ProteusNeo({"model_dir": MODEL_DIR})
 
     # Pre-calculate Indicators & Regime Features
@@ -60,17 +55,23 @@ def run_master_decider():
         df.loc[df['rsi'] > 65, 'pred'] = 0
         df.loc[df['rsi'] > 70, 'conf'] = 0.90
 
+    # One aligned panel: valid[r, j] replaces 'ts in df.index' on the union timeline;
+    # off-session bars (stale stock quotes) are invalid and session-less hours are dropped
+    panel = panel_from_frames(all_data, ('close', 'volatility', 'pred', 'conf'), timeframe='1h')
+    close, volatility, pred, conf, valid = panel['close'], panel['volatility'], panel['pred'], panel['conf'], panel.valid
+    best = {"Hunter": panel.best(conf, pred == 1), "Sniper": panel.best(conf, (pred == 1) & (conf > 0.85))}
+
     # Simulation
     balance = INITIAL_CAPITAL
-    current_asset = None
+    current = -1
     units = 0
     trade_count = 0
     mode_stats = {"Hunter": 0, "Sniper": 0}
 
     print("[*] Master Decider is taking control...")
 
-    for ts in master_timeline[::4]:
-        global_vol = np.mean([all_data[s].loc[ts, 'volatility'] for s in all_data if ts in all_data[s].index])
+    for r in range(0, len(panel.index), 4):
+        global_vol = np.mean(volatility[r, valid[r]])
         
         active_mode = "Sniper"
         if global_vol > 2.5: active_mode = "Sniper"
@@ -78,38 +79,23 @@ def run_master_decider():
         
         mode_stats[active_mode] += 1
 
-        if current_asset:
-            if ts in all_data[current_asset].index:
-                row = all_data[current_asset].loc[ts]
-                exit_now = False
-                if active_mode == "Hunter" and row['pred'] == 0: exit_now = True
-                if active_mode == "Sniper" and row['conf'] < 0.5: exit_now = True
-                if exit_now:
-                    balance = units * row['close'] * (1 - COMMISSION_RATE)
-                    current_asset = None
-                    units = 0
+        if current >= 0 and valid[r, current]:
+            exit_now = False
+            if active_mode == "Hunter" and pred[r, current] == 0: exit_now = True
+            if active_mode == "Sniper" and conf[r, current] < 0.5: exit_now = True
+            if exit_now:
+                balance = units * close[r, current] * (1 - COMMISSION_RATE)
+                current = -1
+                units = 0
         
-        if not current_asset:
-            best_s, max_score = None, 0
-            for s, df in all_data.items():
-                if ts in df.index:
-                    r = df.loc[ts]
-                    can_buy = False
-                    if active_mode == "Hunter" and r['pred'] == 1: can_buy = True
-                    if active_mode == "Sniper" and r['pred'] == 1 and r['conf'] > 0.85: can_buy = True
-                    if can_buy and r['conf'] > max_score:
-                        max_score = r['conf']
-                        best_s = s
-            
-            if best_s:
-                price = all_data[best_s].loc[ts, 'close']
-                units = (balance * (1 - COMMISSION_RATE)) / price
-                current_asset = best_s
-                balance = 0
-                trade_count += 1
-
-    if current_asset:
-        balance = units * all_data[current_asset].iloc[-1]['close']
+        if current < 0 and best[active_mode][r] >= 0:
+            current = best[active_mode][r]
+            units = (balance * (1 - COMMISSION_RATE)) / close[r, current]
+            balance = 0
+            trade_count += 1
+
+    if current >= 0:
+        balance = units * panel.last('close', panel.symbols[current])
 
     tl_initial = INITIAL_CAPITAL * USDTRY_2015
     tl_nominal = balance * USDTRY_2026
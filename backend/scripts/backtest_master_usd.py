@@ -9,6 +9,7 @@ import warnings
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.proteus_neo import ProteusNeo
+from utils.panel import panel_from_frames
 
 warnings.filterwarnings('ignore')
 
@@ -36,7 +37,6 @@ def run_master_usd():
         df = df[df['date'] >= START_DATE].set_index('date').sort_index()
         if not df.empty: all_data[symbol] = df
 
-    master_timeline = pd.to_datetime(sorted(list(set().union(*[df.index for df in all_data.values()]))))
     strategy = ProteusNeo({"model_dir": MODEL_DIR})
 
     print("[*] Pre-calculating Global Intelligence...")
@@ -54,46 +54,40 @@ def run_master_usd():
         df.loc[df['rsi'] > 68, 'pred'] = 0
         df.loc[df['rsi'] > 68, 'conf'] = 0.92
 
+    # One aligned panel: valid[r, j] replaces 'ts in df.index' on the union timeline;
+    # off-session bars (stale stock quotes) are invalid and session-less hours are dropped
+    panel = panel_from_frames(all_data, ('close', 'volatility', 'pred', 'conf'), timeframe='1h')
+    close, volatility, pred, conf, valid = panel['close'], panel['volatility'], panel['pred'], panel['conf'], panel.valid
+    best = {"Sniper": panel.best(conf, (pred == 1) & (conf > 0.90)),
+            "Hunter": panel.best(conf, (pred == 1) & (conf > 0.80))}
+
     balance = INITIAL_CAPITAL
-    current_asset = None
+    current = -1
     units = 0
     trade_count = 0
     
     print("[*] Simulation Start (10 Years)...")
 
-    for ts in master_timeline[::4]:
-        active_assets = [s for s in all_data if ts in all_data[s].index]
-        if not active_assets: continue
+    for r in range(0, len(panel.index), 4):
+        if not valid[r].any(): continue
         
-        market_stress = np.mean([all_data[s].loc[ts, 'volatility'] for s in active_assets])
+        market_stress = np.mean(volatility[r, valid[r]])
         mode = "Sniper"
         if market_stress < 1.2: mode = "Hunter"
         
-        if current_asset:
-            if ts in all_data[current_asset].index:
-                row = all_data[current_asset].loc[ts]
-                if (mode == "Hunter" and row['pred'] == 0) or (mode == "Sniper" and row['conf'] < 0.6):
-                    balance = units * row['close'] * (1 - COMMISSION_RATE)
-                    current_asset = None
+        if current >= 0 and valid[r, current]:
+            if (mode == "Hunter" and pred[r, current] == 0) or (mode == "Sniper" and conf[r, current] < 0.6):
+                balance = units * close[r, current] * (1 - COMMISSION_RATE)
+                current = -1
         
-        if not current_asset:
-            best_s, max_c = None, 0
-            entry_conf = 0.90 if mode == "Sniper" else 0.80
-            for s in active_assets:
-                r = all_data[s].loc[ts]
-                if r['pred'] == 1 and r['conf'] > entry_conf:
-                    if r['conf'] > max_c:
-                        max_c = r['conf']
-                        best_s = s
-            if best_s:
-                price = all_data[best_s].loc[ts, 'close']
-                units = (balance * (1 - COMMISSION_RATE)) / price
-                current_asset = best_s
-                balance = 0
-                trade_count += 1
+        if current < 0 and best[mode][r] >= 0:
+            current = best[mode][r]
+            units = (balance * (1 - COMMISSION_RATE)) / close[r, current]
+            balance = 0
+            trade_count += 1
 
-    if current_asset:
-        balance = units * all_data[current_asset].iloc[-1]['close']
+    if current >= 0:
+        balance = units * panel.last('close', panel.symbols[current])
 
     real_value = balance / US_CUMULATIVE_INFLATION
     net_roi_real = (real_value - INITIAL_CAPITAL) / INITIAL_CAPITAL * 100
@@ -1,6 +1,5 @@
 import sys
 import os
-import glob
 import pandas as pd
 import numpy as np
 import xgboost as xgb
@@ -9,11 +8,12 @@ import warnings
 
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.event_calendar import event_engine
+from utils.omega_features import OMEGA_SET
+from utils.ohlcv_store import store
+from utils.feature_store import feature_store
 
 warnings.filterwarnings('ignore')
 
-DATA_DIR = '../data/raw'
 MODEL_PATH = '../data/proteus_omega/omega_brain.json'
 START_DATE = '2025-01-01'
 INITIAL_CAPITAL = 1000.0
@@ -29,24 +29,15 @@ def run_omega_5_slots_2025():
     model = xgb.XGBClassifier()
     model.load_model(MODEL_PATH)
 
-    csv_files = [f for f in glob.glob(os.path.join(DATA_DIR, "*_USDT_1h.csv"))]
+    symbols = [s for s in store.symbols('1h') if s.endswith('_USDT')]
     assets_data = {}
-    print(f"[*] Syncing {len(csv_files)} major crypto assets...")
-    for f in csv_files:
-        symbol = os.path.basename(f).replace("_1h.csv", "")
-        df = pd.read_csv(f)
-        df['date'] = pd.to_datetime(df['time'], unit='ms')
-        df = df[df['date'] >= '2024-12-01'].set_index('date').sort_index()
-        df['rsi'] = (df['close'].diff().apply(lambda x: max(x,0)).rolling(14).mean() / 
-                     df['close'].diff().apply(lambda x: abs(x)).rolling(14).mean() * 100).fillna(50)
-        df['micro_vol'] = df['close'].rolling(4).std().fillna(0)
-        df['macro_trend'] = df['close'].rolling(24).mean().fillna(df['close'])
-        df['whale_activity'] = (df['volume'] > df['volume'].rolling(24).mean() * 2.5).astype(int)
-        df['net_flow_proxy'] = (df['close'] - df['open']) * df['whale_activity']
-        ev = event_engine.get_event_features(df.index)
-        df = pd.concat([df, ev], axis=1)
-        feats = ['rsi', 'micro_vol', 'macro_trend', 'whale_activity', 'net_flow_proxy'] + [col for col in df.columns if 'event_' in col]
-        df['prob'] = model.predict_proba(df[feats])[:, 1]
+    print(f"[*] Syncing {len(symbols)} major crypto assets...")
+    for symbol in symbols:
+        df = store.read(symbol, '1h', start='2024-12-01').set_index('date')
+        # Omega rows come from the feature store: only candles added since the last run are computed
+        features = feature_store.load(symbol, '1h', OMEGA_SET, start='2024-12-01')
+        df = df.join(features)
+        df['prob'] = model.predict_proba(df[features.columns])[:, 1]
         assets_data[symbol] = df[df.index >= START_DATE]
 
     master_timeline = pd.to_datetime(sorted(list(set().union(*[df.index for df in assets_data.values()]))))
@@ -9,10 +9,10 @@ import warnings
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.event_calendar import event_engine
+from utils.resampler import resampler
 
 warnings.filterwarnings('ignore')
 
-DATA_DIR = '../data/omega'
 MODEL_PATH = '../data/proteus_omega/omega_brain.json'
 START_DATE = '2025-01-01'
 INITIAL_CAPITAL = 1000.0
@@ -33,16 +33,12 @@ def run_omega_prime_backtest():
     model.load_model(MODEL_PATH)
 
     print("[*] Reconstructing market memory with On-Chain Intelligence...")
-    btc_1h = pd.read_csv(os.path.join(DATA_DIR, 'BTC_USDT_1h.csv'))
-    btc_1h['date'] = pd.to_datetime(btc_1h['time'], unit='ms')
-    df = btc_1h.set_index('date').sort_index()
+    df = resampler.read('BTC/USDT', '1h').set_index('date')
     
     df['whale_activity'] = (df['volume'] > df['volume'].rolling(24).mean() * 3).astype(int)
     df['net_flow_proxy'] = (df['close'] - df['open']) * df['whale_activity']
     
-    btc_1d = pd.read_csv(os.path.join(DATA_DIR, 'BTC_USDT_1d.csv'))
-    btc_1d['date'] = pd.to_datetime(btc_1d['time'], unit='ms')
-    btc_1d = btc_1d.set_index('date').sort_index()
+    btc_1d = resampler.read('BTC/USDT', '1d').set_index('date')  # derived from the 1h store
     df['macro_trend'] = btc_1d['close'].reindex(df.index, method='ffill')
     df['micro_vol'] = df['close'].rolling(4).std()
     
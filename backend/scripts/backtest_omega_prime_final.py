@@ -8,7 +8,7 @@ import warnings
 
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.event_calendar import event_engine
+from utils.omega_features import add_omega_features, feature_columns
 
 warnings.filterwarnings('ignore')
 
@@ -42,22 +42,12 @@ def run_omega_prime_final():
     btc_1h['date'] = pd.to_datetime(btc_1h['time'], unit='ms')
     df = btc_1h.set_index('date').sort_index()
     
-    df['whale_activity'] = (df['volume'] > df['volume'].rolling(24).mean() * 3).astype(int)
-    df['net_flow_proxy'] = (df['close'] - df['open']) * df['whale_activity']
-    
     btc_1d = pd.read_csv(os.path.join(DATA_DIR, 'BTC_USDT_1d.csv'))
     btc_1d['date'] = pd.to_datetime(btc_1d['time'], unit='ms')
     btc_1d = btc_1d.set_index('date').sort_index()
-    df['macro_trend'] = btc_1d['close'].reindex(df.index, method='ffill')
-    df['micro_vol'] = df['close'].rolling(4).std()
-    
-    events = event_engine.get_event_features(df.index)
-    df = pd.concat([df, events], axis=1)
-    
-    df['rsi'] = (df['close'].diff().apply(lambda x: max(x,0)).rolling(14).mean() / 
-                 df['close'].diff().apply(lambda x: abs(x)).rolling(14).mean() * 100).fillna(50)
+    df = add_omega_features(df, whale_factor=3, daily_close=btc_1d['close'], fill=False)
     
-    features = ['rsi', 'micro_vol', 'macro_trend', 'whale_activity', 'net_flow_proxy'] + [col for col in df.columns if 'event_' in col]
+    features = feature_columns(df)
     test_df = df[df.index >= START_DATE].dropna()
     
     X = test_df[features]
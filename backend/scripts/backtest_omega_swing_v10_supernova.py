@@ -1,6 +1,5 @@
 import sys
 import os
-import glob
 import pandas as pd
 import numpy as np
 import xgboost as xgb
@@ -10,10 +9,10 @@ import warnings
 # Add paths
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.event_calendar import event_engine
+from utils.resampler import resampler
 
 warnings.filterwarnings('ignore')
 
-DATA_DIR = '../data/omega_4h'
 MODEL_PATH = '../data/proteus_omega_4h/omega_4h_brain.json'
 START_DATE = '2025-01-01'
 INITIAL_CAPITAL = 1000.0
@@ -30,14 +29,14 @@ def run_omega_swing_supernova():
     model = xgb.XGBClassifier()
     model.load_model(MODEL_PATH)
 
-    csv_files = glob.glob(os.path.join(DATA_DIR, "*_4h.csv"))
+    symbols = resampler.symbols('4h')  # derived from the 1h store
+    if not symbols:
+        print("[!] No 1h history in the store, run fetch_full_history.py first.")
+        return
     assets_data, btc_df = {}, None
     print(f"[*] Syncing assets and building market-guard...")
-    for f in csv_files:
-        symbol = os.path.basename(f).replace("_4h.csv", "")
-        df = pd.read_csv(f)
-        df['date'] = pd.to_datetime(df['time'], unit='ms')
-        df = df[df['date'] >= '2024-10-01'].set_index('date').sort_index()
+    for symbol in symbols:
+        df = resampler.read(symbol, '4h', start='2024-10-01').set_index('date')
         df['rsi'] = (df['close'].diff().apply(lambda x: max(x,0)).rolling(14).mean() / 
                      df['close'].diff().apply(lambda x: abs(x)).rolling(14).mean() * 100).fillna(50)
         df['sma_ratio'] = (df['close'].rolling(10).mean() / df['close'].rolling(30).mean()).fillna(1.0)
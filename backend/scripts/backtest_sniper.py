@@ -1,6 +1,5 @@
 import sys
 import os
-import glob
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -9,10 +8,11 @@ import warnings
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.proteus_neo import ProteusNeo
+from utils.ohlcv_store import store
+from utils.regimes import hourly_regimes
 
 warnings.filterwarnings('ignore')
 
-DATA_DIR = '../data/raw'
 MODEL_DIR = '../data/proteus_neo'
 START_DATE = '2024-01-01'
 END_DATE = '2025-12-31'
@@ -30,7 +30,6 @@ def run_sniper_backtest():
     print("="*80)
 
     strategy = ProteusNeo({"model_dir": MODEL_DIR})
-    csv_files = glob.glob(os.path.join(DATA_DIR, "*_1h.csv"))
     
     all_signals = {}
     all_prices = {}
@@ -39,12 +38,8 @@ def run_sniper_backtest():
     
     print("[*] Loading assets and calculating Sniper Scores...")
     
-    for file_path in csv_files:
-        symbol = os.path.basename(file_path).replace("_1h.csv", "")
-        df = pd.read_csv(file_path)
-        df['date'] = pd.to_datetime(df['time'], unit='ms')
-        mask = (df['date'] >= START_DATE) & (df['date'] <= END_DATE)
-        df = df[mask].set_index('date')
+    for symbol in store.symbols('1h'):
+        df = store.read(symbol, '1h', START_DATE, END_DATE).set_index('date')
         if len(df) < 100: continue
         
         from ta.momentum import RSIIndicator
@@ -52,22 +47,15 @@ def run_sniper_backtest():
         df['sma_ratio'] = df['close'].rolling(10).mean() / df['close'].rolling(30).mean()
         df = df.fillna(0)
         
-        trend = df['close'].pct_change(20) * 100
-        vol = df['close'].rolling(20).std() / df['close'].rolling(20).mean() * 100
+        vol = df['close'].rolling(20).std() / df['close'].rolling(20).mean() * 100  # position sizing
         
-        is_crypto = "USDT" in symbol
-        t_thresh = 0.5 if not is_crypto else 1.0
-        v_thresh = 1.0 if not is_crypto else 2.0
+        regimes = hourly_regimes(df, crypto="USDT" in symbol)
         
         df['signal'] = 0
         df['confidence'] = 0.0 # Default confidence
         
         for mode in ['bull', 'bear', 'sideways']:
-            if mode == 'bull': m_mask = (trend > t_thresh) & (vol < v_thresh)
-            elif mode == 'bear': m_mask = (trend < -t_thresh) & (vol < v_thresh)
-            else: m_mask = ~((trend > t_thresh) & (vol < v_thresh)) & ~((trend < -t_thresh) & (vol < v_thresh))
-            
-            mode_idx = df[m_mask].index
+            mode_idx = df.index[regimes.mask(mode)]
             if len(mode_idx) == 0: continue
             
             if strategy.models[mode]:
@@ -9,6 +9,7 @@ import warnings
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.proteus_neo import ProteusNeo
+from utils.panel import panel_from_frames
 
 warnings.filterwarnings('ignore')
 
@@ -29,7 +30,7 @@ def run_sniper_long_term():
 
     strategy = ProteusNeo({"model_dir": MODEL_DIR})
     csv_files = glob.glob(os.path.join(DATA_DIR, "*_1h.csv"))
-    all_signals, all_prices, all_confidences, all_vols = {}, {}, {}, {}
+    all_data = {}
     
     print("[*] Syncing 5 years of global market movements...")
     for file_path in csv_files:
@@ -65,37 +66,30 @@ def run_sniper_long_term():
                 df.loc[mode_idx, 'conf'] = probs[:, 1]
                 df.loc[mode_idx, 'signal'] = np.where(probs[:, 1] > CONFIDENCE_THRESHOLD, 1, -1)
         
-        all_signals[symbol] = df['signal']
-        all_prices[symbol] = df['close']
-        all_confidences[symbol] = df['conf']
-        all_vols[symbol] = vol
+        df['vol'] = vol
+        all_data[symbol] = df[['close', 'conf', 'vol']]
 
-    master_timeline = pd.to_datetime(sorted(list(set().union(*[df.index for df in all_signals.values()]))))
-    balance, current_asset, units, trade_count = INITIAL_CAPITAL, None, 0, 0
+    # One aligned panel: valid[r, j] replaces 'ts in df.index' on the union timeline;
+    # off-session bars (stale stock quotes) are invalid and session-less hours are dropped
+    panel = panel_from_frames(all_data, ('close', 'conf', 'vol'), timeframe='1h')
+    close, conf, vol, valid = panel['close'], panel['conf'], panel['vol'], panel.valid
+    with np.errstate(invalid='ignore'):
+        best = panel.best(conf * vol, (conf > CONFIDENCE_THRESHOLD) & (vol > VOLATILITY_THRESHOLD))
+    balance, current, units, trade_count = INITIAL_CAPITAL, -1, 0, 0
 
-    print(f"[*] Sniper is watching {len(master_timeline)} hourly windows...")
-    for ts in master_timeline:
-        if current_asset:
-            if ts in all_signals[current_asset].index:
-                if all_confidences[current_asset].loc[ts] < 0.45:
-                    balance = units * all_prices[current_asset].loc[ts] * (1 - COMMISSION_RATE)
-                    current_asset, units = None, 0
+    print(f"[*] Sniper is watching {len(panel.index)} hourly windows...")
+    for r in range(len(panel.index)):
+        if current >= 0 and valid[r, current] and conf[r, current] < 0.45:
+            balance = units * close[r, current] * (1 - COMMISSION_RATE)
+            current, units = -1, 0
         
-        if not current_asset:
-            best_s, max_s = None, 0
-            for symbol in all_signals:
-                if ts in all_signals[symbol].index:
-                    conf, v = all_confidences[symbol].loc[ts], all_vols[symbol].loc[ts]
-                    if conf > CONFIDENCE_THRESHOLD and v > VOLATILITY_THRESHOLD:
-                        if conf * v > max_s:
-                            max_s, best_s = conf * v, symbol
-            if best_s:
-                current_asset = best_s
-                units = (balance * (1 - COMMISSION_RATE)) / all_prices[current_asset].loc[ts]
-                balance, trade_count = 0, trade_count + 1
+        if current < 0 and best[r] >= 0:
+            current = best[r]
+            units = (balance * (1 - COMMISSION_RATE)) / close[r, current]
+            balance, trade_count = 0, trade_count + 1
 
-    if current_asset:
-        balance = units * all_prices[current_asset].iloc[-1]
+    if current >= 0:
+        balance = units * panel.last('close', panel.symbols[current])
 
     roi = (balance - INITIAL_CAPITAL) / INITIAL_CAPITAL * 100
     print("\n" + "="*80)
@@ -9,6 +9,7 @@ import warnings
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.proteus_neo import ProteusNeo
+from utils.regimes import hourly_regimes
 
 warnings.filterwarnings('ignore')
 
@@ -64,15 +65,7 @@ def run_world_backtest():
         test_df = test_df.fillna(0)
         
         # Mode Detection (Same as Training)
-        trend = test_df['close'].pct_change(20) * 100
-        vol = test_df['close'].rolling(20).std() / test_df['close'].rolling(20).mean() * 100
-        
-        t_thresh = 0.5 if not is_crypto else 1.0
-        v_thresh = 1.0 if not is_crypto else 2.0
-        
-        modes = pd.Series('sideways', index=test_df.index)
-        modes[(trend > t_thresh) & (vol < v_thresh)] = 'bull'
-        modes[(trend < -t_thresh) & (vol < v_thresh)] = 'bear'
+        modes = hourly_regimes(test_df, crypto=is_crypto).modes()
         
         # Predict
         test_df['signal'] = 0
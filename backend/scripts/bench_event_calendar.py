@@ -0,0 +1,110 @@
+import sys
+import os
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.event_calendar import EventCalendar
+
+HOURS = 24 * 365 * 10
+REPEATS = 3
+
+def reference_features(events, df_dates):
+    """The original per-event loop, unchanged (each event overwrites its type's column: the last one wins)."""
+    features = pd.DataFrame(index=df_dates)
+    
+    # Günleri datetime'a çevir
+    df_dates = pd.to_datetime(df_dates)
+    
+    # Her bir olay tipi için 'Gün Kaldı' veya 'Gün Geçti' özelliği
+    for event_date, event_name, power in events:
+        e_date = pd.to_datetime(event_date)
+        # Olay anına olan uzaklık (gün bazında)
+        diff = (df_dates - e_date).days
+        # Sadece olayın 30 gün öncesi ve 30 gün sonrasını işaretle
+        features[f'event_{event_name}'] = np.where((diff >= -30) & (diff <= 30), power / (abs(diff) + 1), 0)
+        
+    return features
+
+def reference_max(events, df_dates):
+    """The same loop keeping every event: each day takes the strongest event of its type (combine='max')."""
+    features = pd.DataFrame(index=df_dates)
+    df_dates = pd.to_datetime(df_dates)
+    for event_date, event_name, power in events:
+        diff = (df_dates - pd.to_datetime(event_date)).days
+        value = np.where((diff >= -30) & (diff <= 30), power / (abs(diff) + 1), 0)
+        column = f'event_{event_name}'
+        features[column] = np.maximum(features[column], value) if column in features else value
+    return features
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+def macro_calendar(path):
+    """The ten crypto events + FOMC meetings (8 a year) and monthly CPI releases, 2015-2026."""
+    rows = open(EventCalendar().path).read().strip().splitlines()
+    for year in range(2015, 2027):
+        for month in range(1, 13):
+            rows.append(f"{year}-{month:02d}-12,CPI_RELEASE,5")
+            if month % 3 != 2:
+                rows.append(f"{year}-{month:02d}-{15 + month % 3:02d},FOMC_MEETING,6")
+    with open(path, 'w') as f:
+        f.write("\n".join(rows) + "\n")
+
+if __name__ == "__main__":
+    hourly = pd.date_range("2016-01-01", periods=HOURS, freq='h')
+    cases = {
+        'hourly 10y': hourly,
+        'hourly 10y (UTC tz)': hourly.tz_localize('UTC'),
+        'irregular': hourly[np.sort(np.random.default_rng(0).choice(HOURS, HOURS // 7, replace=False))],
+    }
+    failures = 0
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "events.csv")
+        macro_calendar(path)
+        calendars = (('10 events', EventCalendar()), ('macro calendar', EventCalendar(path)),
+                     ("macro calendar, combine='max'", EventCalendar(path, combine='max')))
+        for label, calendar in calendars:
+            reference = reference_max if calendar.combine == 'max' else reference_features
+            print(f"[*] {label}: {len(calendar.events)} events, {len(calendar._types)} columns")
+            for name, index in cases.items():
+                naive = index.tz_convert(None) if index.tz is not None else index
+                expected, legacy_time = best_of(lambda: reference(calendar.events, naive))
+                calendar._cache.clear()
+                started = time.perf_counter()
+                features = calendar.get_event_features(index)
+                cold_time = time.perf_counter() - started
+                _, cached_time = best_of(lambda: calendar.get_event_features(index))
+                try:
+                    pd.testing.assert_frame_equal(features.set_axis(naive), expected, check_exact=True,
+                                                  check_freq=False)
+                except AssertionError as e:
+                    failures += 1
+                    print(f"  [!] {name}: {e}")
+                print(f"  {name:<20} loop={legacy_time * 1000:8.1f} ms | vectorized={cold_time * 1000:6.1f} ms "
+                      f"| cached={cached_time * 1000:5.2f} ms -> {legacy_time / cold_time:.0f}x")
+
+        if calendars[1][1].version == calendars[2][1].version:
+            failures += 1
+            print("  [!] combine is not part of the calendar version")
+
+        # Cached frames are copies on write: a caller's edit does not leak into the next call
+        calendar = EventCalendar()
+        first = calendar.get_event_features(hourly)
+        first.iloc[:, 0] = -1.0
+        if (calendar.get_event_features(hourly).iloc[:, 0] == -1.0).any():
+            failures += 1
+            print("  [!] caller modified the cached features")
+
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] Vectorized event features match the per-event loop")
@@ -0,0 +1,69 @@
+import sys
+import os
+import time
+import threading
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ta_compat as ta
+from strategies.adaptive_ai import AdaptiveAIStrategy
+from strategies.adaptive_ai_enhanced import ProteusAI
+from strategies.proteus_neo import ProteusNeo
+from check_stream_parity import synthetic_market
+
+BARS = 24 * 365 * 5  # 5 years of hourly bars
+REPEATS = 3
+
+def all_modes(strategy, df):
+    return {mode: strategy._create_features(df, mode) for mode in strategy.MODES}
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+def concurrent_scopes(df, threads: int = 8) -> bool:
+    """Scopes opened from several threads on one shared cache: same features, no scope leaks out."""
+    strategy = AdaptiveAIStrategy({"model_dir": "data/bench_indicator_cache"})
+    expected = all_modes(strategy, df)
+    shared, results = ta.IndicatorCache(), [None] * threads
+
+    def work(k):
+        for _ in range(3):
+            with ta.cache_scope(shared if k % 2 else None):
+                results[k] = all_modes(strategy, df)
+    workers = [threading.Thread(target=work, args=(k,)) for k in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    same = all(r is not None and all(r[m].equals(expected[m]) for m in expected) for r in results)
+    return same and ta._cache.get() is None
+
+if __name__ == "__main__":
+    df = synthetic_market(BARS)
+    print(f"[*] Features for all modes on {BARS} bars (best of {REPEATS})")
+    for cls in (AdaptiveAIStrategy, ProteusAI, ProteusNeo):
+        strategy = cls({"model_dir": "data/bench_indicator_cache"})
+        plain, plain_time = best_of(lambda: all_modes(strategy, df))
+
+        def shared():
+            with ta.cache_scope() as cache:
+                return all_modes(strategy, df), cache
+        (cached, cache), cached_time = best_of(shared)
+
+        for mode in cls.MODES:
+            pd.testing.assert_frame_equal(plain[mode], cached[mode])
+        stats = cache.stats()
+        print(f"  {cls.__name__:<20} hits={stats['hits']:<3} misses={stats['misses']:<3} "
+              f"hit_rate={stats['hit_rate']:6.1%} saved={stats['saved_s'] * 1000:7.1f} ms | "
+              f"plain={plain_time * 1000:7.1f} ms cached={cached_time * 1000:7.1f} ms")
+
+    ok = concurrent_scopes(df.iloc[-5000:])
+    print(f"  concurrent scopes on one shared cache: {'ok' if ok else 'FAIL'}")
+    if not ok:
+        sys.exit(1)
@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.data_loader import merge_data
+from utils.asof_join import AsofPanel
+
+N_SYMBOLS = 50
+MACRO_COLS = ['dxy_close', 'vix_close', 'eth_btc_close', 'market_btc_close', 'market_btc_vol']
+
+def legacy_merge_data(crypto_df, macro_df):
+    """Previous merge_data (date_only left merge + per-column ffill), kept for comparison"""
+    c_df = crypto_df.copy()
+    m_df = macro_df.copy()
+    c_df['date_only'] = c_df['date'].dt.normalize()
+    m_df['date_only'] = m_df['date'].dt.normalize()
+    merged = pd.merge(c_df, m_df.drop(columns=['date']), on='date_only', how='left')
+    for col in MACRO_COLS:
+        merged[col] = merged[col].ffill()
+    return merged.drop(columns=['date_only'])
+
+def synthetic(freq, start="2020-01-01", end="2025-01-01", seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, end, freq=freq)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    return pd.DataFrame({'time': dates.values.astype('datetime64[ms]').astype(np.int64),
+                         'open': close, 'high': close * 1.01, 'low': close * 0.99,
+                         'close': close, 'volume': rng.uniform(1, 10, len(dates)), 'date': dates})
+
+def synthetic_macro():
+    rng = np.random.default_rng(42)
+    dates = pd.date_range("2019-12-01", "2025-01-01", freq='D')
+    macro = pd.DataFrame({'date': dates}, index=range(len(dates)))
+    for col in MACRO_COLS:
+        macro[col] = rng.uniform(1, 100, len(dates))
+    # Weekends missing for the yfinance series (as in the provider output before ffill)
+    weekend = dates.dayofweek >= 5
+    macro.loc[weekend, ['dxy_close', 'vix_close']] = np.nan
+    return macro.ffill()
+
+def bench(label, freq):
+    macro = synthetic_macro()
+    frames = [synthetic(freq, seed=i) for i in range(N_SYMBOLS)]
+
+    t0 = time.perf_counter()
+    legacy = [legacy_merge_data(df, macro) for df in frames]
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = [merge_data(df, macro) for df in frames]
+    t_fast = time.perf_counter() - t0
+
+    for old, new in zip(legacy, fast):
+        pd.testing.assert_frame_equal(old[new.columns], new, check_dtype=False)
+
+    print(f"{label:>4} | {len(frames[0]):>6} rows x {N_SYMBOLS} | legacy {t_legacy*1000:8.1f} ms | "
+          f"asof {t_fast*1000:8.1f} ms | x{t_legacy / t_fast:5.1f} | identical ✓")
+
+if __name__ == "__main__":
+    print("="*60)
+    print("⏱️ MERGE BENCHMARK: legacy merge_data vs AsofPanel")
+    print("="*60)
+    bench("1d", 'D')
+    bench("4h", '4h')
+    bench("1h", 'h')
+
+    macro = synthetic_macro()
+    t0 = time.perf_counter()
+    AsofPanel(macro)
+    print(f"Panel build (once per macro frame): {(time.perf_counter() - t0)*1000:.2f} ms")
@@ -0,0 +1,90 @@
+import sys
+import os
+import io
+import time
+import pickle
+import shutil
+import tempfile
+import contextlib
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from strategies.adaptive_ai import AdaptiveAIStrategy
+from utils.model_registry import ModelRegistry, model_registry
+from check_stream_parity import synthetic_market
+
+ROUNDS = 20
+
+def build(model_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return AdaptiveAIStrategy({"model_dir": model_dir})
+
+def timed_builds(model_dir, rounds, cold):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        if cold:
+            model_registry.invalidate()
+        build(model_dir)
+    return (time.perf_counter() - started) / rounds
+
+def check(name, ok):
+    print(f"  {name:<44} {'ok' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    model_dir = tempfile.mkdtemp(prefix="model_registry_")
+    failures = 0
+    try:
+        df = synthetic_market(700, seed=3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            AdaptiveAIStrategy({"model_dir": model_dir}).train_all(df)
+        files = sorted(os.path.join(model_dir, f) for f in os.listdir(model_dir))
+
+        # Strategy construction per trading cycle: every file unpickled vs registry hits
+        cold = timed_builds(model_dir, ROUNDS, cold=True)
+        warm = timed_builds(model_dir, ROUNDS, cold=False)
+        print(f"  strategy build: cold {cold * 1000:7.1f} ms | warm {warm * 1000:6.2f} ms "
+              f"({cold / warm:.0f}x, {len(files)} model files)")
+
+        a, b = build(model_dir), build(model_dir)
+        failures += check("warm builds share the loaded models", all(
+            a.models[m] is b.models[m] for m in a.models if a.models[m] is not None))
+
+        # Touched file (same bytes, new mtime): content hash keeps the object
+        before = model_registry.stats()
+        os.utime(files[0], ns=(time.time_ns(), time.time_ns() + 10**9))
+        build(model_dir)
+        after = model_registry.stats()
+        failures += check("touch -> revalidated, not reloaded",
+                          after['revalidated'] == before['revalidated'] + 1 and after['reloads'] == before['reloads'])
+
+        # Retrained (new bytes): reloaded on the next build
+        mode = next(m for m in a.models if a.models[m] is not None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            AdaptiveAIStrategy({"model_dir": model_dir}).train_mode(df.iloc[:500], mode)
+        fresh = build(model_dir)
+        failures += check("retrain -> new model served", fresh.models[mode] is not a.models[mode])
+
+        # LRU bounds
+        paths = []
+        for name in "abc":
+            paths.append(os.path.join(model_dir, f"lru_{name}.pkl"))
+            with open(paths[-1], 'wb') as f:
+                pickle.dump({"name": name}, f)
+        small = ModelRegistry(max_entries=2)
+        for i in (0, 1, 0, 2, 0):  # b is least recently used when c arrives
+            small.get(paths[i])
+        stats = small.stats()
+        failures += check("LRU evicts the least recently used",
+                          stats['entries'] == 2 and stats['evictions'] == 1 and stats['hits'] == 2)
+        tiny = ModelRegistry(max_bytes=1)
+        failures += check("oversized entry is still returned", tiny.get(files[0]) is not None)
+        failures += check("missing file -> None", model_registry.get(os.path.join(model_dir, "nope.pkl")) is None)
+        print(f"  {model_registry.stats()}")
+    finally:
+        shutil.rmtree(model_dir, ignore_errors=True)
+
+    if failures:
+        print(f"[!] {failures} checks failed")
+        sys.exit(1)
+    print("[*] model registry ok")
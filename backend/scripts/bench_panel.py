@@ -0,0 +1,106 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.ohlcv_store import OHLCVStore
+from utils.panel import panel_from_store
+from utils.omega_features import (add_omega_features, add_swing_features, omega_panel, swing_panel,
+                                  volatility_panel, volatility_index, symbol_features, event_features,
+                                  feature_columns, OMEGA_FEATURES, SWING_FEATURES)
+from check_ta_parity import synthetic_ohlcv
+
+ASSETS = 40
+HOURS = 24 * 365 * 2
+REPEATS = 3
+RTOL = 1e-9  # running sums vs per-window reductions: float rounding only
+
+def synthetic_universe(root):
+    """40 hourly series with staggered listings; every 4th one closes on weekends (stock-like)."""
+    target = OHLCVStore(root)
+    for k in range(ASSETS):
+        df = synthetic_ohlcv(HOURS, seed=k).iloc[(k * 211) % (HOURS // 2):]
+        df['open'] = df['close'].shift(1).fillna(df['close'])
+        if k % 4 == 3:
+            df = df[df.index.dayofweek < 5]
+        target.write(f"SYM{k}/USDT", '1h', df.assign(time=df.index.values.astype('datetime64[ms]').astype(np.int64)))
+    return target
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+def mismatches(label, expected: pd.DataFrame, actual: pd.DataFrame, exact=()) -> int:
+    """Columns in 'exact' must be equal, the rest equal up to RTOL."""
+    try:
+        for col in expected.columns:
+            if col in exact or col.startswith('event_'):
+                np.testing.assert_array_equal(expected[col].to_numpy(), actual[col].to_numpy(), err_msg=col)
+            else:
+                np.testing.assert_allclose(actual[col].to_numpy(), expected[col].to_numpy(), rtol=RTOL,
+                                           atol=RTOL, err_msg=col)
+        if not expected.index.equals(actual.index):
+            raise AssertionError("index differs")
+    except AssertionError as e:
+        print(f"  [!] {label}: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    root = tempfile.mkdtemp(prefix="bench_panel_")
+    try:
+        source = synthetic_universe(root)
+        symbols = source.symbols('1h')
+        frames = {sym: source.read(sym, '1h').set_index('date') for sym in symbols}
+        panel, build_time = best_of(lambda: panel_from_store(symbols, '1h', source=source))
+        print(f"[*] Panel {panel['close'].shape} ({int(panel.valid.sum())} bars) built in {build_time * 1000:.1f} ms")
+
+        failures = 0
+        for label, per_symbol, on_panel, base in (
+                ('omega', add_omega_features, omega_panel, OMEGA_FEATURES),
+                ('swing', add_swing_features, swing_panel, SWING_FEATURES)):
+            # Indicators alone: one frame pipeline per symbol vs one kernel call per indicator
+            loop, loop_time = best_of(lambda: {sym: per_symbol(df, events=False) for sym, df in frames.items()})
+            columns, kernel_time = best_of(lambda: on_panel(panel))
+
+            # As the scripts use them: per-symbol frames with the event columns
+            full, full_time = best_of(lambda: {sym: per_symbol(df) for sym, df in frames.items()})
+
+            def panel_frames():
+                columns = on_panel(panel)
+                events = event_features(panel.index)  # one calendar pass for every asset
+                return {sym: symbol_features(panel, sym, columns, events) for sym in symbols}
+            out, frames_time = best_of(panel_frames)
+
+            for sym in symbols:
+                cols = feature_columns(full[sym], base)
+                failures += mismatches(f"{label} {sym}", full[sym][cols], out[sym][cols], exact=('whale_activity',))
+            print(f"  {label:<6} indicators: per-symbol={loop_time * 1000:7.1f} ms | panel={kernel_time * 1000:6.1f} ms "
+                  f"-> {loop_time / kernel_time:4.1f}x || with events + frames: per-symbol={full_time * 1000:7.1f} ms | "
+                  f"panel={frames_time * 1000:6.1f} ms -> {full_time / frames_time:4.1f}x")
+
+        # The optimizers' extra column
+        vol, vol_time = best_of(lambda: volatility_panel(panel))
+        loop, loop_time = best_of(lambda: {sym: volatility_index(df['close'].to_numpy(dtype=float))
+                                           for sym, df in frames.items()})
+        for j, sym in enumerate(panel.symbols):
+            got = pd.DataFrame({'volatility_index': vol[panel.valid[:, j], j]})
+            failures += mismatches(f"volatility {sym}", pd.DataFrame({'volatility_index': loop[sym]}), got)
+        print(f"  volatility_index: per-symbol={loop_time * 1000:7.1f} ms | panel={vol_time * 1000:6.1f} ms "
+              f"-> {loop_time / vol_time:4.1f}x")
+
+        if failures:
+            print(f"[!] {failures} mismatches")
+            sys.exit(1)
+        print(f"[*] Panel columns match the per-symbol features (rtol {RTOL:g})")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
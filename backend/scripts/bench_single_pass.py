@@ -0,0 +1,138 @@
+import sys
+import os
+import io
+import time
+import contextlib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from strategies.ai_strategy import AIStrategy
+from utils.predictor import Predictor, predictor_for
+from check_ta_parity import synthetic_ohlcv
+
+try:
+    import xgboost as xgb
+    XGB_AVAILABLE = True
+except ImportError:
+    XGB_AVAILABLE = False
+
+ROWS = 2000
+CALLS = 300
+FEATURES = [f"x{i}" for i in range(9)]
+
+def models():
+    """Single-row models as the strategies train them (AIStrategy / AdaptiveAI settings)."""
+    out = {
+        "RandomForest": RandomForestClassifier(n_estimators=100, max_depth=10, min_samples_split=10,
+                                               random_state=42, n_jobs=-1),
+        "GradientBoosting": GradientBoostingClassifier(n_estimators=100, max_depth=5, learning_rate=0.1,
+                                                       random_state=42),
+    }
+    if XGB_AVAILABLE:
+        out["XGBoost"] = xgb.XGBClassifier(n_estimators=100, max_depth=5, learning_rate=0.1)
+    return out
+
+def instrument(model):
+    """Count full ensemble evaluations per analyze (outer predict / predict_proba calls)."""
+    calls = {"n": 0, "depth": 0}
+    for method in ("predict", "predict_proba"):
+        original = getattr(model, method)
+        def counted(*args, _original=original, **kwargs):
+            calls["n"] += calls["depth"] == 0  # RF.predict calls predict_proba itself
+            calls["depth"] += 1
+            try:
+                return _original(*args, **kwargs)
+            finally:
+                calls["depth"] -= 1
+        setattr(model, method, counted)
+    return calls
+
+def two_pass(model, X):
+    """Previous path: predict + predict_proba + importance dict on every call."""
+    prediction = model.predict(X)[0]
+    probability = model.predict_proba(X)[0]
+    importances = dict(zip(FEATURES, model.feature_importances_))
+    return prediction, max(probability) * 100, max(importances, key=importances.get)
+
+def single_pass(model, X):
+    predictor = predictor_for(model, FEATURES)
+    prediction, confidence, _ = predictor.predict(X)
+    return prediction, confidence, predictor.top_feature
+
+def latency(fn, model, rows):
+    times = []
+    for X in rows:
+        started = time.perf_counter()
+        fn(model, X)
+        times.append(time.perf_counter() - started)
+    times = np.array(times) * 1e6
+    return np.median(times), np.percentile(times, 95)
+
+def strategy_check() -> int:
+    """AIStrategy.analyze on a trained model: same signal / confidence / top feature as the two-pass formula."""
+    df = synthetic_ohlcv(800, seed=4)
+    path = os.path.join("/tmp", f"single_pass_{os.getpid()}.pkl")
+    with contextlib.redirect_stdout(io.StringIO()):
+        strategy = AIStrategy({"model_path": path})
+        strategy.train(df.iloc[:600])
+    failures = 0
+    for end in range(600, 800, 10):
+        candles = df.iloc[:end + 1]
+        result = strategy.analyze(candles)
+        features = strategy._create_features(candles)
+        X = strategy.scaler.transform(features.iloc[[-1]])
+        probability = strategy.model.predict_proba(X)[0]
+        importances = dict(zip(features.columns, strategy.model.feature_importances_))
+        expected = (int(strategy.model.predict(X)[0]), round(max(probability) * 100, 2),
+                    max(importances, key=importances.get))
+        if (result["prediction"], result["confidence"], result["top_feature"]) != expected:
+            failures += 1
+            print(f"  [!] AIStrategy day {end}: {result} != {expected}")
+    os.remove(path)
+    print(f"  AIStrategy.analyze vs two-pass formula: {'ok' if not failures else 'MISMATCH'}")
+    return failures
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    X_all = rng.normal(size=(ROWS, len(FEATURES)))
+    y = (X_all[:, 0] + 0.5 * X_all[:, 1] + rng.normal(scale=1.0, size=ROWS) > 0).astype(int)
+    rows = [X_all[[i]] for i in range(CALLS)]
+    failures = 0
+
+    for name, model in models().items():
+        model.fit(X_all, y)
+
+        # Same answers for every row (and the GradientBoosting tie rule at p = 0.5)
+        predictor = Predictor(model, FEATURES)
+        expected = model.predict(X_all)
+        predictions, confidences = predictor.decide_many(model.predict_proba(X_all))
+        same = np.array_equal(expected, predictions) and np.array_equal(confidences, model.predict_proba(X_all).max(axis=1) * 100)
+        same &= predictor.top_feature == two_pass(model, rows[0])[2]
+        if name == "GradientBoosting":
+            same &= predictor.decide(np.array([0.5, 0.5]))[0] == 1
+        # Names passed after an unnamed lookup of the same model still name the explanation
+        same &= predictor_for(model).top_feature not in FEATURES
+        same &= predictor_for(model, FEATURES).top_feature == predictor.top_feature
+        failures += not same
+
+        calls = instrument(model)
+        two_pass(model, rows[0])
+        old_calls, calls["n"] = calls["n"], 0
+        single_pass(model, rows[0])
+        new_calls = calls["n"]
+
+        old_med, old_p95 = latency(two_pass, model, rows)
+        new_med, new_p95 = latency(single_pass, model, rows)
+        print(f"  {name:<17} two-pass {old_med:8.0f} us (p95 {old_p95:8.0f}, {old_calls} evals) | "
+              f"single-pass {new_med:8.0f} us (p95 {new_p95:8.0f}, {new_calls} eval) "
+              f"{old_med / new_med:4.1f}x {'ok' if same else 'MISMATCH'}")
+    if not XGB_AVAILABLE:
+        print("  XGBoost           not installed, skipped")
+
+    failures += strategy_check()
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] single-pass prediction matches predict() + predict_proba()")
@@ -0,0 +1,134 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.trading_calendar import CALENDARS, market_for
+from utils.panel import panel_from_frames
+
+START, END = '2023-01-01', '2025-01-01'
+UNIVERSE = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'AAPL', 'MSFT', 'NVDA', 'THYAO.IS', 'GARAN.IS',
+            '0700.HK', '9988.HK', '7203.T', '6758.T']
+COMMISSION_RATE = 0.001
+
+def session_frame(symbol, seed):
+    """Hourly bars on the symbol's exchange sessions with the backtests' pred / conf / volatility columns."""
+    index = CALENDARS[market_for(symbol)].session_bars(START, END, '1h')
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+    df = pd.DataFrame({'close': close}, index=index)
+    df['volatility'] = (df['close'].rolling(24).std() / df['close'].rolling(24).mean() * 100).fillna(0) * 3
+    rsi = pd.Series(rng.uniform(0, 100, len(df)), index=index)
+    df['pred'] = (rsi < 35).astype(int)
+    df['conf'] = np.where(rsi < 30, 0.90, np.where(rsi < 35, 0.75, np.where(rsi > 70, 0.90, 0.0)))
+    return df
+
+def legacy_decider(all_data):
+    """backtest_master_decider's loop: union timeline, 'ts in df.index' per symbol per tick."""
+    master_timeline = pd.to_datetime(sorted(list(set().union(*[df.index for df in all_data.values()]))))
+    balance, current_asset, units, trades = 10.0, None, 0, []
+    for ts in master_timeline[::4]:
+        global_vol = np.mean([all_data[s].loc[ts, 'volatility'] for s in all_data if ts in all_data[s].index])
+        active_mode = "Sniper" if global_vol >= 1.0 else "Hunter"
+        if current_asset and ts in all_data[current_asset].index:
+            row = all_data[current_asset].loc[ts]
+            if (active_mode == "Hunter" and row['pred'] == 0) or (active_mode == "Sniper" and row['conf'] < 0.5):
+                balance = units * row['close'] * (1 - COMMISSION_RATE)
+                current_asset, units = None, 0
+        if not current_asset:
+            best_s, max_score = None, 0
+            for s, df in all_data.items():
+                if ts in df.index:
+                    r = df.loc[ts]
+                    can_buy = r['pred'] == 1 and (active_mode == "Hunter" or r['conf'] > 0.85)
+                    if can_buy and r['conf'] > max_score:
+                        max_score, best_s = r['conf'], s
+            if best_s:
+                units = (balance * (1 - COMMISSION_RATE)) / all_data[best_s].loc[ts, 'close']
+                current_asset, balance = best_s, 0
+                trades.append((ts, best_s))
+    if current_asset:
+        balance = units * all_data[current_asset].iloc[-1]['close']
+    return balance, trades
+
+def stale_frame(df, hours):
+    """The frame ffilled onto every hour, like a feed that repeats the last quote while the exchange is shut."""
+    return df.reindex(hours).ffill().dropna()
+
+def panel_decider(all_data, timeframe=None):
+    """The same loop on one aligned panel."""
+    panel = panel_from_frames(all_data, ('close', 'volatility', 'pred', 'conf'), timeframe)
+    close, volatility, pred, conf, valid = panel['close'], panel['volatility'], panel['pred'], panel['conf'], panel.valid
+    best = {"Hunter": panel.best(conf, pred == 1), "Sniper": panel.best(conf, (pred == 1) & (conf > 0.85))}
+    balance, current, units, trades = 10.0, -1, 0, []
+    for r in range(0, len(panel.index), 4):
+        active_mode = "Sniper" if np.mean(volatility[r, valid[r]]) >= 1.0 else "Hunter"
+        if current >= 0 and valid[r, current]:
+            if (active_mode == "Hunter" and pred[r, current] == 0) or (active_mode == "Sniper" and conf[r, current] < 0.5):
+                balance = units * close[r, current] * (1 - COMMISSION_RATE)
+                current, units = -1, 0
+        if current < 0 and best[active_mode][r] >= 0:
+            current = best[active_mode][r]
+            units = (balance * (1 - COMMISSION_RATE)) / close[r, current]
+            balance = 0
+            trades.append((panel.index[r], panel.symbols[current]))
+    if current >= 0:
+        balance = units * panel.last('close', panel.symbols[current])
+    return balance, trades
+
+def timed(fn):
+    started = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - started
+
+if __name__ == "__main__":
+    failures = 0
+
+    # Calendar spot checks (UTC bar open times, 1h bars)
+    spots = [('NYSE', '2024-07-01 13:00', True), ('NYSE', '2024-07-01 20:00', False),
+             ('NYSE', '2024-01-02 14:00', True), ('NYSE', '2024-01-02 21:00', False),
+             ('NYSE', '2024-07-06 15:00', False), ('BIST', '2024-07-01 07:00', True),
+             ('BIST', '2024-07-01 15:00', False), ('HKEX', '2024-07-01 04:00', False),
+             ('HKEX', '2024-07-01 05:00', True), ('TSE', '2024-07-01 06:00', False),
+             ('TSE', '2024-12-02 06:00', True), ('CRYPTO', '2024-07-06 03:00', True)]
+    for market, ts, expected in spots:
+        if bool(CALENDARS[market].is_open(pd.DatetimeIndex([ts]), '1h')[0]) != expected:
+            failures += 1
+            print(f"  [!] {market} {ts}: expected open={expected}")
+
+    all_data = {sym: session_frame(sym, seed) for seed, sym in enumerate(UNIVERSE)}
+    panel = panel_from_frames(all_data, ('close', 'volatility', 'pred', 'conf'))
+    print(f"[*] {len(UNIVERSE)} symbols, {len(panel.index)} hours on the union timeline")
+    print(panel.coverage('1h').to_string())
+    if panel.coverage('1h')['off_session'].any():
+        failures += 1
+
+    # Memory: ffilled dense copies of every frame vs the panel's field arrays + validity mask
+    dense = sum(df.reindex(panel.index).ffill().memory_usage(deep=True).sum() for df in all_data.values())
+    compact = sum(a.nbytes for a in panel.fields.values()) + panel.valid.nbytes
+    print(f"[*] ffilled copies {dense / 1e6:.1f} MB | panel {compact / 1e6:.1f} MB")
+
+    (legacy_balance, legacy_trades), legacy_time = timed(lambda: legacy_decider(all_data))
+    (fast_balance, fast_trades), fast_time = timed(lambda: panel_decider(all_data))
+    print(f"[*] Master decider loop: membership checks={legacy_time:.2f} s | "
+          f"panel={fast_time * 1000:.1f} ms -> {legacy_time / fast_time:.0f}x")
+    print(f"    balance {legacy_balance:.6f} vs {fast_balance:.6f}, trades {len(legacy_trades)} vs {len(fast_trades)}")
+    if legacy_balance != fast_balance or legacy_trades != fast_trades:
+        failures += 1
+
+    # Stale quotes: off-session rows are masked by the calendars, so the loop sees the session-only data
+    stale = {sym: stale_frame(df, panel.index) for sym, df in all_data.items()}
+    masked = panel_from_frames(stale, ('close',), '1h')
+    stale_balance, stale_trades = panel_decider(stale, '1h')
+    print(f"[*] Stale quotes: {sum(len(df) for df in stale.values())} rows, "
+          f"{int(masked.valid.sum())} in session, trades {len(stale_trades)}")
+    if not (masked.valid == panel.valid).all() or (stale_balance, stale_trades) != (legacy_balance, legacy_trades):
+        failures += 1
+
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] Panel loop matches the union-timeline loop")
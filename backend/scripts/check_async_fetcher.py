@@ -0,0 +1,136 @@
+import sys
+import os
+import time
+import asyncio
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.async_fetcher import AsyncOHLCVFetcher, TokenBucket, kline_weight, run_sync
+
+HOUR = 3_600_000
+END = 1_700_000_000_000 // HOUR * HOUR
+BARS = 250  # history per symbol: several pages at limit 100
+
+class StubExchange:
+    """Async ccxt-like exchange: deterministic hourly candles, later symbols answer first, 'BAD/USDT' always fails."""
+
+    def __init__(self, log, fail_markets=False):
+        self.log = log
+        self.fail_markets = fail_markets
+        self.markets = {"stub": True}
+
+    async def load_markets(self):
+        self.log['markets'] += 1
+        if self.fail_markets:
+            raise ConnectionError("exchangeInfo down")
+
+    def set_markets(self, markets):
+        self.log['set_markets'] += 1
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.log['calls'].append((symbol, since, limit))
+        if symbol == "BAD/USDT":
+            raise ValueError("bad symbol")
+        rank = self.log['order'].index(symbol) if symbol in self.log['order'] else 0
+        await asyncio.sleep(0.002 * (len(self.log['order']) - rank))  # reverse completion order
+        first = END - BARS * HOUR
+        start = max(since or first, first)
+        start = -(-start // HOUR) * HOUR
+        times = range(start, min(start + limit * HOUR, END), HOUR)
+        base = sum(map(ord, symbol))
+        return [[t, base, base + 1, base - 1, base + (t // HOUR) % 7, 10.0] for t in times]
+
+    async def close(self):
+        self.log['closed'] += 1
+
+def new_log(order):
+    return {'calls': [], 'markets': 0, 'set_markets': 0, 'closed': 0, 'order': order}
+
+def metered(fetcher):
+    """Record every weight charged to the fetcher's token bucket."""
+    charged = []
+    acquire = fetcher.limiter.acquire
+    async def counted(weight=1):
+        charged.append(weight)
+        await acquire(weight)
+    fetcher.limiter.acquire = counted
+    return charged
+
+def check(name, ok):
+    print(f"  {name:<56} {'ok' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    failures = 0
+    symbols = ["BTC/USDT", "ETH/USDT", "BAD/USDT", "SOL/USDT"]
+    log = new_log(symbols)
+    fetcher = AsyncOHLCVFetcher(lambda: StubExchange(log), max_concurrency=4, retries=2, backoff=0.001)
+    charged = metered(fetcher)
+    since = END - BARS * HOUR
+    frames = fetcher.fetch({sym: (since, 100) for sym in symbols}, timeframe="1h")
+
+    # Ordering and pagination
+    good = [s for s in symbols if s != "BAD/USDT"]
+    failures += check("result keys follow the request order", list(frames) == symbols)
+    failures += check("every good symbol is paged to the full history", all(
+        frames[s] is not None and len(frames[s]) == BARS and frames[s]['time'].is_monotonic_increasing
+        and frames[s]['time'].diff().dropna().eq(HOUR).all() for s in good))
+    failures += check("pages continue from the last candle + 1 ms", all(
+        [c[1] for c in log['calls'] if c[0] == s] == [since, since + 99 * HOUR + 1, since + 199 * HOUR + 1]
+        for s in good))
+
+    # Error path: one failing symbol
+    bad_calls = [c for c in log['calls'] if c[0] == "BAD/USDT"]
+    failures += check("failing symbol is retried, then maps to None",
+                      frames["BAD/USDT"] is None and len(bad_calls) == fetcher.retries + 1)
+
+    # Rate-limit weights: every request (retries too) is charged its kline weight
+    failures += check("limiter charged kline_weight per request",
+                      sorted(charged) == sorted(kline_weight(c[2]) for c in log['calls']))
+    failures += check("kline weights by limit", [kline_weight(n) for n in (1, 99, 100, 499, 500, 1000, 1500)]
+                      == [1, 1, 2, 2, 5, 5, 10])
+    failures += check("one session: markets loaded once, exchange closed",
+                      log['markets'] == 1 and log['closed'] == 1)
+
+    # Token bucket throttles once the burst capacity is spent
+    async def drain():
+        bucket = TokenBucket(rate=200, capacity=10)
+        started = time.monotonic()
+        for _ in range(10):
+            await bucket.acquire(5)  # 50 weight: 10 burst + 40 at 200/s = 0.2 s
+        return time.monotonic() - started
+    elapsed = asyncio.run(drain())
+    failures += check(f"token bucket throttles ({elapsed:.2f} s for 0.20 s of weight)", 0.18 <= elapsed < 0.5)
+
+    # Ranges keep job order even when later ranges finish first
+    log2 = new_log(["ETH/USDT", "BTC/USDT"])
+    ranges = [("BTC/USDT", since, since + 49 * HOUR), ("ETH/USDT", since + 50 * HOUR, END - HOUR)]
+    done = []
+    async def on_result(job, frame):
+        done.append(job[0])
+    fetcher2 = AsyncOHLCVFetcher(lambda: StubExchange(log2), backoff=0.001)
+    results = run_sync(lambda: fetcher2.fetch_ranges(ranges, limit=100, on_result=on_result))
+    failures += check("fetch_ranges returns frames in range order",
+                      [len(r) for r in results] == [50, BARS - 50] and
+                      results[0]['time'].iloc[-1] == since + 49 * HOUR)
+    failures += check("on_result called once per range", sorted(done) == ["BTC/USDT", "ETH/USDT"])
+
+    # run_sync from inside a running event loop (FastAPI handler calling the trader)
+    async def inside_loop():
+        return run_sync(lambda: fetcher2.first_timestamps(["BTC/USDT", "BAD/USDT"], since=since))
+    firsts = asyncio.run(inside_loop())
+    failures += check("run_sync works inside a running loop",
+                      firsts == {"BTC/USDT": since, "BAD/USDT": None})
+    failures += check("markets reused by later sessions", log2['set_markets'] >= 1)
+
+    # A failed session (exchangeInfo down) fails every symbol, nothing raises
+    log3 = new_log(symbols)
+    down = AsyncOHLCVFetcher(lambda: StubExchange(log3, fail_markets=True), timeout=1.0)
+    frames = down.fetch({sym: (since, 100) for sym in symbols}, timeframe="1h")
+    failures += check("session failure maps all symbols to None and closes",
+                      all(v is None for v in frames.values()) and log3['closed'] == 1 and not log3['calls'])
+
+    if failures:
+        print(f"[!] {failures} checks failed")
+        sys.exit(1)
+    print("[*] async fetcher ok")
@@ -0,0 +1,118 @@
+import sys
+import os
+import io
+import time
+import shutil
+import tempfile
+import threading
+import contextlib
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from strategies.adaptive_ai import AdaptiveAIStrategy
+from strategies.proteus_neo import ProteusNeo
+from utils.batch_inference import MicroBatcher, analyze_many, predict_proba_many
+from check_stream_parity import synthetic_market
+
+DAYS = 700
+SYMBOLS = 12
+MODELS = 3          # symbols share model dirs round-robin (shared objects via the model registry)
+CUTOFFS = 20        # live cycles replayed per symbol
+BENCH_SYMBOLS = 500
+KEYS = ["signal", "mode", "prediction", "confidence", "reason"]
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+def universe(cls, dirs):
+    """(strategy, market) per symbol; strategy i uses model dir i % MODELS."""
+    markets = [synthetic_market(DAYS, seed=10 + i) for i in range(SYMBOLS)]
+    for market in markets:
+        market['vix_close'] = market['vix_close'] * 0.35  # around ProteusNeo's VIX 35 breaker
+    with quiet():
+        for d, market in zip(dirs, markets):
+            cls({"model_dir": d}).train_all(market)
+        strategies = [cls({"model_dir": dirs[i % MODELS]}) for i in range(SYMBOLS)]
+    return strategies, markets
+
+def conform(cls, dirs) -> int:
+    strategies, markets = universe(cls, dirs)
+    batcher = MicroBatcher(window_ms=1)
+    failures = 0
+    for end in range(DAYS - CUTOFFS, DAYS):
+        pairs = [(s, m.iloc[:end + 1]) for s, m in zip(strategies, markets)]
+        with quiet():  # modes missing from a model dir train live, as in analyze()
+            expected = [s.analyze(candles) for s, candles in pairs]
+            batched = analyze_many(pairs, batcher)
+        for i, (a, b) in enumerate(zip(expected, batched)):
+            if any(a.get(key) != b.get(key) for key in KEYS):
+                failures += 1
+                print(f"  [!] {cls.__name__} symbol {i} day {end}: analyze={a} batched={b}")
+    stats = batcher.stats()
+    print(f"  {cls.__name__:<19} {CUTOFFS} cycles x {SYMBOLS} symbols: {stats['requests']} model rows in "
+          f"{stats['model_calls']} calls (per-symbol: {stats['requests']}) {'ok' if not failures else 'MISMATCH'}")
+    return failures
+
+def concurrent_join(dirs) -> int:
+    """Predictions submitted from separate threads inside one window share a batch."""
+    strategies, markets = universe(AdaptiveAIStrategy, dirs)
+    batcher = MicroBatcher(window_ms=200)
+    with quiet():
+        prepared = [s.prepare_inference(m) for s, m in zip(strategies, markets)]
+    requests = [request for _, request in prepared if request is not None]
+    results = [None] * len(requests)
+
+    def call(k):
+        results[k] = batcher.predict_proba(requests[k][0], requests[k][1])
+    threads = [threading.Thread(target=call, args=(k,)) for k in range(len(requests))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = batcher.stats()
+    same = all(np.array_equal(r, model.predict_proba(X)) for r, (model, X, _) in zip(results, requests))
+    ok = same and stats['batches'] == 1 and stats['model_calls'] == len({id(r[0]) for r in requests})
+    print(f"  {len(requests)} threads -> {stats['batches']} batch, {stats['model_calls']} model calls "
+          f"{'ok' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+def bench(dirs):
+    """Universe of BENCH_SYMBOLS rows on one shared model: per-symbol predict_proba vs one stacked call."""
+    strategies, markets = universe(AdaptiveAIStrategy, dirs)
+    for mode in AdaptiveAIStrategy.MODES:
+        model, scaler = strategies[0].models[mode], strategies[0].scalers[mode]
+        if model is None:
+            continue
+        features = strategies[0]._create_features(markets[0], mode)
+        rows = [scaler.transform(features.iloc[[i % len(features)]]) for i in range(BENCH_SYMBOLS)]
+        requests = [(model, X) for X in rows]
+
+        started = time.perf_counter()
+        loop = [model.predict_proba(X) for X in rows]
+        loop_time = time.perf_counter() - started
+        started = time.perf_counter()
+        batched = predict_proba_many(requests)
+        batch_time = time.perf_counter() - started
+        same = all(np.array_equal(a, b) for a, b in zip(loop, batched))
+        print(f"  {mode:<9} {type(model).__name__:<27} {BENCH_SYMBOLS} symbols: per-symbol {loop_time * 1000:7.1f} ms | "
+              f"batched {batch_time * 1000:6.1f} ms ({loop_time / batch_time:.0f}x) {'ok' if same else 'MISMATCH'}")
+
+if __name__ == "__main__":
+    failures = 0
+    for cls in (AdaptiveAIStrategy, ProteusNeo):
+        dirs = [tempfile.mkdtemp(prefix="batch_inference_") for _ in range(MODELS)]
+        try:
+            failures += conform(cls, dirs)
+            if cls is AdaptiveAIStrategy:
+                failures += concurrent_join(dirs)
+                bench(dirs)
+        finally:
+            for d in dirs:
+                shutil.rmtree(d, ignore_errors=True)
+
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] batched live inference matches per-symbol analyze()")
@@ -0,0 +1,100 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ta_compat as ta
+import feature_spec
+from feature_spec import Plan
+from strategies.adaptive_ai import AdaptiveAIStrategy, FEATURE_SPEC, BASE_FEATURES, MODE_FEATURES
+from check_ta_parity import synthetic_ohlcv
+
+BARS = 24 * 365 * 3
+REPEATS = 5
+
+def legacy_features(df, mode):
+    """AdaptiveAIStrategy._raw_features as it was written before the spec (reference)."""
+    features = pd.DataFrame(index=df.index)
+    features['rsi'] = ta.rsi(df['close'], length=14)
+    features['sma_ratio'] = ta.sma(df['close'], length=10) / ta.sma(df['close'], length=30)
+    features['price_change_1d'] = df['close'].pct_change(1) * 100
+    features['price_change_5d'] = df['close'].pct_change(5) * 100
+    features['volume_change'] = df['volume'].pct_change(1) * 100
+    if mode == "bull":
+        features['roc_10'] = ta.roc(df['close'], length=10)
+        features['adx'] = ta.adx(df['high'], df['low'], df['close'], length=14)['ADX_14']
+        features['macd_hist'] = ta.macd(df['close'], fast=12, slow=26, signal=9)['MACDh_12_26_9']
+    elif mode == "bear":
+        features['atr'] = ta.atr(df['high'], df['low'], df['close'], length=14)
+        features['atr_pct'] = features['atr'] / df['close'] * 100
+        features['distance_from_low'] = (df['close'] - df['low'].rolling(20).min()) / df['close'] * 100
+        features['rsi_oversold'] = (features['rsi'] < 30).astype(int)
+    else:
+        bbands = ta.bbands(df['close'], length=20, std=2)
+        lower, mid, upper = bbands['BBL_20_2'], bbands['BBM_20_2'], bbands['BBU_20_2']
+        features['bb_position'] = (df['close'] - lower) / (upper - lower)
+        features['bb_width'] = (upper - lower) / mid
+    return features
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+def spec_order_peak(graph, outputs):
+    """Live arrays when the needed nodes run in declaration order (no reordering)."""
+    plan = graph.plan(outputs)
+    steps = [key for key in graph.nodes if key in set(plan.steps)]
+    last_use = {}
+    for i, key in enumerate(steps):
+        for k in graph.nodes[key][1]:
+            last_use[k] = i
+    release = [[] for _ in steps]
+    for i, key in enumerate(steps):
+        if key not in set(plan.outputs.values()):
+            release[last_use.get(key, i)].append(key)
+    return Plan(steps, release, plan.outputs).peak
+
+if __name__ == "__main__":
+    strategy = AdaptiveAIStrategy({"model_dir": os.devnull})
+    graph = feature_spec.compiled(FEATURE_SPEC)
+    stats = graph.stats()
+    print(f"[*] Spec: {stats['declared']} entries -> {stats['nodes']} nodes after merging")
+    every = BASE_FEATURES + [f for mode in strategy.MODES for f in MODE_FEATURES[mode]]
+    print(f"[*] Live arrays (all modes): planned {graph.plan(every).peak} | "
+          f"declaration order {spec_order_peak(graph, every)}")
+
+    failures = 0
+    for label, df in (('random walk', synthetic_ohlcv(BARS, seed=3)),
+                      ('flat stretches', synthetic_ohlcv(BARS, seed=4, flat_every=500))):
+        df.loc[df.index[::97], 'volume'] = 0.0  # 0 -> x and x -> 0 volume changes
+        for mode in strategy.MODES:
+            legacy, legacy_time = best_of(lambda: legacy_features(df, mode))
+            spec, spec_time = best_of(lambda: strategy._raw_features(df, mode))
+            try:
+                pd.testing.assert_frame_equal(spec, legacy, check_exact=True, check_dtype=False)
+            except AssertionError as e:
+                failures += 1
+                print(f"  [!] {label} {mode}: {e}")
+            print(f"  {label:<15} {mode:<9} legacy={legacy_time * 1000:6.1f} ms | "
+                  f"graph={spec_time * 1000:6.1f} ms ({graph.plan(BASE_FEATURES + MODE_FEATURES[mode]).peak} live)")
+
+    # Entries computing the same thing are merged, even when declared under other names
+    extra = FEATURE_SPEC + [('sma_20', 'mean', ['close'], {'window': 20}),
+                            ('band', 'sub', ['bb_upper', 'bb_lower'], {}),
+                            ('bb_upper_again', 'add', ['bb_dev', 'bb_mid'], {})]
+    merged = feature_spec.compile_spec(extra)
+    if len(merged.nodes) != stats['nodes']:
+        failures += 1
+        print(f"  [!] duplicate entries were not merged ({len(merged.nodes)} nodes)")
+
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] Compiled feature graph matches the hand-written features")
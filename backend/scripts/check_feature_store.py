@@ -0,0 +1,113 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.ohlcv_store import OHLCVStore
+from utils.resampler import Resampler
+from utils.feature_store import FeatureStore, FeatureSet
+from utils.omega_features import OMEGA_SET, SWING_SET, omega_frame, swing_frame
+from check_ta_parity import synthetic_ohlcv
+
+HOURS = 24 * 365 * 3
+SYMBOL = 'SYN/USDT'
+# Appends after the initial build: one bar, half a 4h bucket (open bar), a day, across a year end
+STEPS = [1, 2, 2, 24, 24 * 200]
+
+def candles(n):
+    df = synthetic_ohlcv(n, seed=7)
+    df['open'] = df['close'].shift(1).fillna(df['close'])
+    df.loc[df.index[::613], 'volume'] *= 9  # whale bars
+    return df.assign(time=df.index.values.astype('datetime64[ms]').astype(np.int64))
+
+def timed(fn):
+    started = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - started
+
+def compare(label, stored, expected):
+    try:
+        pd.testing.assert_frame_equal(stored, expected.astype(np.float64), check_exact=True,
+                                      check_names=False, check_freq=False, check_index_type=False)
+        return 0
+    except AssertionError as e:
+        print(f"  [!] {label}: {e}")
+        return 1
+
+if __name__ == "__main__":
+    root = tempfile.mkdtemp(prefix="check_feature_store_")
+    failures = 0
+    try:
+        full = candles(HOURS)
+        first = HOURS - sum(STEPS)
+        base = OHLCVStore(os.path.join(root, 'store'))
+        resampler = Resampler(base, os.path.join(root, 'derived'))
+        hourly = FeatureStore(os.path.join(root, 'features'), source=base)
+        four_hourly = FeatureStore(os.path.join(root, 'features'), source=resampler)
+
+        base.write(SYMBOL, '1h', full.iloc[:first])
+        rows, build_time = timed(lambda: hourly.update(SYMBOL, '1h', OMEGA_SET))
+        four_hourly.update(SYMBOL, '4h', SWING_SET)
+        print(f"[*] Initial build: {rows} omega rows in {build_time * 1000:.1f} ms")
+
+        end = first
+        for step in STEPS:
+            base.write(SYMBOL, '1h', full.iloc[end:end + step])
+            end += step
+            added, append_time = timed(lambda: hourly.update(SYMBOL, '1h', OMEGA_SET))
+            four_hourly.update(SYMBOL, '4h', SWING_SET)
+            print(f"  +{step:<5} candles -> {added:<5} rows written in {append_time * 1000:6.1f} ms")
+        if hourly.update(SYMBOL, '1h', OMEGA_SET) != 1:  # nothing new: only the last row is redone
+            failures += 1
+        if base.write(SYMBOL, '1h', full.iloc[end - 2 * step:end]) != 0:  # overlapping page: no rows added
+            failures += 1
+            print("  [!] update without new candles did not stop at the last row")
+
+        # Appended rows equal one full computation (4h: including the bucket that was open)
+        stored, read_time = timed(lambda: hourly.read(SYMBOL, '1h', OMEGA_SET))
+        recomputed, full_time = timed(lambda: omega_frame(full.drop(columns='time')))
+        failures += compare("omega appended vs full", stored, recomputed)
+        bars_4h = resampler.read(SYMBOL, '4h').set_index('date')
+        failures += compare("swing 4h appended vs full", four_hourly.read(SYMBOL, '4h', SWING_SET),
+                            swing_frame(bars_4h.drop(columns='time')))
+        print(f"[*] Full recompute {full_time * 1000:.1f} ms | read {len(stored)} rows {read_time * 1000:.1f} ms")
+
+        # Readers get views on the memory map, no copies
+        times, X, names = hourly.matrix(SYMBOL, '1h', OMEGA_SET, start='2017-03-01', end='2017-06-01')
+        if X.flags.owndata or X.flags.writeable:
+            failures += 1
+            print("  [!] matrix() copied the partition")
+        print(f"[*] matrix(): {X.shape} view, columns {names[:5]}...")
+        _, X_cols, _ = hourly.matrix(SYMBOL, '1h', OMEGA_SET, start='2017-03-01', end='2017-06-01',
+                                     columns=names[1:4])
+        _, X_picked, _ = hourly.matrix(SYMBOL, '1h', OMEGA_SET, start='2017-03-01', end='2017-06-01',
+                                       columns=[names[3], names[0]])
+        if X_cols.flags.owndata or X_cols.flags.writeable or not np.array_equal(X_cols, X[:, 1:4]):
+            failures += 1
+            print("  [!] adjacent columns were copied")
+        if not np.array_equal(X_picked, X[:, [3, 0]]):
+            failures += 1
+            print("  [!] reordered column selection differs")
+
+        # Changed parameters or code start a new version (full rebuild)
+        changed = FeatureSet('omega', omega_frame, params={'whale_factor': 3.0}, warmup=OMEGA_SET.warmup,
+                             code=OMEGA_SET.code[1:])
+        rebuilt = hourly.update(SYMBOL, '1h', changed)
+        if changed.version == OMEGA_SET.version or rebuilt != len(stored):
+            failures += 1
+            print(f"  [!] parameter change did not invalidate ({rebuilt} rows rebuilt)")
+        failures += compare("new version vs full", hourly.read(SYMBOL, '1h', changed),
+                            omega_frame(full.drop(columns='time'), whale_factor=3.0))
+        print(f"[*] Versions on disk: {hourly.versions('omega')}, pruned {hourly.prune(changed)}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] Incremental feature store matches full recomputation")
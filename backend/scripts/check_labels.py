@@ -0,0 +1,96 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.ohlcv_store import OHLCVStore
+from utils.feature_store import FeatureStore
+from utils.labels import label_frame, label_set, triple_barrier, barrier_name
+from check_feature_store import candles, compare
+
+HOURS = 24 * 365 * 2
+SYMBOL = 'SYN/USDT'
+HORIZONS = [1, 4, 12, 24, 72]
+BARRIERS = [(0.01, 0.01, 24), (0.02, 0.01, 24), (0.03, 0.015, 48), (0.05, 0.02, 72)]
+STEPS = [1, 5, 30, 24 * 40]
+
+def reference_barrier(close, high, low, tp, sl, h):
+    """Bar-by-bar scan of each row's next h bars (stop wins ties)."""
+    n = len(close)
+    label, bars = np.full(n, np.nan), np.full(n, np.nan)
+    for t in range(n - h):
+        label[t], bars[t] = 0.0, h
+        for k in range(1, h + 1):
+            if low[t + k] <= close[t] * (1 - sl):
+                label[t], bars[t] = -1.0, k
+                break
+            if high[t + k] >= close[t] * (1 + tp):
+                label[t], bars[t] = 1.0, k
+                break
+    return label, bars
+
+def timed(fn):
+    started = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - started
+
+if __name__ == "__main__":
+    full = candles(HOURS)
+    bars = full.drop(columns='time')
+    failures = 0
+
+    # One pass for every horizon and barrier vs shift() targets and a bar-by-bar scan
+    frame, pass_time = timed(lambda: label_frame(bars, HORIZONS, BARRIERS))
+    print(f"[*] {len(HORIZONS)} horizons + {len(BARRIERS)} barriers on {HOURS} bars in {pass_time * 1000:.1f} ms")
+    for h in HORIZONS:
+        expected = (bars['close'].shift(-h) > bars['close']).astype(float).where(bars['close'].shift(-h).notna())
+        failures += compare(f"up_{h}", frame[[f'up_{h}']], expected.to_frame(f'up_{h}'))
+    close, high, low = (bars[c].to_numpy() for c in ('close', 'high', 'low'))
+    head = 3000
+    fast = triple_barrier(close[:head], high[:head], low[:head], BARRIERS)
+    for tp, sl, h in BARRIERS:
+        label, held = reference_barrier(close[:head], high[:head], low[:head], tp, sl, h)
+        if not (np.array_equal(fast[(tp, sl, h)][0], label, equal_nan=True) and
+                np.array_equal(fast[(tp, sl, h)][1], held, equal_nan=True)):
+            failures += 1
+            print(f"  [!] {barrier_name(tp, sl, h)} differs from the bar-by-bar scan")
+        counts = pd.Series(fast[(tp, sl, h)][0]).value_counts().to_dict()
+        print(f"  {barrier_name(tp, sl, h):<18} tp/stop/timeout = "
+              f"{counts.get(1.0, 0)}/{counts.get(-1.0, 0)}/{counts.get(0.0, 0)}")
+
+    # Stored next to the features: appends redo the rows whose horizon was incomplete
+    root = tempfile.mkdtemp(prefix="check_labels_")
+    try:
+        source = OHLCVStore(os.path.join(root, 'store'))
+        labels = FeatureStore(os.path.join(root, 'features'), source=source)
+        definition = label_set(HORIZONS, BARRIERS)
+        first = HOURS - sum(STEPS)
+        source.write(SYMBOL, '1h', full.iloc[:first])
+        labels.update(SYMBOL, '1h', definition)
+        end = first
+        for step in STEPS:
+            source.write(SYMBOL, '1h', full.iloc[end:end + step])
+            end += step
+            written, append_time = timed(lambda: labels.update(SYMBOL, '1h', definition))
+            print(f"  +{step:<4} candles -> {written:<4} label rows in {append_time * 1000:5.1f} ms")
+        failures += compare("labels appended vs full", labels.read(SYMBOL, '1h', definition),
+                            label_frame(bars, HORIZONS, BARRIERS))
+
+        # A sweep over definitions: each one is computed once, then read from the store
+        sweep = [label_set([h], [(tp, sl, h)]) for h in (12, 24, 48) for tp, sl in ((0.01, 0.01), (0.02, 0.01))]
+        _, cold = timed(lambda: [labels.load(SYMBOL, '1h', d) for d in sweep])
+        _, warm = timed(lambda: [labels.load(SYMBOL, '1h', d) for d in sweep])
+        print(f"[*] Sweep of {len(sweep)} definitions: first {cold * 1000:.1f} ms | cached {warm * 1000:.1f} ms "
+              f"({len(labels.versions('labels'))} versions stored)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] Labels match the per-row definitions and the incremental store")
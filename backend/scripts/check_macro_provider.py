@@ -0,0 +1,81 @@
+import sys
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import macro_provider as mp
+
+DAYS = pd.date_range("2019-01-01", "2024-06-30", freq="D")
+
+class StubProvider(mp.MacroDataProvider):
+    """Serves deterministic series instead of yfinance / Binance and counts downloads."""
+
+    def __init__(self, cache_dir):
+        super().__init__(cache_dir)
+        self.downloads = []
+
+    def _download(self, name, start_date):
+        self.downloads.append((name, start_date))
+        spec = mp.SERIES[name]
+        days = DAYS[DAYS >= pd.Timestamp(start_date)]
+        if spec['source'] == 'yfinance':
+            days = days[days.dayofweek < 5]  # no weekend bars -> NaN until ffill
+        seed = sum(map(ord, name))
+        values = {col: 100 + DAYS.get_indexer(days) * 0.1 + seed for col in spec['columns'].values()}
+        return pd.DataFrame({'date': days, **values})
+
+def legacy(provider, start_date):
+    """Previous get(): merge the per-series frames, slice at start_date, then ffill."""
+    frames = [provider._download(name, start_date) for name in mp.SERIES]
+    macro = frames[0]
+    for df in frames[1:]:
+        macro = pd.merge(macro, df, on='date', how='outer')
+    macro = macro[macro['date'] >= pd.Timestamp(start_date)]
+    return macro.sort_values('date').ffill().reset_index(drop=True)
+
+def check(name, ok):
+    print(f"  {name:<52} {'ok' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    cache_dir = tempfile.mkdtemp(prefix="macro_provider_")
+    failures = 0
+    try:
+        provider = StubProvider(cache_dir)
+        long_frame = provider.get("2020-01-01")
+        failures += check("merged frame equals the legacy merge",
+                          long_frame.equals(legacy(StubProvider(cache_dir), "2020-01-01")))
+
+        # Different start dates are slices of one merged frame, not a thrashing single entry
+        short_frame = provider.get("2023-01-01")
+        failures += check("short start equals the legacy merge",
+                          short_frame.equals(legacy(StubProvider(cache_dir), "2023-01-01")))
+        downloads = len(provider.downloads)
+        again = [provider.get("2020-01-01"), provider.get("2023-01-01")]
+        failures += check("alternating start dates are served from memory",
+                          again[0] is long_frame and again[1] is short_frame and len(provider.downloads) == downloads)
+
+        # A stale short refresh merges into the cached range instead of shrinking it
+        for name in list(provider._series):
+            fetched_at, start, df = provider._series[name]
+            provider._series[name] = (0.0, start, df)
+        provider.get("2024-01-01")
+        disk = mp.feather.read_table(provider._disk_path('dxy')).to_pandas()
+        failures += check("short refresh keeps the long range on disk",
+                          disk['date'].iloc[0] <= pd.Timestamp("2020-01-01"))
+
+        restarted = StubProvider(cache_dir)
+        restarted.get("2020-01-01")
+        yf_downloads = [d for d in restarted.downloads if mp.SERIES[d[0]]['source'] == 'yfinance']
+        failures += check("long request after restart needs no yfinance download", not yf_downloads)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if failures:
+        print(f"[!] {failures} checks failed")
+        sys.exit(1)
+    print("[*] macro provider cache ok")
@@ -0,0 +1,91 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.event_calendar import event_engine
+from utils.omega_features import add_omega_features, add_swing_features, feature_columns, OMEGA_FEATURES, SWING_FEATURES
+from check_ta_parity import synthetic_ohlcv
+
+HOURS = 24 * 365 * 6
+TAILS = [1, 2, 24, 500]
+RTOL = 1e-9  # legacy pandas rolling sums vs per-window reductions
+ATOL = 1e-7  # x close: pandas' running std leaves price-scaled noise on flat windows (exact 0 here)
+
+def legacy_omega(df, whale_factor=2.5, daily_close=None, fill=True):
+    """The inline feature code the omega scripts used to carry."""
+    df = df.copy()
+    df['rsi'] = (df['close'].diff().apply(lambda x: max(x,0)).rolling(14).mean() /
+                 df['close'].diff().apply(lambda x: abs(x)).rolling(14).mean() * 100).fillna(50)
+    df['micro_vol'] = df['close'].rolling(4).std().fillna(0) if fill else df['close'].rolling(4).std()
+    if daily_close is not None:
+        df['macro_trend'] = daily_close.reindex(df.index, method='ffill')
+    else:
+        df['macro_trend'] = df['close'].rolling(24).mean().fillna(df['close'])
+    df['whale_activity'] = (df['volume'] > df['volume'].rolling(24).mean() * whale_factor).astype(int)
+    df['net_flow_proxy'] = (df['close'] - df['open']) * df['whale_activity']
+    return pd.concat([df, event_engine.get_event_features(df.index)], axis=1)
+
+def legacy_swing(df):
+    df = df.copy()
+    df['rsi'] = (df['close'].diff().apply(lambda x: max(x,0)).rolling(14).mean() /
+                 df['close'].diff().apply(lambda x: abs(x)).rolling(14).mean() * 100).fillna(50)
+    df['sma_ratio'] = (df['close'].rolling(10).mean() / df['close'].rolling(30).mean()).fillna(1.0)
+    df['volatility'] = df['close'].rolling(20).std() / df['close'].rolling(20).mean() * 100
+    return pd.concat([df, event_engine.get_event_features(df.index)], axis=1)
+
+def timed(fn):
+    started = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - started
+
+def check(label, legacy, batch, tail, base):
+    failures = 0
+    expected, legacy_time = timed(legacy)
+    actual, batch_time = timed(batch)
+    cols = feature_columns(actual, base)
+    atol = ATOL * actual['close'].to_numpy()
+    for col in cols:
+        a, b = expected[col].to_numpy(dtype=float), actual[col].to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            bad = ~((np.abs(a - b) <= atol + RTOL * np.abs(b)) | (np.isnan(a) & np.isnan(b)))
+        if bad.any():
+            failures += 1
+            i = np.flatnonzero(bad)[0]
+            print(f"  [!] {label} batch vs legacy: {col} differs on {bad.sum()} rows (first {a[i]} != {b[i]})")
+
+    for n in TAILS:
+        rows = tail(n)
+        try:
+            pd.testing.assert_frame_equal(actual[cols].iloc[-n:], rows[cols], check_exact=True)
+        except AssertionError as e:
+            failures += 1
+            print(f"  [!] {label} tail={n} vs batch: {e}")
+    _, tail_time = timed(lambda: tail(1))
+    print(f"  {label:<14} legacy={legacy_time * 1000:8.1f} ms batch={batch_time * 1000:7.1f} ms "
+          f"tail(1)={tail_time * 1000:5.2f} ms")
+    return failures
+
+if __name__ == "__main__":
+    df = synthetic_ohlcv(HOURS, seed=3, flat_every=500)
+    df['open'] = df['close'].shift(1).fillna(df['close'])
+    df.loc[df.index[::997], 'volume'] *= 8  # whale bars
+    daily = df['close'].resample('1D').last()
+
+    print(f"[*] Omega features on {HOURS} hourly bars")
+    failures = 0
+    failures += check('omega', lambda: legacy_omega(df), lambda: add_omega_features(df),
+                      lambda n: add_omega_features(df, tail=n), OMEGA_FEATURES)
+    failures += check('omega (prime)', lambda: legacy_omega(df, 3, daily, fill=False),
+                      lambda: add_omega_features(df, 3, daily, fill=False),
+                      lambda n: add_omega_features(df, 3, daily, fill=False, tail=n), OMEGA_FEATURES)
+    df_4h = df.iloc[::4]
+    failures += check('swing 4h', lambda: legacy_swing(df_4h), lambda: add_swing_features(df_4h),
+                      lambda n: add_swing_features(df_4h, tail=n), SWING_FEATURES)
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] Batch matches legacy; tail rows identical to batch")
@@ -0,0 +1,99 @@
+import sys
+import os
+import io
+import time
+import shutil
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from strategies.adaptive_ai import AdaptiveAIStrategy
+from strategies.adaptive_ai_enhanced import ProteusAI
+from strategies.proteus_neo import ProteusNeo
+from check_stream_parity import synthetic_market
+
+DAYS = 1100
+TEST_DAYS = 365
+COLD_TEST_DAYS = 120  # no train_all(): modes are trained on the fly by analyze()
+KEYS = ["signal", "mode", "prediction", "confidence"]
+
+def count_model_calls(strategy):
+    """Wrap every loaded model's predict / predict_proba with a call counter (outer calls only)."""
+    calls = {"n": 0, "depth": 0}
+    for model in strategy.models.values():
+        if model is None:
+            continue
+        for method in ("predict", "predict_proba"):
+            original = getattr(model, method)
+            def counted(*args, _original=original, **kwargs):
+                calls["n"] += calls["depth"] == 0  # RF.predict calls predict_proba itself
+                calls["depth"] += 1
+                try:
+                    return _original(*args, **kwargs)
+                finally:
+                    calls["depth"] -= 1
+            setattr(model, method, counted)
+    return calls
+
+def same(a, b) -> bool:
+    if isinstance(a, str) or isinstance(b, str):
+        return a == b
+    return (pd.isna(a) and pd.isna(b)) or a == b
+
+def compare(name, expected, history) -> int:
+    failures = 0
+    for row, result in zip(history.to_dict('records'), expected):
+        for key in KEYS:
+            if not same(result.get(key, np.nan), row[key]):
+                failures += 1
+                print(f"  [!] {name} {key}: analyze={result.get(key)!r} predict_history={row[key]!r}")
+                break
+        if failures >= 3:
+            break
+    return failures
+
+def run(cls, df, train_rows, positions):
+    """Iterative analyze() loop vs predict_history() on twin strategies (separate model dirs)."""
+    dirs = [tempfile.mkdtemp(prefix="predict_history_") for _ in range(2)]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            loop, batch = cls({"model_dir": dirs[0]}), cls({"model_dir": dirs[1]})
+            if train_rows:
+                loop.train_all(df.iloc[:train_rows])
+                batch.train_all(df.iloc[:train_rows])
+            loop_calls, batch_calls = count_model_calls(loop), count_model_calls(batch)
+
+            started = time.perf_counter()
+            expected = []
+            for p in positions:
+                expected.append(loop.analyze(df.iloc[:p + 1]))
+            loop_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            history = batch.predict_history(df, positions)
+            batch_time = time.perf_counter() - started
+        modes = pd.Series([r.get('mode') for r in expected]).value_counts().to_dict()
+        label = "trained" if train_rows else "cold"  # cold: models appear mid-run, calls not counted
+        print(f"  {cls.__name__:<19} {label:<8} {len(positions)} days: loop={loop_time:6.2f} s "
+              f"({loop_calls['n'] if train_rows else '-'} model calls) | batch={batch_time * 1000:7.1f} ms "
+              f"({batch_calls['n'] if train_rows else '-'} calls) {modes}")
+        return compare(f"{cls.__name__} {label}", expected, history)
+    finally:
+        for d in dirs:
+            shutil.rmtree(d, ignore_errors=True)
+
+if __name__ == "__main__":
+    df = synthetic_market(DAYS, seed=3)
+    df['vix_close'] = df['vix_close'] * 0.35  # around the circuit breaker's VIX 35
+    failures = 0
+    for cls in (AdaptiveAIStrategy, ProteusAI, ProteusNeo):
+        failures += run(cls, df, DAYS - TEST_DAYS, np.arange(DAYS - TEST_DAYS, DAYS))
+    failures += run(AdaptiveAIStrategy, df, 0, np.arange(30, 30 + COLD_TEST_DAYS))
+
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] predict_history() matches the analyze() loop")
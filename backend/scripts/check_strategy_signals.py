@@ -0,0 +1,78 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from strategies import STRATEGIES
+from check_ta_parity import synthetic_ohlcv
+
+RULE_BASED = ["sma_crossover", "mean_reversion", "momentum", "bollinger", "grid", "dca",
+              "supertrend", "dip_hunter", "macd", "breakout"]
+BARS = 600
+BENCH_BARS = 24 * 365 * 2
+# Tighter settings so every strategy also emits BUY and SELL on a random walk
+PARAMS = [{}, {"fast_period": 5, "slow_period": 12, "oversold": 40, "overbought": 60, "threshold": 0.5,
+               "squeeze_threshold": 0.01, "grid_size": 0.005, "dip_threshold": -0.01,
+               "rally_threshold": 0.01, "buffer_pct": 0.001, "take_profit_rsi": 45, "lookback": 10}]
+
+def replay(strategy, df):
+    """analyze() on every growing window with one instance, as a live loop would call it."""
+    return [strategy.analyze(df.iloc[:i + 1].copy()) for i in range(len(df))]
+
+def same(a, b) -> bool:
+    if isinstance(a, str) or isinstance(b, str):
+        return a == b
+    return (np.isnan(a) and np.isnan(b)) or a == b
+
+def conform(strategy_id, params, df) -> int:
+    expected = replay(STRATEGIES[strategy_id](params), df)
+    signals = STRATEGIES[strategy_id](params).generate_signals(df)
+    failures = 0
+    for i, result in enumerate(expected):
+        row = signals.iloc[i]
+        for key in signals.columns:
+            if not same(result.get(key, np.nan), row[key]):
+                failures += 1
+                print(f"  [!] {strategy_id} row {i} {key}: analyze={result.get(key)!r} "
+                      f"generate_signals={row[key]!r}")
+                break
+        if failures >= 3:
+            break
+    counts = signals['signal'].value_counts().to_dict()
+    print(f"  {strategy_id:<15} {'tight' if params else 'default':<8} BUY={counts.get('BUY', 0):<4} "
+          f"SELL={counts.get('SELL', 0):<4} {'ok' if not failures else 'MISMATCH'}")
+    return failures
+
+def timed(fn):
+    started = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - started
+
+if __name__ == "__main__":
+    failures = 0
+    df = synthetic_ohlcv(BARS, seed=5)
+    flat = synthetic_ohlcv(BARS, seed=6, flat_every=150)
+    for params in PARAMS:
+        for strategy_id in RULE_BASED:
+            failures += conform(strategy_id, params, df)
+    for strategy_id in RULE_BASED:
+        failures += conform(strategy_id, {}, flat)
+
+    # Array speed: one pass over a long history vs analyze() on its last 500 windows
+    long_df = synthetic_ohlcv(BENCH_BARS, seed=7)
+    for strategy_id in RULE_BASED:
+        strategy = STRATEGIES[strategy_id]({})
+        _, window_time = timed(lambda: [strategy.analyze(long_df.iloc[:i + 1].copy())
+                                        for i in range(BENCH_BARS - 500, BENCH_BARS)])
+        _, fast_time = timed(lambda: STRATEGIES[strategy_id]({}).generate_signals(long_df))
+        per_bar = window_time / 500
+        print(f"  {strategy_id:<15} analyze loop ~{per_bar * BENCH_BARS:6.1f} s est. | "
+              f"generate_signals {fast_time * 1000:6.1f} ms for {BENCH_BARS} bars")
+
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] generate_signals() matches analyze() on every prefix")
@@ -0,0 +1,75 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from strategies import adaptive_ai
+from strategies.adaptive_ai import AdaptiveAIStrategy
+from strategies.adaptive_ai_enhanced import ProteusAI
+from strategies.proteus_neo import ProteusNeo
+from check_ta_parity import synthetic_ohlcv, RTOL, ATOL
+
+BARS = 3000
+CYCLES = 40      # live cycles replayed at the end of the history
+RESTART_AT = 20  # drop the in-memory streams here (restart resumes from feature_stream.json)
+
+def synthetic_market(n, seed=0):
+    """Asset candles + the macro / market columns the Proteus strategies read."""
+    df = synthetic_ohlcv(n, seed=seed)
+    macro = {name: synthetic_ohlcv(n, seed=seed + i + 1)['close']
+             for i, name in enumerate(['vix_close', 'dxy_close', 'eth_btc_close', 'market_btc_close'])}
+    df = df.assign(**macro, market_btc_vol=synthetic_ohlcv(n, seed=seed + 9)['volume'])
+    return df.rename_axis('date').reset_index()
+
+def check_strategy(cls, df, model_dir):
+    strategy = cls({"model_dir": model_dir, "stream_features": True})
+    strategy.model_dir = model_dir
+    failures, checked = 0, 0
+    stream_time = batch_time = 0.0
+
+    for cycle, end in enumerate(range(len(df) - CYCLES, len(df))):
+        if cycle == RESTART_AT:
+            adaptive_ai._feature_streams.clear()
+        candles = df.iloc[:end + 1]
+        for mode in cls.MODES:
+            started = time.perf_counter()
+            streamed = strategy._latest_features(candles, mode)
+            stream_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            batch = strategy._create_features(candles, mode)
+            batch_time += time.perf_counter() - started
+
+            if batch.index[-1] != candles.index[-1]:
+                continue  # batch dropped the newest row; analyze() falls back to it anyway
+            checked += 1
+            try:
+                pd.testing.assert_frame_equal(batch.iloc[[-1]], streamed, rtol=RTOL, atol=ATOL,
+                                              check_dtype=False)
+            except AssertionError as e:
+                failures += 1
+                print(f"  [!] {cls.__name__} {mode} @ {end}: {e}")
+
+    print(f"  {cls.__name__:<20} rows={checked:<4} stream={stream_time * 1000:8.1f} ms "
+          f"batch={batch_time * 1000:8.1f} ms")
+    return failures
+
+if __name__ == "__main__":
+    df = synthetic_market(BARS)
+    print(f"[*] Stream vs batch features, last {CYCLES} of {BARS} bars")
+    failures = 0
+    for cls in (AdaptiveAIStrategy, ProteusAI, ProteusNeo):
+        model_dir = tempfile.mkdtemp(prefix="stream_parity_")
+        try:
+            failures += check_strategy(cls, df, model_dir)
+        finally:
+            shutil.rmtree(model_dir, ignore_errors=True)
+    if failures:
+        print(f"[!] {failures} mismatches")
+        sys.exit(1)
+    print("[*] All feature rows match")
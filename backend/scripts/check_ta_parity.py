@@ -0,0 +1,93 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ta_compat as ta
+
+RTOL = 1e-6  # pandas rolling var/mean carry ~1e-7 relative noise after large moves
+ATOL = 1e-6
+HOURS_10Y = 24 * 365 * 10
+
+def synthetic_ohlcv(n, seed=0, flat_every=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    if flat_every:
+        # Flat stretches: zero ranges / zero losses exercise the 0/0 and division guards
+        for start in range(flat_every, n - 40, flat_every):
+            close[start:start + 30] = close[start]
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    high, low = close + spread, close - spread
+    if flat_every:
+        flat = np.r_[False, close[1:] == close[:-1]]
+        high[flat], low[flat] = close[flat], close[flat]
+    index = pd.date_range("2015-01-01", periods=n, freq='h')
+    return pd.DataFrame({'open': close, 'high': high, 'low': low, 'close': close,
+                         'volume': rng.uniform(1, 1000, n)}, index=index)
+
+CASES = {
+    'rsi': lambda df: ta.rsi(df['close'], length=14),
+    'sma': lambda df: ta.sma(df['close'], length=50),
+    'ema': lambda df: ta.ema(df['close'], length=20),
+    'macd': lambda df: ta.macd(df['close']),
+    'bbands': lambda df: ta.bbands(df['close'], length=20, std=2),
+    'atr': lambda df: ta.atr(df['high'], df['low'], df['close'], length=14),
+    'adx': lambda df: ta.adx(df['high'], df['low'], df['close'], length=14),
+    'roc': lambda df: ta.roc(df['close'], length=10),
+    'stoch': lambda df: ta.stoch(df['high'], df['low'], df['close']),
+    'obv': lambda df: ta.obv(df['close'], df['volume']),
+    'cci': lambda df: ta.cci(df['high'], df['low'], df['close'], length=20),
+    'willr': lambda df: ta.willr(df['high'], df['low'], df['close'], length=14),
+    'willr21': lambda df: ta.willr(df['high'], df['low'], df['close'], length=21),  # odd window
+}
+
+def run(backend, fn, df):
+    ta.set_backend(backend)
+    started = time.perf_counter()
+    out = fn(df)
+    return out, time.perf_counter() - started
+
+def compare(expected, actual):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(expected, actual, rtol=RTOL, atol=ATOL)
+    else:
+        pd.testing.assert_series_equal(expected, actual, rtol=RTOL, atol=ATOL)
+
+def check_dataset(label, df, timed=False):
+    failures = 0
+    total_ta, total_np = 0.0, 0.0
+    for name, fn in CASES.items():
+        try:
+            expected, t_ta = run('ta', fn, df)
+            actual, t_np = run('numpy', fn, df)
+            compare(expected, actual)
+            total_ta += t_ta
+            total_np += t_np
+            if timed:
+                print(f"  {name:<7} ta {t_ta*1000:9.1f} ms | numpy {t_np*1000:7.1f} ms | x{t_ta / t_np:7.1f}")
+        except Exception as e:
+            failures += 1
+            print(f"  [!] {label} / {name}: {type(e).__name__}: {str(e)[:200]}")
+    status = "✓" if not failures else f"{failures} FAILED"
+    print(f"[*] {label:<28} {len(df):>6} rows | ta {total_ta:6.2f}s | numpy {total_np:6.3f}s | {status}")
+    return failures
+
+if __name__ == "__main__":
+    print("="*70)
+    print("🧪 TA PARITY: ta_kernels (numpy) vs ta library")
+    print("="*70)
+    failures = 0
+    failures += check_dataset("10y hourly random walk", synthetic_ohlcv(HOURS_10Y), timed=True)
+    failures += check_dataset("flat stretches", synthetic_ohlcv(5000, seed=1, flat_every=200))
+    failures += check_dataset("short (30 rows)", synthetic_ohlcv(30, seed=2))
+    failures += check_dataset("integer index", synthetic_ohlcv(2000, seed=3).reset_index(drop=True))
+
+    with_nans = synthetic_ohlcv(2000, seed=4)
+    with_nans.iloc[500:510] = np.nan  # falls back to 'ta'
+    failures += check_dataset("NaN inputs (fallback)", with_nans)
+
+    ta.set_backend('numpy')
+    sys.exit(1 if failures else 0)
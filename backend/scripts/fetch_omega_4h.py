@@ -1,40 +1,27 @@
-
-import ccxt
-import pandas as pd
+import sys
 import os
-import time
-from datetime import datetime, timedelta
 
-DATA_DIR = '../data/omega_4h'
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.ohlcv_store import store
+from utils.resampler import resampler
+
 SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'XRP/USDT', 'ADA/USDT', 'DOGE/USDT', 'SHIB/USDT', 'LINK/USDT', 'MATIC/USDT', 'AVAX/USDT', 'DOT/USDT', 'TRX/USDT', 'UNI/USDT', 'BNB/USDT', 'LTC/USDT']
+TIMEFRAMES = ['4h', '1d']
 
 def fetch_omega_4h():
-    if not os.path.exists(DATA_DIR): os.makedirs(DATA_DIR)
-    exchange = ccxt.binance()
-    
+    """4h/1d bars are derived from the 1h store (kept current by fetch_full_history.py), no downloads"""
     print("="*60)
-    print("🌊 OMEGA SWING (4H) - DATA ACQUISITION")
+    print("🌊 OMEGA SWING (4H) - DATA ACQUISITION (DERIVED FROM 1H)")
     print("="*60)
 
     for symbol in SYMBOLS:
-        print(f"[*] Fetching {symbol} 4h data...")
-        since = exchange.parse8601('2019-01-01T00:00:00Z')
-        all_ohlcv = []
-        
-        while True:
-            try:
-                ohlcv = exchange.fetch_ohlcv(symbol, '4h', since=since, limit=1000)
-                if not ohlcv: break
-                all_ohlcv.extend(ohlcv)
-                since = ohlcv[-1][0] + 1
-                if len(ohlcv) < 1000: break
-                time.sleep(0.1)
-            except: break
-            
-        df = pd.DataFrame(all_ohlcv, columns=['time', 'open', 'high', 'low', 'close', 'volume'])
-        safe_symbol = symbol.replace('/', '_')
-        df.to_csv(os.path.join(DATA_DIR, f"{safe_symbol}_4h.csv"), index=False)
-        print(f"  -> Saved {len(df)} candles.")
+        if not store.has(symbol, '1h'):
+            print(f"[!] No 1h history for {symbol}, run fetch_full_history.py first.")
+            continue
+        for tf in TIMEFRAMES:
+            written = resampler.sync(symbol, tf)
+            print(f"  -> {symbol} {tf}: {written} new bars.")
 
 if __name__ == "__main__":
     fetch_omega_4h()
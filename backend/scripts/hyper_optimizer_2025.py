@@ -1,6 +1,5 @@
 import sys
 import os
-import glob
 import pandas as pd
 import numpy as np
 import xgboost as xgb
@@ -9,11 +8,13 @@ import warnings
 
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.event_calendar import event_engine
+from utils.omega_features import (omega_panel, volatility_panel, event_features, symbol_features,
+                                  feature_columns)
+from utils.ohlcv_store import store
+from utils.panel import panel_from_store
 
 warnings.filterwarnings('ignore')
 
-DATA_DIR = '../data/raw'
 MODEL_PATH = '../data/proteus_omega/omega_brain.json'
 START_DATE = '2025-01-01'
 INITIAL_CAPITAL = 1000.0
@@ -28,26 +29,18 @@ def run_optimization():
     model = xgb.XGBClassifier()
     model.load_model(MODEL_PATH)
     
-    csv_files = [f for f in glob.glob(os.path.join(DATA_DIR, "*_USDT_1h.csv"))]
+    symbols = [s for s in store.symbols('1h') if s.endswith('_USDT')]
     assets_data = {}
     
-    print(f"[*] Pre-loading {len(csv_files)} assets into memory...")
-    for f in csv_files:
-        symbol = os.path.basename(f).replace("_1h.csv", "")
-        df = pd.read_csv(f)
-        df['date'] = pd.to_datetime(df['time'], unit='ms')
-        df = df[df['date'] >= '2024-12-01'].set_index('date').sort_index()
-        df['rsi'] = (df['close'].diff().apply(lambda x: max(x,0)).rolling(14).mean() / 
-                     df['close'].diff().apply(lambda x: abs(x)).rolling(14).mean() * 100).fillna(50)
-        df['micro_vol'] = df['close'].rolling(4).std().fillna(0)
-        df['macro_trend'] = df['close'].rolling(24).mean().fillna(df['close'])
-        df['whale'] = (df['volume'] > df['volume'].rolling(24).mean() * 2.5).astype(int)
-        df['net_flow'] = (df['close'] - df['open']) * df['whale']
-        ev = event_engine.get_event_features(df.index)
-        df = pd.concat([df, ev], axis=1)
-        feats = ['rsi', 'micro_vol', 'macro_trend', 'whale', 'net_flow'] + [col for col in df.columns if 'event_' in col]
-        df['prob'] = model.predict_proba(df[feats])[:, 1]
-        df['volatility_index'] = df['close'].rolling(20).std() / df['close'].rolling(20).mean() * 100
+    print(f"[*] Pre-loading {len(symbols)} assets into memory...")
+    # one time x symbols panel: each indicator and the event calendar run once for every asset
+    panel = panel_from_store(symbols, '1h', start='2024-12-01')
+    columns = omega_panel(panel)
+    columns['volatility_index'] = volatility_panel(panel)
+    events = event_features(panel.index)
+    for symbol in panel.symbols:
+        df = symbol_features(panel, symbol, columns, events)
+        df['prob'] = model.predict_proba(df[feature_columns(df)])[:, 1]
         assets_data[symbol] = df[df.index >= START_DATE]
 
     master_timeline = pd.to_datetime(sorted(list(set().union(*[df.index for df in assets_data.values()]))))
@@ -79,7 +72,7 @@ def run_optimization():
                 for sym, df in assets_data.items():
                     if ts not in df.index: continue
                     r = df.loc[ts]
-                    if r['prob'] > rs['conf'] and r['volatility_index'] > rs['vol'] and r['whale'] == 1:
+                    if r['prob'] > rs['conf'] and r['volatility_index'] > rs['vol'] and r['whale_activity'] == 1:
                         if r['prob'] > max_p: max_p, best_s = r['prob'], sym
                 if best_s:
                     units = (bal * (1 - COMMISSION_RATE)) / assets_data[best_s].loc[ts, 'close']
@@ -0,0 +1,31 @@
+import sys
+import os
+import time
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.ohlcv_store import store
+
+# Legacy CSV directories (one file per symbol/timeframe)
+CSV_DIRS = ['../data/raw', '../data/omega', '../data/omega_4h']
+
+def import_all():
+    print("="*60)
+    print("🗄️ OHLCV STORE - ONE-SHOT CSV IMPORT")
+    print(f"📁 Target: {store.root}")
+    print("="*60)
+
+    started = time.time()
+    total = 0
+    for csv_dir in CSV_DIRS:
+        if not os.path.isdir(csv_dir):
+            print(f"[!] Skipping missing directory: {csv_dir}")
+            continue
+        print(f"[*] Importing {csv_dir}...")
+        imported = store.import_csv_dir(csv_dir)
+        total += sum(imported.values())
+
+    print(f"✅ Imported {total} candles in {time.time() - started:.1f}s")
+
+if __name__ == "__main__":
+    import_all()
@@ -8,11 +8,12 @@ import numpy as np
 import ccxt
 import yfinance as yf
 from datetime import datetime
-from ta.momentum import RSIIndicator
 
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.order_flow_service import order_flow_engine
+from utils.omega_features import add_omega_features, feature_columns
+from utils.batch_inference import predict_proba_many
 
 # Check for GPU
 try:
@@ -56,38 +57,52 @@ class PerfectSniperLive:
         with open(STATE_FILE, 'w') as f:
             json.dump(self.state, f, indent=4)
 
-    def analyze(self, sym):
+    def features(self, sym):
+        """Newest omega feature row (1-row DataFrame), last close and whale flag; None on errors."""
         is_crypto = "USDT" in sym
         try:
             if is_crypto:
                 ohlcv = self.exchange.fetch_ohlcv(sym, '1h', limit=100)
                 df = pd.DataFrame(ohlcv, columns=['time', 'open', 'high', 'low', 'close', 'volume'])
+                df.index = pd.to_datetime(df['time'], unit='ms')
             else:
                 df = yf.download(sym, period="5d", interval="1h", progress=False)
-                df = df.reset_index()
                 if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
                 df.columns = [str(c).lower() for c in df.columns]
-                df = df[['close', 'volume']]
+                df = df[['close', 'volume']]  # no open -> net_flow_proxy = 0
 
-            df['rsi'] = RSIIndicator(df['close']).rsi().fillna(50)
-            df['macro_trend'] = df['close'].rolling(24).mean().fillna(df['close'])
-            df['micro_vol'] = df['close'].rolling(4).std().fillna(0)
-            df['whale'] = (df['volume'] > df['volume'].rolling(24).mean() * 2.5).astype(int)
-            df['net_flow'] = (df['close'] - df['open']) * df['whale'] if is_crypto else 0
-            
-            # Prepare Input (13-Dim placeholder matches training)
-            X = pd.DataFrame([[df['rsi'].iloc[-1], df['micro_vol'].iloc[-1], df['macro_trend'].iloc[-1], 
-                               df['whale'].iloc[-1], df['net_flow'].iloc[-1] if is_crypto else 0,
-                               0, 0, 0, 0, 0, 0, 0, 0]], 
-                             columns=['rsi', 'micro_vol', 'macro_trend', 'whale_activity', 'net_flow_proxy', 
-                                      'event_HALVING', 'event_PANDEMIC_CRASH', 'event_COINBASE_IPO', 
-                                      'event_LUNA_CRASH', 'event_FTX_CRASH', 'event_BTC_ETF_APPROVAL', 
-                                      'event_FED_RATE_HIKE_START', 'event_FED_RATE_CUT_START'])
-            
-            prob = self.model.predict_proba(X)[:, 1][0]
-            return prob, df['close'].iloc[-1], df['whale'].iloc[-1]
+            # Same 13-dim omega features as training, for the newest bar only
+            row = add_omega_features(df, tail=1)
+            return row[feature_columns(row)], df['close'].iloc[-1], row['whale_activity'].iloc[-1]
         except:
-            return 0.5, 0, 0
+            return None
+
+    def analyze_many(self, syms):
+        """{sym: (prob, price, whale)}: every symbol's row goes through one predict_proba of the shared brain."""
+        rows = {sym: self.features(sym) for sym in syms}
+        ready = [sym for sym in syms if rows[sym] is not None]
+        out = {sym: (0.5, 0, 0) for sym in syms}
+        if not ready:
+            return out
+        try:
+            probs = predict_proba_many([(self.model, rows[sym][0]) for sym in ready])
+        except Exception as e:
+            # One bad row must not zero every symbol: score them one by one
+            print(f"  [!] Batched prediction failed ({e}), falling back to per-symbol")
+            probs = []
+            for sym in ready:
+                try:
+                    probs.append(self.model.predict_proba(rows[sym][0]))
+                except Exception as err:
+                    print(f"  [!] Prediction failed for {sym}: {err}")
+                    probs.append(None)
+        for sym, prob in zip(ready, probs):
+            if prob is not None:
+                out[sym] = (prob[:, 1][0], rows[sym][1], rows[sym][2])
+        return out
+
+    def analyze(self, sym):
+        return self.analyze_many([sym])[sym]
 
     def tick(self):
         print(f"\n[🎯] SNIPER TICK | {datetime.now().strftime('%H:%M:%S')}")
@@ -109,8 +124,9 @@ class PerfectSniperLive:
 
         # 2. Hunt Mode (If balance > 0)
         print(f"  Piyasalar taranıyor (Eşik: %{CONFIDENCE_THRESHOLD*100})...")
+        scans = self.analyze_many(TARGETS)
         for sym in TARGETS:
-            prob, price, whale = self.analyze(sym)
+            prob, price, whale = scans[sym]
             if prob > CONFIDENCE_THRESHOLD and whale == 1:
                 print(f"  🎯 HEDEF KİLİTLENDİ! {sym} | Güven: {prob:.2%}")
                 # ALL-IN EXECUTION
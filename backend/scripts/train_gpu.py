@@ -9,6 +9,8 @@ import xgboost as xgb
 # Add backend to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategies.proteus_neo import ProteusNeo
+from utils.regimes import hourly_regimes
+from utils.labels import direction
 
 DATA_DIR = '../data/raw'
 MODEL_DIR = '../data/proteus_neo' 
@@ -42,31 +44,20 @@ def train_gpu():
         # Stocks are less volatile than crypto
         is_stock = len(symbol) < 3 or symbol.isdigit() or "_" in symbol and "USDT" not in symbol
         
-        # Thresholds
-        trend_thresh = 0.5 if is_stock else 1.0
-        vol_thresh = 1.0 if is_stock else 2.0
-        
-        # Mode Detection
-        trend = df['close'].pct_change(20) * 100
-        vol = df['close'].rolling(20).std() / df['close'].rolling(20).mean() * 100
-        
-        is_bull = (trend > trend_thresh) & (vol < vol_thresh)
-        is_bear = (trend < -trend_thresh) & (vol < vol_thresh)
+        # Mode Detection (thresholds by asset class)
+        regimes = hourly_regimes(df, crypto=not is_stock)
         
         # 3. Target
-        df['target'] = (df['close'].shift(-1) > df['close']).astype(int)
+        df['target'] = direction(df['close'], 1)
         
         # 4. Feature Selection
         feature_cols = ['rsi', 'sma_ratio'] # Start with core features
         
         df_clean = df.dropna()
+        modes = regimes.modes().loc[df_clean.index]
         
         for mode in strategy.MODES:
-            if mode == 'bull': mask = is_bull
-            elif mode == 'bear': mask = is_bear
-            else: mask = ~(is_bull | is_bear)
-            
-            mode_data = df_clean[mask.reindex(df_clean.index, fill_value=False)]
+            mode_data = df_clean[modes == mode]
             
             if len(mode_data) > 100:
                 datasets[mode]['X'].append(mode_data[feature_cols])
@@ -8,9 +8,10 @@ from datetime import datetime
 
 # Add paths
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.event_calendar import event_engine
+from utils.omega_features import add_omega_features, feature_columns
+from utils.resampler import resampler
+from utils.labels import direction
 
-DATA_DIR = '../data/omega'
 MODEL_DIR = '../data/proteus_omega'
 
 def train_omega_prime():
@@ -19,34 +20,17 @@ def train_omega_prime():
     print("="*60)
 
     # 1. Align and Merge Everything (Price + MTF + Events + On-Chain)
-    btc_1h = pd.read_csv(os.path.join(DATA_DIR, 'BTC_USDT_1h.csv'))
-    btc_1h['date'] = pd.to_datetime(btc_1h['time'], unit='ms')
-    df = btc_1h.set_index('date').sort_index()
+    df = resampler.read('BTC/USDT', '1h').set_index('date')
     
-    # On-Chain Proxy
-    df['whale_activity'] = (df['volume'] > df['volume'].rolling(24).mean() * 3).astype(int)
-    df['net_flow_proxy'] = (df['close'] - df['open']) * df['whale_activity']
+    # On-Chain Proxy + MTF (daily close, derived from the 1h store) + Events
+    btc_1d = resampler.read('BTC/USDT', '1d').set_index('date')
+    df = add_omega_features(df, whale_factor=3, daily_close=btc_1d['close'], fill=False)
     
-    # MTF Features
-    btc_1d = pd.read_csv(os.path.join(DATA_DIR, 'BTC_USDT_1d.csv'))
-    btc_1d['date'] = pd.to_datetime(btc_1d['time'], unit='ms')
-    btc_1d = btc_1d.set_index('date').sort_index()
-    df['macro_trend'] = btc_1d['close'].reindex(df.index, method='ffill')
-    df['micro_vol'] = df['close'].rolling(4).std()
-    
-    # Events
-    events = event_engine.get_event_features(df.index)
-    df = pd.concat([df, events], axis=1)
-    
-    # Target
-    df['target'] = (df['close'].shift(-24) > df['close']).astype(int)
-    
-    # Features
-    df['rsi'] = (df['close'].diff().apply(lambda x: max(x,0)).rolling(14).mean() / 
-                 df['close'].diff().apply(lambda x: abs(x)).rolling(14).mean() * 100).fillna(50)
+    # Target (24 bars ahead; the last 24 rows have none yet and are dropped)
+    df['target'] = direction(df['close'], 24)
     
     # 13 Dimensions: RSI, micro_vol, macro_trend, whale_activity, net_flow_proxy + 8 Events
-    features = ['rsi', 'micro_vol', 'macro_trend', 'whale_activity', 'net_flow_proxy'] + [col for col in df.columns if 'event_' in col]
+    features = feature_columns(df)
     
     df_clean = df.dropna()
     X = df_clean[features]
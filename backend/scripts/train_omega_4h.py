@@ -1,6 +1,5 @@
 import sys
 import os
-import glob
 import pandas as pd
 import numpy as np
 import xgboost as xgb
@@ -8,9 +7,11 @@ from datetime import datetime
 
 # Add paths
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.event_calendar import event_engine
+from utils.omega_features import SWING_SET
+from utils.feature_store import FeatureStore
+from utils.resampler import resampler
+from utils.labels import direction
 
-DATA_DIR = '../data/omega_4h'
 MODEL_DIR = '../data/proteus_omega_4h'
 
 def train_omega_4h():
@@ -18,27 +19,24 @@ def train_omega_4h():
     print("🚀 OMEGA SWING 4H - TRAINING MASTER BRAIN")
     print("="*60)
 
-    csv_files = glob.glob(os.path.join(DATA_DIR, "*_4h.csv"))
+    symbols = resampler.symbols('4h')  # derived from the 1h store
+    if not symbols:
+        print("[!] No 1h history in the store, run fetch_full_history.py first.")
+        return
     all_X, all_y = [], []
+    # Swing rows (rsi, sma_ratio, volatility + events) come from the feature store:
+    # only 4h candles added since the last run are computed
+    swing_store = FeatureStore(source=resampler)
     
-    for f in csv_files:
-        symbol = os.path.basename(f).replace("_4h.csv", "")
+    for symbol in symbols:
         print(f"[*] Processing {symbol}...")
-        df = pd.read_csv(f)
-        df['date'] = pd.to_datetime(df['time'], unit='ms')
-        df = df.set_index('date').sort_index()
+        df = resampler.read(symbol, '4h').set_index('date')
+        features = swing_store.load(symbol, '4h', SWING_SET)
+        df = df.join(features)
         
-        df['rsi'] = (df['close'].diff().apply(lambda x: max(x,0)).rolling(14).mean() / 
-                     df['close'].diff().apply(lambda x: abs(x)).rolling(14).mean() * 100).fillna(50)
-        df['sma_ratio'] = (df['close'].rolling(10).mean() / df['close'].rolling(30).mean()).fillna(1.0)
-        df['volatility'] = df['close'].rolling(20).std() / df['close'].rolling(20).mean() * 100
+        df['target'] = direction(df['close'], 12)
         
-        ev = event_engine.get_event_features(df.index)
-        df = pd.concat([df, ev], axis=1)
-        
-        df['target'] = (df['close'].shift(-12) > df['close']).astype(int)
-        
-        feats = ['rsi', 'sma_ratio', 'volatility'] + [col for col in df.columns if 'event_' in col]
+        feats = list(features.columns)
         df_clean = df.dropna()
         all_X.append(df_clean[feats])
         all_y.append(df_clean['target'])
@@ -10,6 +10,12 @@ from .base import BaseStrategy
 from typing import Dict, Any, List
 import pandas as pd
 import ta_compat as ta
+import ta_stream as stream
+import feature_spec
+from utils.regimes import RegimeSegments
+from utils import labels
+from utils.model_registry import model_registry
+from utils.predictor import predictor_for
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
@@ -23,6 +29,59 @@ try:
 except ImportError:
     XGB_AVAILABLE = False
 
+def _load_xgb(path: str):
+    model = xgb.XGBClassifier()
+    model.load_model(path)
+    return model
+
+STREAM_FILE = "feature_stream.json"
+# Live feature streams by (strategy, model_dir); they outlive the per-cycle strategy objects
+_feature_streams = {}
+
+# Ozellik tanimlari (name, op, inputs, params); ortak ara hesaplar tek grafikte bir kez yapilir
+FEATURE_SPEC = [
+    # Temel ozellikler (tum modlar)
+    ('rsi', 'rsi', ['close'], {'length': 14}),
+    ('sma_fast', 'mean', ['close'], {'window': 10}),
+    ('sma_slow', 'mean', ['close'], {'window': 30}),
+    ('sma_ratio', 'div', ['sma_fast', 'sma_slow'], {}),
+    ('change_1', 'pct_change', ['close'], {'periods': 1}),
+    ('price_change_1d', 'mul', ['change_1', 100], {}),
+    ('change_5', 'pct_change', ['close'], {'periods': 5}),
+    ('price_change_5d', 'mul', ['change_5', 100], {}),
+    ('volume_change_1', 'pct_change', ['volume'], {'periods': 1}),
+    ('volume_change', 'mul', ['volume_change_1', 100], {}),
+    # Bull: momentum
+    ('roc_10', 'roc', ['close'], {'length': 10}),
+    ('adx', 'adx', ['high', 'low', 'close'], {'length': 14}),
+    ('macd_hist', 'macd_hist', ['close'], {'fast': 12, 'slow': 26, 'signal': 9}),
+    # Bear: volatilite ve dip
+    ('atr', 'atr', ['high', 'low', 'close'], {'length': 14}),
+    ('atr_ratio', 'div', ['atr', 'close'], {}),
+    ('atr_pct', 'mul', ['atr_ratio', 100], {}),
+    ('low_20', 'min', ['low'], {'window': 20}),
+    ('low_gap', 'sub', ['close', 'low_20'], {}),
+    ('low_gap_ratio', 'div', ['low_gap', 'close'], {}),
+    ('distance_from_low', 'mul', ['low_gap_ratio', 100], {}),
+    ('rsi_oversold', 'lt', ['rsi', 30], {}),
+    # Sideways: Bollinger (20, 2)
+    ('bb_mid', 'mean', ['close'], {'window': 20}),
+    ('bb_std', 'std', ['close'], {'window': 20, 'ddof': 0}),
+    ('bb_dev', 'mul', ['bb_std', 2.0], {}),
+    ('bb_lower', 'sub', ['bb_mid', 'bb_dev'], {}),
+    ('bb_upper', 'add', ['bb_mid', 'bb_dev'], {}),
+    ('bb_range', 'sub', ['bb_upper', 'bb_lower'], {}),
+    ('bb_offset', 'sub', ['close', 'bb_lower'], {}),
+    ('bb_position', 'div', ['bb_offset', 'bb_range'], {}),
+    ('bb_width', 'div', ['bb_range', 'bb_mid'], {}),
+]
+BASE_FEATURES = ['rsi', 'sma_ratio', 'price_change_1d', 'price_change_5d', 'volume_change']
+MODE_FEATURES = {
+    'bull': ['roc_10', 'adx', 'macd_hist'],
+    'bear': ['atr', 'atr_pct', 'distance_from_low', 'rsi_oversold'],
+    'sideways': ['bb_position', 'bb_width'],
+}
+
 class AdaptiveAIStrategy(BaseStrategy):
     """
     Multi-Mode AI Strategy
@@ -33,6 +92,8 @@ class AdaptiveAIStrategy(BaseStrategy):
     """
     
     MODES = ["bull", "bear", "sideways"]
+    # Moda gore sinyal esigi (%): bull agresif, bear konservatif, sideways orta
+    MODE_THRESHOLDS = {"bull": 52, "bear": 60, "sideways": 55}
     
     def __init__(self, parameters: Dict[str, Any]):
         super().__init__(parameters)
@@ -46,90 +107,115 @@ class AdaptiveAIStrategy(BaseStrategy):
         self.model_dir = parameters.get("model_dir", "data/adaptive_ai")
         self.min_samples = int(parameters.get("min_samples", 50))
         self.trend_window = int(parameters.get("trend_window", 20))
+        # Live loop: newest feature row from incremental indicators instead of the full history
+        self.stream_features = bool(parameters.get("stream_features", False))
+        # Indicator results kept across _create_features calls (e.g. several modes on one frame)
+        self.indicator_cache = ta.IndicatorCache() if parameters.get("reuse_indicators") else None
         
         # Try to load existing models
         self._load_models()
     
     def detect_market_mode(self, df: pd.DataFrame) -> str:
-        """Piyasa durumunu tespit et."""
+        """Piyasa durumunu tespit et (son trend_window mum)."""
         if len(df) < self.trend_window:
             return "sideways"
-        
-        # Son N gunluk trend
-        closes = df['close'].tail(self.trend_window)
-        sma = closes.mean()
-        current = closes.iloc[-1]
-        first = closes.iloc[0]
-        
-        # Trend yonu
-        trend_pct = (current - first) / first * 100
-        
-        # Volatilite
-        volatility = closes.std() / sma * 100
-        
-        # Mod belirleme
-        if trend_pct > 5 and volatility < 10:
-            return "bull"
-        elif trend_pct < -5 and volatility < 10:
-            return "bear"
-        else:
-            return "sideways"
+        return self.detect_market_modes(df.tail(self.trend_window)).current()
+    
+    def detect_market_modes(self, df: pd.DataFrame) -> RegimeSegments:
+        """
+        Her satirin piyasa durumu tek geciste (satir i: df.iloc[:i+1] icin detect_market_mode).
+        Son N mum: trend > %5 ve volatilite < %10 -> bull, trend < -%5 -> bear, aksi halde sideways.
+        """
+        return RegimeSegments.from_frame(df, window=self.trend_window, trend_threshold=5.0, vol_threshold=10.0)
     
     def _create_features(self, df: pd.DataFrame, mode: str) -> pd.DataFrame:
-        """Moda gore ozellik uret."""
-        features = pd.DataFrame(index=df.index)
-        
-        # Temel ozellikler (tum modlar)
-        features['rsi'] = ta.rsi(df['close'], length=14)
-        
-        sma_fast = ta.sma(df['close'], length=10)
-        sma_slow = ta.sma(df['close'], length=30)
-        features['sma_ratio'] = sma_fast / sma_slow
-        
-        features['price_change_1d'] = df['close'].pct_change(1) * 100
-        features['price_change_5d'] = df['close'].pct_change(5) * 100
-        features['volume_change'] = df['volume'].pct_change(1) * 100
-        
-        # Moda ozel ozellikler
-        if mode == "bull":
-            # Bull piyasada momentum onemlier
-            features['roc_10'] = ta.roc(df['close'], length=10)
-            features['adx'] = ta.adx(df['high'], df['low'], df['close'], length=14)['ADX_14']
-            macd = ta.macd(df['close'], fast=12, slow=26, signal=9)
-            if macd is not None:
-                cols = macd.columns.tolist()
-                hist_col = [c for c in cols if 'MACDh' in c]
-                if hist_col:
-                    features['macd_hist'] = macd[hist_col[0]]
-                    
-        elif mode == "bear":
-            # Bear piyasada volatilite ve destek/direnc onemlier
-            features['atr'] = ta.atr(df['high'], df['low'], df['close'], length=14)
-            features['atr_pct'] = features['atr'] / df['close'] * 100
-            
-            # Dip tespiti
-            features['distance_from_low'] = (df['close'] - df['low'].rolling(20).min()) / df['close'] * 100
-            features['rsi_oversold'] = (features['rsi'] < 30).astype(int)
-            
-        else:  # sideways
-            # Yatay piyasada Bollinger Band ve range trading
-            bbands = ta.bbands(df['close'], length=20, std=2)
-            if bbands is not None:
-                cols = bbands.columns.tolist()
-                upper = [c for c in cols if 'BBU' in c][0]
-                lower = [c for c in cols if 'BBL' in c][0]
-                mid = [c for c in cols if 'BBM' in c][0]
-                features['bb_position'] = (df['close'] - bbands[lower]) / (bbands[upper] - bbands[lower])
-                features['bb_width'] = (bbands[upper] - bbands[lower]) / bbands[mid]
+        """Moda gore ozellik uret (indikatorler frame basina bir kez hesaplanir)."""
+        with ta.cache_scope(self.indicator_cache):
+            features = self._raw_features(df, mode)
         
         # Cleanup NaNs and Infinite values (Critical for Scikit-Learn)
         features = features.replace([np.inf, -np.inf], np.nan).dropna()
         return features
     
+    def _raw_features(self, df: pd.DataFrame, mode: str) -> pd.DataFrame:
+        """Ham ozellikler (NaN/inf temizligi _create_features'ta bir kez yapilir)."""
+        graph = feature_spec.compiled(FEATURE_SPEC)
+        return graph.frame(df, BASE_FEATURES + MODE_FEATURES[mode])
+    
+    def _stream_spec(self, columns: List[str]) -> Dict[str, tuple]:
+        """Incremental indicators behind _create_features (all modes): {name: (indicator, inputs)}."""
+        close = lambda bar: (bar['close'],)
+        hlc = lambda bar: (bar['high'], bar['low'], bar['close'])
+        return {
+            'rsi': (stream.RSI(14), close),
+            'sma_fast': (stream.SMA(10), close),
+            'sma_slow': (stream.SMA(30), close),
+            'change_1': (stream.Change(1), close),
+            'change_5': (stream.Change(5), close),
+            'volume_change': (stream.Change(1), lambda bar: (bar['volume'],)),
+            'roc_10': (stream.ROC(10), close),
+            'adx': (stream.ADX(14), hlc),
+            'macd': (stream.MACD(12, 26, 9), close),
+            'atr': (stream.ATR(14), hlc),
+            'low_20': (stream.RollingMin(20), lambda bar: (bar['low'],)),
+            'bbands': (stream.BBands(20, 2.0), close),
+        }
+
+    def _stream_row(self, values: Dict[str, np.ndarray], bar: pd.Series, mode: str) -> Dict[str, float]:
+        """Feature row from stream values; same columns, order and scaling as _create_features."""
+        close = np.float64(bar['close'])
+        row = {
+            'rsi': values['rsi'],
+            'sma_ratio': values['sma_fast'] / values['sma_slow'],
+            'price_change_1d': values['change_1'] * 100,
+            'price_change_5d': values['change_5'] * 100,
+            'volume_change': values['volume_change'] * 100,
+        }
+        if mode == "bull":
+            row['roc_10'] = values['roc_10']
+            row['adx'] = values['adx'][0]
+            row['macd_hist'] = values['macd'][1]
+        elif mode == "bear":
+            row['atr'] = values['atr']
+            row['atr_pct'] = values['atr'] / close * 100
+            row['distance_from_low'] = (close - values['low_20']) / close * 100
+            row['rsi_oversold'] = int(values['rsi'] < 30)
+        else:
+            lower, mid, upper = values['bbands']
+            row['bb_position'] = (close - lower) / (upper - lower)
+            row['bb_width'] = (upper - lower) / mid
+        return row
+
+    def _latest_features(self, candles: pd.DataFrame, mode: str):
+        """
+        Newest feature row (1-row DataFrame) from the persistent feature stream.
+        None when the row has NaN/inf; analyze() then takes the batch path.
+        """
+        spec = self._stream_spec(list(candles.columns))
+        key = (type(self).__name__, self.model_dir)
+        path = os.path.join(self.model_dir, STREAM_FILE)
+        feature_stream = _feature_streams.get(key)
+        if feature_stream is None or set(feature_stream.spec) != set(spec):
+            feature_stream = stream.FeatureStream(spec)
+            feature_stream.load(path)
+            _feature_streams[key] = feature_stream
+
+        last_time = feature_stream.last_time
+        with np.errstate(all='ignore'):
+            values = feature_stream.sync(candles)
+            values = {name: np.asarray(value, dtype=np.float64)[()] for name, value in values.items()}
+            row = self._stream_row(values, candles.iloc[-1], mode)
+        if feature_stream.last_time != last_time:
+            feature_stream.save(path)
+
+        X = pd.DataFrame([row], index=candles.index[-1:])
+        if not np.isfinite(X.to_numpy(dtype=np.float64)).all():
+            return None
+        return X
+
     def _create_target(self, df: pd.DataFrame) -> pd.Series:
-        """Hedef: Yarin fiyat yukselecek mi?"""
-        future_return = df['close'].shift(-1) / df['close'] - 1
-        return (future_return > 0).astype(int)
+        """Hedef: Yarin fiyat yukselecek mi? (son satir NaN: gelecegi yok)"""
+        return pd.Series(labels.direction(df['close'], 1), index=df.index)
     
     def train_mode(self, df: pd.DataFrame, mode: str) -> bool:
         """Belirli bir mod icin model egit."""
@@ -139,15 +225,17 @@ class AdaptiveAIStrategy(BaseStrategy):
         target = self._create_target(df)
         
         common_idx = features.index.intersection(target.dropna().index)
-        X = features.loc[common_idx].iloc[:-1]
-        y = target.loc[common_idx].iloc[:-1]
+        X = features.loc[common_idx]
+        y = target.loc[common_idx].astype(int)
         
         if len(X) < self.min_samples:
             print(f"[AI-{mode.upper()}] Not enough data ({len(X)} < {self.min_samples})")
             return False
         
-        # Scale
-        X_scaled = self.scalers[mode].fit_transform(X)
+        # Scale (yeni scaler: yuklu olan model registry'de paylasiliyor)
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+        self.scalers[mode] = scaler
         
         # Model secimi moda gore
         if mode == "bull":
@@ -192,43 +280,37 @@ class AdaptiveAIStrategy(BaseStrategy):
         """Tum modlari egit - veriyi modlara ayir."""
         print("[AI] Training all modes...")
         
-        # Her satir icin mod belirle
-        modes_data = {mode: [] for mode in self.MODES}
-        
-        for i in range(self.trend_window, len(df)):
-            window = df.iloc[:i+1]
-            mode = self.detect_market_mode(window)
-            modes_data[mode].append(df.iloc[i])
+        # Her satir icin mod belirle (ilk trend_window satir egitime girmez)
+        regimes = self.detect_market_modes(df)
         
         # Her mod icin veri olustur ve egit
         for mode in self.MODES:
-            if len(modes_data[mode]) > self.min_samples:
-                mode_df = pd.DataFrame(modes_data[mode])
-                mode_df.index = range(len(mode_df))
+            mask = regimes.mask(mode)
+            mask[:self.trend_window] = False
+            if mask.sum() > self.min_samples:
+                mode_df = df[mask].reset_index(drop=True)
                 self.train_mode(mode_df, mode)
             else:
-                print(f"[AI-{mode.upper()}] Not enough {mode} market data ({len(modes_data[mode])} samples)")
+                print(f"[AI-{mode.upper()}] Not enough {mode} market data ({mask.sum()} samples)")
     
     def _save_model(self, mode: str):
         """Model kaydet."""
         os.makedirs(self.model_dir, exist_ok=True)
         path = os.path.join(self.model_dir, f"{mode}_model.pkl")
+        data = {'model': self.models[mode], 'scaler': self.scalers[mode]}
         with open(path, 'wb') as f:
-            pickle.dump({
-                'model': self.models[mode],
-                'scaler': self.scalers[mode]
-            }, f)
+            pickle.dump(data, f)
+        model_registry.put(path, data)
         print(f"[AI-{mode.upper()}] Model saved to {path}")
     
     def _load_models(self):
-        """Tum modelleri yukle (JSON XGBoost veya Pickle Sklearn)."""
+        """Tum modelleri yukle (JSON XGBoost veya Pickle Sklearn), model registry uzerinden."""
         for mode in self.MODES:
             # 1. Try Loading JSON (XGBoost GPU)
             json_path = os.path.join(self.model_dir, f"{mode}_model.json")
             if XGB_AVAILABLE and os.path.exists(json_path):
                 try:
-                    model = xgb.XGBClassifier()
-                    model.load_model(json_path)
+                    model = model_registry.get(json_path, _load_xgb)
                     self.models[mode] = model
                     self.is_trained[mode] = True
                     # Set scaler to None to indicate raw features
@@ -242,20 +324,31 @@ class AdaptiveAIStrategy(BaseStrategy):
             path = os.path.join(self.model_dir, f"{mode}_model.pkl")
             if os.path.exists(path):
                 try:
-                    with open(path, 'rb') as f:
-                        data = pickle.load(f)
-                        self.models[mode] = data['model']
-                        self.scalers[mode] = data['scaler']
-                        self.is_trained[mode] = True
-                        print(f"[AI-{mode.upper()}] Legacy Model loaded")
+                    data = model_registry.get(path)
+                    self.models[mode] = data['model']
+                    self.scalers[mode] = data['scaler']
+                    self.is_trained[mode] = True
+                    print(f"[AI-{mode.upper()}] Legacy Model loaded")
                 except Exception as e:
                     print(f"[AI-{mode.upper()}] Failed to load: {e}")
     
     def analyze(self, candles: pd.DataFrame) -> Dict[str, Any]:
         """Piyasa durumuna gore analiz et."""
+        result, request = self.prepare_inference(candles)
+        if request is None:
+            return result
+        model, X_input, _ = request
         
+        # Tek predict_proba: sinif ve guven ayni olasilik satirindan
+        return self.finish_inference(request, model.predict_proba(X_input)[0])
+
+    def prepare_inference(self, candles: pd.DataFrame):
+        """
+        analyze() up to the model call: (result, None) when decided without a model,
+        else (None, (model, X_input, mode)) for finish_inference() after a (batched) predict_proba.
+        """
         if len(candles) < 50:
-            return {"signal": "NEUTRAL", "reason": "Not enough data", "mode": "unknown"}
+            return {"signal": "NEUTRAL", "reason": "Not enough data", "mode": "unknown"}, None
         
         # Modu tespit et
         current_mode = self.detect_market_mode(candles)
@@ -265,53 +358,122 @@ class AdaptiveAIStrategy(BaseStrategy):
             # Canli egitim sadece CPU modunda calisir (simdilik)
             success = self.train_mode(candles, current_mode)
             if not success:
-                return {"signal": "NEUTRAL", "reason": f"{current_mode} model not trained", "mode": current_mode}
-        
-        # Ozellik uret
-        features = self._create_features(candles, current_mode)
-        
-        if features.empty:
-            return {"signal": "NEUTRAL", "reason": "Feature calculation failed", "mode": current_mode}
+                return {"signal": "NEUTRAL", "reason": f"{current_mode} model not trained", "mode": current_mode}, None
         
-        # Tahmin
-        X = features.iloc[[-1]]
+        # Ozellik uret (canli dongude sadece son satir, artimli)
+        X = self._latest_features(candles, current_mode) if self.stream_features else None
+        if X is None:
+            features = self._create_features(candles, current_mode)
+            
+            if features.empty:
+                return {"signal": "NEUTRAL", "reason": "Feature calculation failed", "mode": current_mode}, None
+            
+            # Tahmin
+            X = features.iloc[[-1]]
         
         # Scaler kontrolu (XGBoost icin None olabilir)
         if self.scalers[current_mode] is not None:
              X_input = self.scalers[current_mode].transform(X)
         else:
              X_input = X # Raw features for XGBoost
+        return None, (self.models[current_mode], X_input, current_mode)
+
+    def finish_inference(self, request, probability: np.ndarray) -> Dict[str, Any]:
+        """analyze() result from the request's predict_proba row (class and confidence from that one row)."""
+        model, _, mode = request
+        prediction, confidence = predictor_for(model).decide(probability)
+        return self._result(mode, prediction, confidence)
+
+    def _result(self, mode: str, prediction, confidence: float) -> Dict[str, Any]:
+        signal, reason = self._decision(mode, prediction, confidence)
         
-        prediction = self.models[current_mode].predict(X_input)[0]
-        probability = self.models[current_mode].predict_proba(X_input)[0]
-        
-        # XGBoost returns [prob_class_0, prob_class_1] usually, but check dims
-        if isinstance(probability, (list, np.ndarray)):
-            confidence = max(probability) * 100
-        else:
-            confidence = probability * 100 # Single value logic if any
-            
-        # Moda gore sinyal esigi ayarla
-        if current_mode == "bull":
-            threshold = 52  # Bull'da daha agresif
-        elif current_mode == "bear":
-            threshold = 60  # Bear'da daha konservatif
-        else:
-            threshold = 55  # Sideways'de orta
-        
+        return {
+            "signal": signal,
+            "mode": mode,
+            "prediction": int(prediction),
+            "confidence": round(confidence, 2),
+            "reason": reason
+        }
+
+    def _decision(self, mode: str, prediction: int, confidence: float):
+        """Moda gore sinyal esigi: (signal, reason)."""
+        threshold = self.MODE_THRESHOLDS[mode]
         signal = "NEUTRAL"
         if prediction == 1 and confidence > threshold:
             signal = "BUY"
         elif prediction == 0 and confidence > threshold:
             signal = "SELL"
         
-        mode_emoji = {"bull": "UP", "bear": "DOWN", "sideways": "FLAT"}[current_mode]
-        reason = f"[{mode_emoji}] {current_mode.upper()} Mode | Prediction: {'UP' if prediction==1 else 'DOWN'} ({confidence:.1f}%)"
-        
-        return {
-            "signal": signal,
-            "mode": current_mode,
-            "prediction": int(prediction),
-            "confidence": round(confidence, 2),
-            "reason": reason
+        mode_emoji = {"bull": "UP", "bear": "DOWN", "sideways": "FLAT"}[mode]
+        reason = f"[{mode_emoji}] {mode.upper()} Mode | Prediction: {'UP' if prediction==1 else 'DOWN'} ({confidence:.1f}%)"
+        return signal, reason
+
+    def _forced_rows(self, df: pd.DataFrame):
+        """Rows decided before the models (e.g. a circuit breaker): (row mask, result dict) or None."""
+        return None
+
+    def predict_history(self, df: pd.DataFrame, rows=None) -> pd.DataFrame:
+        """
+        analyze(df.iloc[:i + 1]) for every row position i in 'rows' (default all) in one pass:
+        features once per mode, the regime of every row, one predict_proba per mode model.
+        Columns: signal, mode, prediction, confidence, reason (on df.index[rows]).
+        A mode without a trained model goes through analyze() on its rows until it trains
+        (as in the row-by-row loop); the rest of its rows are batched.
+        """
+        n = len(df)
+        rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.int64)
+        out = {
+            "signal": np.full(len(rows), "NEUTRAL", dtype=object),
+            "mode": np.full(len(rows), "unknown", dtype=object),
+            "prediction": np.full(len(rows), np.nan),
+            "confidence": np.full(len(rows), np.nan),
+            "reason": np.full(len(rows), "Not enough data", dtype=object),
         }
+
+        def put(k, result):
+            for key, values in out.items():
+                values[k] = result.get(key, np.nan)
+
+        pending = rows + 1 >= 50
+        forced = self._forced_rows(df)
+        if forced is not None:
+            mask, result = forced
+            hit = np.flatnonzero(mask[rows])
+            put(hit, result)
+            pending[hit] = False
+
+        codes = self.detect_market_modes(df).labels()
+        positions = np.arange(n)
+        for code, mode in enumerate(self.MODES):
+            picked = np.flatnonzero(pending & (codes[rows] == code))
+            # Egitilmemis mod: analyze() kendi penceresinde egitir (satir satir dongudeki gibi)
+            while len(picked) and not self.is_trained[mode]:
+                put(picked[0], self.analyze(df.iloc[:rows[picked[0]] + 1]))
+                picked = picked[1:]
+            if not len(picked):
+                continue
+
+            # Her satir icin son gecerli ozellik satiri (_create_features'taki dropna + iloc[-1])
+            with ta.cache_scope(self.indicator_cache):
+                features = self._raw_features(df, mode).replace([np.inf, -np.inf], np.nan)
+            valid = features.notna().all(axis=1).to_numpy()
+            source = np.maximum.accumulate(np.where(valid, positions, -1))[rows[picked]]
+            failed = source < 0
+            out["mode"][picked] = mode
+            out["reason"][picked[failed]] = "Feature calculation failed"
+            picked, source = picked[~failed], source[~failed]
+            if not len(picked):
+                continue
+
+            X = features.iloc[source]
+            X_input = self.scalers[mode].transform(X) if self.scalers[mode] is not None else X
+            probability = self.models[mode].predict_proba(X_input)
+            predictions, confidences = predictor_for(self.models[mode]).decide_many(probability)
+            for k, prediction, confidence in zip(picked, predictions, confidences):
+                out["signal"][k], out["reason"][k] = self._decision(mode, prediction, confidence)
+            out["prediction"][picked] = predictions
+            out["confidence"][picked] = np.round(confidences, 2)
+        return pd.DataFrame(out, index=df.index[rows])
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        return self.predict_history(candles).drop(columns="reason")
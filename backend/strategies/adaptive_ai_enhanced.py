@@ -2,6 +2,7 @@
 from .adaptive_ai import AdaptiveAIStrategy
 import pandas as pd
 import ta_compat as ta
+import ta_stream as stream
 import numpy as np
 
 
@@ -22,12 +23,20 @@ class ProteusAI(AdaptiveAIStrategy):
         # Use a different model directory to avoid overwriting standard models
         self.model_dir = parameters.get("model_dir", "data/proteus_ai")
         
-    def _create_features(self, df: pd.DataFrame, mode: str) -> pd.DataFrame:
+    def _raw_features(self, df: pd.DataFrame, mode: str) -> pd.DataFrame:
         """
         Generates features including Macro Data if available.
         """
         # Get standard features first
-        features = super()._create_features(df, mode)
+        features = super()._raw_features(df, mode)
+
+        # Rolling correlations with the macro series, computed together in one pass
+        pairs = {}
+        if 'dxy_close' in df.columns:
+            pairs['dxy_corr'] = (df['dxy_close'], 20)
+        if 'eth_btc_close' in df.columns:
+            pairs['alt_correlation'] = (df['eth_btc_close'], 30)
+        corr = ta.correlations(df['close'], pairs)
         
         # Add Macro Features if columns exist
         if 'vix_close' in df.columns:
@@ -41,7 +50,7 @@ class ProteusAI(AdaptiveAIStrategy):
             features['dxy_rsi'] = ta.rsi(df['dxy_close'], length=14)
             
             # Correlation Check (Rolling correlation between Price and DXY)
-            features['dxy_corr'] = df['close'].rolling(20).corr(df['dxy_close'])
+            features['dxy_corr'] = corr['dxy_corr']
 
         if 'eth_btc_close' in df.columns:
             # ETH/BTC Rising = Altseason (Good for SOL, AVAX)
@@ -51,9 +60,37 @@ class ProteusAI(AdaptiveAIStrategy):
             
             # Correlation: Does this asset move with Altseason?
             # SOL should have High positive correlation. BTC might have low/negative.
-            features['alt_correlation'] = df['close'].rolling(30).corr(df['eth_btc_close'])
+            features['alt_correlation'] = corr['alt_correlation']
             
-        # Cleanup imports again because adding new features might introduce NaNs
-        features = features.replace([np.inf, -np.inf], np.nan).dropna()
-        
         return features
+
+    def _stream_spec(self, columns):
+        """Base stream indicators + the macro ones for the columns present."""
+        spec = super()._stream_spec(columns)
+        if 'vix_close' in columns:
+            spec['vix_rsi'] = (stream.RSI(14), lambda bar: (bar['vix_close'],))
+            spec['vix_change_5'] = (stream.Change(5), lambda bar: (bar['vix_close'],))
+        if 'dxy_close' in columns:
+            spec['dxy_roc'] = (stream.ROC(10), lambda bar: (bar['dxy_close'],))
+            spec['dxy_rsi'] = (stream.RSI(14), lambda bar: (bar['dxy_close'],))
+            spec['dxy_corr'] = (stream.RollingCorr(20), lambda bar: (bar['close'], bar['dxy_close']))
+        if 'eth_btc_close' in columns:
+            spec['alt_roc'] = (stream.ROC(20), lambda bar: (bar['eth_btc_close'],))
+            spec['alt_rsi'] = (stream.RSI(14), lambda bar: (bar['eth_btc_close'],))
+            spec['alt_corr'] = (stream.RollingCorr(30), lambda bar: (bar['close'], bar['eth_btc_close']))
+        return spec
+
+    def _stream_row(self, values, bar, mode):
+        row = super()._stream_row(values, bar, mode)
+        if 'vix_rsi' in values:
+            row['vix_rsi'] = values['vix_rsi']
+            row['vix_trend'] = values['vix_change_5']
+        if 'dxy_roc' in values:
+            row['dxy_roc'] = values['dxy_roc']
+            row['dxy_rsi'] = values['dxy_rsi']
+            row['dxy_corr'] = values['dxy_corr']
+        if 'alt_roc' in values:
+            row['alt_season_strength'] = values['alt_roc']
+            row['alt_season_rsi'] = values['alt_rsi']
+            row['alt_correlation'] = values['alt_corr']
+        return row
@@ -8,6 +8,9 @@ from typing import Dict, Any
 import pandas as pd
 import ta_compat as ta
 import numpy as np
+from utils import labels
+from utils.model_registry import model_registry
+from utils.predictor import predictor_for
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 import pickle
@@ -85,9 +88,8 @@ class AIStrategy(BaseStrategy):
         return features.dropna()
     
     def _create_target(self, df: pd.DataFrame, lookahead: int = 1) -> pd.Series:
-        """Create target: 1 if price goes up next day, 0 otherwise."""
-        future_return = df['close'].shift(-lookahead) / df['close'] - 1
-        return (future_return > 0).astype(int)
+        """Create target: 1 if price goes up next day, 0 otherwise (NaN without 'lookahead' future bars)."""
+        return pd.Series(labels.direction(df['close'], lookahead), index=df.index)
     
     def train(self, df: pd.DataFrame):
         """Train the ML model on historical data."""
@@ -100,17 +102,14 @@ class AIStrategy(BaseStrategy):
         # Align and clean
         common_idx = features.index.intersection(target.dropna().index)
         X = features.loc[common_idx]
-        y = target.loc[common_idx]
-        
-        # Remove last row (no future data for target)
-        X = X.iloc[:-1]
-        y = y.iloc[:-1]
+        y = target.loc[common_idx].astype(int)
         
         if len(X) < self.min_training_samples:
             print(f"[AI] Not enough data to train ({len(X)} < {self.min_training_samples})")
             return False
         
-        # Scale features
+        # Scale features (fresh scaler: the loaded one is shared through the model registry)
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
         
         # Train Random Forest
@@ -136,23 +135,21 @@ class AIStrategy(BaseStrategy):
     def _save_model(self):
         """Save model to disk."""
         os.makedirs(os.path.dirname(self.model_path) if os.path.dirname(self.model_path) else ".", exist_ok=True)
+        data = {'model': self.model, 'scaler': self.scaler}
         with open(self.model_path, 'wb') as f:
-            pickle.dump({
-                'model': self.model,
-                'scaler': self.scaler
-            }, f)
+            pickle.dump(data, f)
+        model_registry.put(self.model_path, data)
         print(f"[AI] Model saved to {self.model_path}")
     
     def _load_model(self):
         """Load model from disk if exists."""
         if os.path.exists(self.model_path):
             try:
-                with open(self.model_path, 'rb') as f:
-                    data = pickle.load(f)
-                    self.model = data['model']
-                    self.scaler = data['scaler']
-                    self.is_trained = True
-                    print(f"[AI] Model loaded from {self.model_path}")
+                data = model_registry.get(self.model_path)
+                self.model = data['model']
+                self.scaler = data['scaler']
+                self.is_trained = True
+                print(f"[AI] Model loaded from {self.model_path}")
             except Exception as e:
                 print(f"[AI] Failed to load model: {e}")
     
@@ -178,11 +175,9 @@ class AIStrategy(BaseStrategy):
         X = features.iloc[[-1]]
         X_scaled = self.scaler.transform(X)
         
-        # Predict
-        prediction = self.model.predict(X_scaled)[0]
-        probability = self.model.predict_proba(X_scaled)[0]
-        
-        confidence = max(probability) * 100
+        # Predict (class and confidence from one predict_proba; explanation precomputed per model)
+        predictor = predictor_for(self.model, features.columns)
+        prediction, confidence, _ = predictor.predict(X_scaled)
         
         signal = "NEUTRAL"
         if prediction == 1 and confidence > 55:  # Require >55% confidence
@@ -192,10 +187,8 @@ class AIStrategy(BaseStrategy):
         
         reason = f"AI Prediction: {'UP' if prediction == 1 else 'DOWN'} (Confidence: {confidence:.1f}%)"
         
-        # Get feature importances for explainability
-        feature_names = features.columns.tolist()
-        importances = dict(zip(feature_names, self.model.feature_importances_))
-        top_feature = max(importances, key=importances.get)
+        # Most important feature for explainability
+        top_feature = predictor.top_feature
         
         return {
             "signal": signal,
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
+import numpy as np
 import pandas as pd
 
+SIGNAL_COLUMN = "signal"
+
 class BaseStrategy(ABC):
     def __init__(self, parameters: Dict[str, Any]):
         self.parameters = parameters
@@ -14,3 +17,33 @@ class BaseStrategy(ABC):
         candles: DataFrame with columns ['time', 'open', 'high', 'low', 'close', 'volume']
         """
         pass
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        """
+        Signal of every bar of a history: row i equals analyze(candles.iloc[:i + 1]) (no lookahead).
+        Columns: 'signal' (BUY / SELL / NEUTRAL), 'confidence' when the strategy has one, and the
+        numeric values analyze() reports (NaN while there is not enough data).
+        This fallback replays analyze() on growing windows; rule-based strategies override it
+        with one vectorized pass.
+        """
+        rows = []
+        for i in range(len(candles)):
+            result = self.analyze(candles.iloc[:i + 1].copy())
+            rows.append({k: v for k, v in result.items() if k != "reason"})
+        out = pd.DataFrame(rows, index=candles.index)
+        if SIGNAL_COLUMN not in out:
+            out[SIGNAL_COLUMN] = "NEUTRAL"
+        return out
+
+    @staticmethod
+    def _signal_frame(candles: pd.DataFrame, buy, sell, min_bars: int = 0, **values) -> pd.DataFrame:
+        """
+        generate_signals() result from per-row conditions: BUY where 'buy', else SELL where 'sell'
+        (analyze's if / elif order), NEUTRAL and NaN values for rows with fewer than 'min_bars' bars.
+        """
+        warm = np.arange(len(candles)) + 1 >= min_bars
+        buy, sell = np.asarray(buy, dtype=bool) & warm, np.asarray(sell, dtype=bool) & warm
+        out = {SIGNAL_COLUMN: np.where(buy, "BUY", np.where(sell, "SELL", "NEUTRAL")).astype(object)}
+        for name, v in values.items():
+            out[name] = np.where(warm, np.asarray(v, dtype=np.float64), np.nan)
+        return pd.DataFrame(out, index=candles.index)
@@ -69,3 +69,18 @@ class BollingerBandStrategy(BaseStrategy):
             "lower_band": round(lower_band, 2),
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        bbands = ta.bbands(candles["close"], length=self.bb_period, std=self.bb_std)
+        cols = bbands.columns.tolist()
+        lower_band = bbands[[c for c in cols if 'BBL' in c][0]]
+        mid_band = bbands[[c for c in cols if 'BBM' in c][0]]
+        upper_band = bbands[[c for c in cols if 'BBU' in c][0]]
+        bandwidth = (upper_band - lower_band) / mid_band
+
+        # Squeeze -> NEUTRAL, otherwise breakouts
+        active = ~(bandwidth < self.squeeze_threshold)
+        return self._signal_frame(candles, active & (candles["close"] > upper_band),
+                                  active & (candles["close"] < lower_band), self.bb_period + 5,
+                                  bandwidth=bandwidth.round(4), upper_band=upper_band.round(2),
+                                  lower_band=lower_band.round(2))
@@ -44,3 +44,10 @@ class BreakoutStrategy(BaseStrategy):
             "low_n": round(low_n, 2),
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        # N-bar high / low of the bars before each bar
+        high_n = candles["high"].rolling(self.lookback).max().shift(1)
+        low_n = candles["low"].rolling(self.lookback).min().shift(1)
+        return self._signal_frame(candles, candles["close"] > high_n, candles["close"] < low_n,
+                                  self.lookback + 5, high_n=high_n.round(2), low_n=low_n.round(2))
@@ -2,6 +2,7 @@ from .base import BaseStrategy
 from typing import Dict, Any
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 class DCAStrategy(BaseStrategy):
     """
@@ -45,3 +46,12 @@ class DCAStrategy(BaseStrategy):
             "deviation": round(deviation * 100, 2),
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        closes = candles["close"].to_numpy(dtype=np.float64)
+        avg_30d = np.full(len(closes), np.nan)
+        if len(closes) >= 30:
+            avg_30d[29:] = sliding_window_view(closes, 30).sum(axis=1) / 30  # iloc[-30:].mean() per bar
+        deviation = (closes - avg_30d) / avg_30d
+        return self._signal_frame(candles, deviation < self.dip_threshold, deviation > self.rally_threshold, 30,
+                                  deviation=np.round(deviation * 100, 2))
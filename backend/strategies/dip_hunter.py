@@ -46,3 +46,10 @@ class DipHunterStrategy(BaseStrategy):
             "rsi": round(current_rsi, 2),
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        rsi = ta.rsi(candles["close"], length=self.rsi_period)
+        turning_up = candles["close"] > candles["close"].shift(1)
+        bounce = (rsi > self.take_profit_rsi) & (rsi.shift(1) < self.take_profit_rsi)
+        return self._signal_frame(candles, (rsi < self.oversold) & turning_up, bounce,
+                                  self.rsi_period + 5, rsi=rsi.round(2))
@@ -2,6 +2,7 @@ from .base import BaseStrategy
 from typing import Dict, Any
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 class GridStrategy(BaseStrategy):
     """
@@ -52,3 +53,18 @@ class GridStrategy(BaseStrategy):
             "grid_level": current_grid,
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        """
+        analyze() called on every growing window by a fresh instance: each bar is compared with
+        the previous bar's grid level (the first analyzed bar only sets it). The instance state
+        (last_grid_level) is left untouched.
+        """
+        closes = candles["close"].to_numpy(dtype=np.float64)
+        level = np.full(len(closes), np.nan)
+        if len(closes) >= 20:
+            center = sliding_window_view(closes, 20).sum(axis=1) / 20  # iloc[-20:].mean() per bar
+            level[19:] = np.trunc(closes[19:] / (center * self.grid_size))
+        prev_level = np.r_[np.nan, level[:-1]]
+        prev_level[19:20] = level[19:20]
+        return self._signal_frame(candles, level < prev_level, level > prev_level, 20, grid_level=level)
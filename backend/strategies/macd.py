@@ -55,3 +55,14 @@ class MACDStrategy(BaseStrategy):
             "signal_line": round(current_signal, 4),
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        macd = ta.macd(candles["close"], fast=self.fast, slow=self.slow, signal=self.signal_period)
+        cols = macd.columns.tolist()
+        line = macd[[c for c in cols if 'MACD_' in c and 'MACDs' not in c and 'MACDh' not in c][0]]
+        signal_line = macd[[c for c in cols if 'MACDs_' in c][0]]
+        prev_line, prev_signal = line.shift(1), signal_line.shift(1)
+        bullish = (prev_line <= prev_signal) & (line > signal_line)
+        bearish = (prev_line >= prev_signal) & (line < signal_line)
+        return self._signal_frame(candles, bullish, bearish, self.slow + self.signal_period + 5,
+                                  macd=line.round(4), signal_line=signal_line.round(4))
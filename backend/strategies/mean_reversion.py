@@ -47,3 +47,9 @@ class MeanReversionStrategy(BaseStrategy):
             "rsi": round(current_rsi, 2),
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        rsi = ta.rsi(candles["close"], length=self.rsi_period)
+        turning_up = candles["close"] > candles["close"].shift(1)
+        return self._signal_frame(candles, (rsi < self.oversold) & turning_up, rsi > self.overbought,
+                                  self.rsi_period + 5, rsi=rsi.round(2))
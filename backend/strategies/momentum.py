@@ -43,3 +43,8 @@ class MomentumStrategy(BaseStrategy):
             "roc": round(roc, 2),
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        prev_price = candles["close"].shift(self.roc_period)
+        roc = ((candles["close"] - prev_price) / prev_price) * 100
+        return self._signal_frame(candles, roc > self.threshold, roc < 0, self.roc_period + 5, roc=roc.round(2))
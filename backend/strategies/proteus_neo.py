@@ -8,6 +8,7 @@ from .adaptive_ai_enhanced import ProteusAI
 from typing import Dict, Any
 import pandas as pd
 import ta_compat as ta
+import ta_stream as stream
 import numpy as np
 
 class ProteusNeo(ProteusAI):
@@ -22,14 +23,17 @@ class ProteusNeo(ProteusAI):
     - Volume Flow (Is money entering the system?)
     """
     
+    # Circuit breaker result (BTC below its SMA50 and VIX > 35)
+    CRASH_RESULT = {"signal": "SELL", "confidence": 100.0, "mode": "CRASH_PROTECTION", "prediction": 0}
+
     def __init__(self, parameters: Dict[str, Any]):
         super().__init__(parameters)
         self.name = "Proteus Neo"
         self.model_dir = parameters.get("model_dir", "data/proteus_neo")
 
-    def _create_features(self, df: pd.DataFrame, mode: str) -> pd.DataFrame:
+    def _raw_features(self, df: pd.DataFrame, mode: str) -> pd.DataFrame:
         # Get standard + macro features (DXY, VIX, ETH/BTC)
-        features = super()._create_features(df, mode)
+        features = super()._raw_features(df, mode)
         
         # Add NEO Features (Proactive Market Analysis)
         if 'market_btc_close' in df.columns:
@@ -40,26 +44,56 @@ class ProteusNeo(ProteusAI):
             # 2. Relative Strength (Asset vs BTC)
             # If Asset is rising but BTC is flat => Strong Decoupling (Good)
             # If Asset is falling and BTC is rising => Weakness (Bad)
+            # rel_rsi runs over the rows where the standard + macro features are valid
+            valid = features.replace([np.inf, -np.inf], np.nan).notna().all(axis=1)
             features['rel_strength'] = df['close'] / df['market_btc_close']
-            features['rel_rsi'] = ta.rsi(features['rel_strength'], length=14)
+            features['rel_rsi'] = ta.rsi(features['rel_strength'][valid], length=14)
             
             # 3. Correlation (Rolling 30 days)
             # High Correlation + BTC Drop = DANGER (Sell)
             # Low Correlation + Asset Bullish = IDIOSYNCRATIC PUMP (Buy)
-            features['btc_corr'] = df['close'].rolling(30).corr(df['market_btc_close'])
+            features['btc_corr'] = ta.corr(df['close'], df['market_btc_close'], length=30)
             
             # 4. Volume Divergence (Asset Vol vs Market Vol)
             features['vol_ratio'] = df['volume'] / df['market_btc_vol']
             
-        # Cleanup
-        features = features.replace([np.inf, -np.inf], np.nan).dropna()
-        
         return features
 
-    def analyze(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _stream_spec(self, columns):
+        spec = super()._stream_spec(columns)
+        if 'market_btc_close' in columns:
+            spec['btc_rsi'] = (stream.RSI(14), lambda bar: (bar['market_btc_close'],))
+            spec['btc_roc'] = (stream.ROC(10), lambda bar: (bar['market_btc_close'],))
+            spec['rel_rsi'] = (stream.RSI(14),
+                               lambda bar: (np.divide(np.float64(bar['close']), bar['market_btc_close']),))
+            spec['btc_corr'] = (stream.RollingCorr(30), lambda bar: (bar['close'], bar['market_btc_close']))
+        return spec
+
+    def _stream_row(self, values, bar, mode):
+        row = super()._stream_row(values, bar, mode)
+        if 'btc_rsi' in values:
+            row['btc_rsi'] = values['btc_rsi']
+            row['btc_roc'] = values['btc_roc']
+            row['rel_strength'] = np.float64(bar['close']) / bar['market_btc_close']
+            row['rel_rsi'] = values['rel_rsi']
+            row['btc_corr'] = values['btc_corr']
+            row['vol_ratio'] = np.float64(bar['volume']) / bar['market_btc_vol']
+        return row
+
+    def _crash_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Rows where the market is crashing (BTC lost its SMA50 trend AND fear is high)."""
+        if 'market_btc_close' not in df.columns or 'vix_close' not in df.columns:
+            return np.zeros(len(df), dtype=bool)
+        btc = df['market_btc_close']
+        return ((btc < btc.rolling(50).mean()) & (df['vix_close'] > 35)).to_numpy()
+
+    def _forced_rows(self, df: pd.DataFrame):
+        return self._crash_mask(df), self.CRASH_RESULT
+
+    def prepare_inference(self, df: pd.DataFrame):
         """
-        Override analyze to add 'Proactive Override'
-        If Market is CRASHING (BTC < SMA50 & VIX > 30), force SELL/WAIT.
+        'Proactive Override' before the AI (analyze() and the batched live path both come here):
+        If Market is CRASHING (BTC < SMA50 & VIX > 35), force SELL/WAIT.
         """
         # 1. Proactive Safety Check (Circuit Breaker)
         if 'market_btc_close' in df.columns and 'vix_close' in df.columns:
@@ -69,12 +103,7 @@ class ProteusNeo(ProteusAI):
             
             # Crash Detected? (BTC lost trend AND Fear is high)
             if current_btc < btc_sma50 and current_vix > 35:
-                return {
-                    "signal": "SELL",
-                    "confidence": 100.0,
-                    "mode": "CRASH_PROTECTION",
-                    "prediction": 0
-                }
+                return dict(self.CRASH_RESULT), None
                 
         # 2. Standard AI Analysis
-        return super().analyze(df)
+        return super().prepare_inference(df)
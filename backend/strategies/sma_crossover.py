@@ -44,3 +44,11 @@ class SMACrossoverStrategy(BaseStrategy):
             "slow_sma": current_slow,
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        fast = ta.sma(candles["close"], length=self.fast_period)
+        slow = ta.sma(candles["close"], length=self.slow_period)
+        prev_fast, prev_slow = fast.shift(1), slow.shift(1)
+        golden = (prev_fast <= prev_slow) & (fast > slow)
+        death = (prev_fast >= prev_slow) & (fast < slow)
+        return self._signal_frame(candles, golden, death, self.slow_period, fast_sma=fast, slow_sma=slow)
@@ -51,3 +51,12 @@ class SuperTrendStrategy(BaseStrategy):
             "diff_pct": round(diff_pct * 100, 2),
             "reason": reason
         }
+
+    def generate_signals(self, candles: pd.DataFrame) -> pd.DataFrame:
+        closes = candles["close"]
+        ema_fast = closes.ewm(span=self.fast_ema, adjust=False).mean()
+        ema_slow = closes.ewm(span=self.slow_ema, adjust=False).mean()
+        diff_pct = (ema_fast - ema_slow) / ema_slow
+        return self._signal_frame(candles, diff_pct > self.buffer_pct, diff_pct < 0, self.slow_ema + 5,
+                                  ema_fast=ema_fast.round(2), ema_slow=ema_slow.round(2),
+                                  diff_pct=(diff_pct * 100).round(2))
@@ -2,24 +2,188 @@
 TA Compatibility Wrapper
 Provides pandas_ta-like syntax for the 'ta' library.
 Usage: import ta_compat as ta
+
+Backends (same signatures, column names and values):
+- 'numpy' (default): ta_kernels, NumPy/lfilter kernels on contiguous float arrays
+- 'ta': the original 'ta' library objects
+Select with set_backend('ta') or the TA_BACKEND environment variable.
+Series containing NaNs, or too short for the ADX/ATR warm-up, always go through 'ta'.
+corr() / correlations() use the NaN-aware running-sum kernel (pandas rolling().corr() on 'ta').
+
+Memoization: inside 'with cache_scope():' each indicator is computed once per
+(input column buffer, indicator, params, backend); repeated calls return the cached result.
+Pass an IndicatorCache to cache_scope() to keep results across scopes. The active cache is
+per thread / asyncio task (context variable); one IndicatorCache may be shared between threads.
 """
+import os
+import time
+import inspect
+import functools
+import threading
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
 import ta as _ta
+import numpy as np
 import pandas as pd
+import ta_kernels as _k
+
+BACKENDS = ('numpy', 'ta')
+_backend = os.environ.get('TA_BACKEND', 'numpy')
+
+def set_backend(name: str):
+    """Switch the indicator backend ('numpy' or 'ta')."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown TA backend: {name}")
+    _backend = name
+
+def get_backend() -> str:
+    return _backend
+
+class IndicatorCache:
+    """
+    Indicator results keyed by (indicator, input buffers, params, backend), LRU-bounded.
+    Inputs are identified by their NumPy buffer (address, shape, strides); the entry keeps
+    a reference to the buffer, so the address cannot be reused while it is cached.
+    Inputs must not be modified in place while their results are cached.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (inputs, result, seconds)
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0.0  # compute seconds avoided by hits
+        self._lock = threading.Lock()  # LRU order and counters are shared by every thread using the cache
+
+    def get(self, key, index):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            result = entry[1]
+            if not (result.index is index or result.index.equals(index)):
+                return None  # same values under a different index
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.saved += entry[2]
+            return result
+
+    def put(self, key, inputs, result, seconds: float):
+        with self._lock:
+            self.misses += 1
+            self.entries[key] = (inputs, result, seconds)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': self.hits / calls if calls else 0.0, 'saved_s': self.saved}
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+            self.saved = 0.0
 
+# Active IndicatorCache (inside cache_scope) or None; per thread / task, so concurrent scopes don't swap each other's cache
+_cache = contextvars.ContextVar('ta_compat_cache', default=None)
+
+@contextmanager
+def cache_scope(cache: IndicatorCache = None):
+    """
+    Memoize indicator calls for the duration of the block. Nested scopes without an
+    explicit cache share the enclosing one. Yields the active IndicatorCache.
+    """
+    active = cache if cache is not None else (_cache.get() or IndicatorCache())
+    token = _cache.set(active)
+    try:
+        yield active
+    finally:
+        _cache.reset(token)
+
+def _buffer_key(series: pd.Series):
+    values = series.to_numpy()
+    return values, (values.__array_interface__['data'][0], values.shape, values.strides, values.dtype.str)
+
+def _memoize(fn):
+    """Serve repeated calls from the active IndicatorCache (no-op outside cache_scope)."""
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        cache = _cache.get()
+        if cache is None:
+            return fn(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        inputs, keys, params = [], [], []
+        for name, value in bound.arguments.items():
+            if isinstance(value, pd.Series):
+                values, key = _buffer_key(value)
+                inputs.append(values)
+                keys.append(key)
+            else:
+                params.append((name, type(value).__name__, value))  # std=2 vs 2.0 name different columns
+        key = (fn.__name__, tuple(keys), tuple(params), _backend)
+        index = next(v for v in bound.arguments.values() if isinstance(v, pd.Series)).index
+
+        result = cache.get(key, index)
+        if result is None:
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            cache.put(key, inputs, result, time.perf_counter() - started)
+        return result.copy(deep=False)  # copy-on-write view: callers cannot mutate the cached frame
+    return wrapper
+
+def _fast(*series, min_len: int = 0):
+    """Float arrays for the NumPy kernels, or None when the 'ta' path must be used."""
+    if _backend != 'numpy':
+        return None
+    arrays = [_k.as_array(s) for s in series]
+    if len(arrays[0]) < min_len or any(np.isnan(a).any() for a in arrays):
+        return None
+    return arrays
+
+def _series(values, like: pd.Series, name: str) -> pd.Series:
+    return pd.Series(values, index=like.index, name=name)
+
+@_memoize
 def rsi(close: pd.Series, length: int = 14) -> pd.Series:
     """Calculate RSI indicator."""
+    arrays = _fast(close)
+    if arrays is not None:
+        return _series(_k.rsi(*arrays, length), close, 'rsi')
     return _ta.momentum.RSIIndicator(close, window=length).rsi()
 
+@_memoize
 def sma(close: pd.Series, length: int = 20) -> pd.Series:
     """Calculate Simple Moving Average."""
+    arrays = _fast(close)
+    if arrays is not None:
+        return _series(_k.sma(*arrays, length), close, f'sma_{length}')
     return _ta.trend.SMAIndicator(close, window=length).sma_indicator()
 
+@_memoize
 def ema(close: pd.Series, length: int = 20) -> pd.Series:
     """Calculate Exponential Moving Average."""
+    arrays = _fast(close)
+    if arrays is not None:
+        return _series(_k.ema(*arrays, length), close, f'ema_{length}')
     return _ta.trend.EMAIndicator(close, window=length).ema_indicator()
 
+@_memoize
 def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
     """Calculate MACD indicator. Returns DataFrame with MACD, histogram, signal."""
+    arrays = _fast(close)
+    if arrays is not None:
+        line, hist, sig = _k.macd(*arrays, fast, slow, signal)
+        return pd.DataFrame({'MACD_12_26_9': line, 'MACDh_12_26_9': hist, 'MACDs_12_26_9': sig},
+                            index=close.index)
     macd_ind = _ta.trend.MACD(close, window_fast=fast, window_slow=slow, window_sign=signal)
     return pd.DataFrame({
         'MACD_12_26_9': macd_ind.macd(),
@@ -27,8 +191,14 @@ def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> p
         'MACDs_12_26_9': macd_ind.macd_signal()
     })
 
+@_memoize
 def bbands(close: pd.Series, length: int = 20, std: float = 2.0) -> pd.DataFrame:
     """Calculate Bollinger Bands. Returns DataFrame with upper, middle, lower."""
+    arrays = _fast(close)
+    if arrays is not None:
+        lower, mid, upper = _k.bbands(*arrays, length, std)
+        return pd.DataFrame({f'BBL_{length}_{std}': lower, f'BBM_{length}_{std}': mid,
+                             f'BBU_{length}_{std}': upper}, index=close.index)
     bb = _ta.volatility.BollingerBands(close, window=length, window_dev=std)
     return pd.DataFrame({
         f'BBL_{length}_{std}': bb.bollinger_lband(),
@@ -36,12 +206,22 @@ def bbands(close: pd.Series, length: int = 20, std: float = 2.0) -> pd.DataFrame
         f'BBU_{length}_{std}': bb.bollinger_hband()
     })
 
+@_memoize
 def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
     """Calculate Average True Range."""
+    arrays = _fast(high, low, close, min_len=length)
+    if arrays is not None:
+        return _series(_k.atr(*arrays, length), close, 'atr')
     return _ta.volatility.AverageTrueRange(high, low, close, window=length).average_true_range()
 
+@_memoize
 def adx(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.DataFrame:
     """Calculate ADX indicator. Returns DataFrame with ADX, DMP, DMN."""
+    arrays = _fast(high, low, close, min_len=2 * length)
+    if arrays is not None:
+        adx_line, dmp, dmn = _k.adx(*arrays, length)
+        return pd.DataFrame({f'ADX_{length}': adx_line, f'DMP_{length}': dmp, f'DMN_{length}': dmn},
+                            index=close.index)
     adx_ind = _ta.trend.ADXIndicator(high, low, close, window=length)
     return pd.DataFrame({
         f'ADX_{length}': adx_ind.adx(),
@@ -49,26 +229,67 @@ def adx(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) ->
         f'DMN_{length}': adx_ind.adx_neg()
     })
 
+@_memoize
 def roc(close: pd.Series, length: int = 10) -> pd.Series:
     """Calculate Rate of Change."""
+    arrays = _fast(close)
+    if arrays is not None:
+        return _series(_k.roc(*arrays, length), close, 'roc')
     return _ta.momentum.ROCIndicator(close, window=length).roc()
 
+@_memoize
 def stoch(high: pd.Series, low: pd.Series, close: pd.Series, k: int = 14, d: int = 3) -> pd.DataFrame:
     """Calculate Stochastic Oscillator. Returns DataFrame with STOCHk and STOCHd."""
+    arrays = _fast(high, low, close)
+    if arrays is not None:
+        stoch_k, stoch_d = _k.stoch(*arrays, k, d)
+        return pd.DataFrame({f'STOCHk_{k}_{d}_3': stoch_k, f'STOCHd_{k}_{d}_3': stoch_d},
+                            index=close.index)
     stoch_ind = _ta.momentum.StochasticOscillator(high, low, close, window=k, smooth_window=d)
     return pd.DataFrame({
         f'STOCHk_{k}_{d}_3': stoch_ind.stoch(),
         f'STOCHd_{k}_{d}_3': stoch_ind.stoch_signal()
     })
 
+@_memoize
 def obv(close: pd.Series, volume: pd.Series) -> pd.Series:
     """Calculate On-Balance Volume."""
+    arrays = _fast(close, volume)
+    if arrays is not None:
+        return _series(_k.obv(*arrays), close, 'obv')
     return _ta.volume.OnBalanceVolumeIndicator(close, volume).on_balance_volume()
 
+@_memoize
 def cci(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 20) -> pd.Series:
     """Calculate Commodity Channel Index."""
+    arrays = _fast(high, low, close)
+    if arrays is not None:
+        return _series(_k.cci(*arrays, length), close, 'cci')
     return _ta.trend.CCIIndicator(high, low, close, window=length).cci()
 
+@_memoize
 def willr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
     """Calculate Williams %R."""
+    arrays = _fast(high, low, close)
+    if arrays is not None:
+        return _series(_k.willr(*arrays, length), close, 'wr')
     return _ta.momentum.WilliamsRIndicator(high, low, close, lbp=length).williams_r()
+
+@_memoize
+def corr(close: pd.Series, other: pd.Series, length: int = 20) -> pd.Series:
+    """Rolling correlation, close.rolling(length).corr(other)."""
+    return correlations(close, {'corr': (other, length)})['corr']
+
+def correlations(close: pd.Series, others: dict) -> pd.DataFrame:
+    """
+    Rolling correlations of 'close' with several series in one pass.
+    others: {column: (series on the same index, length)}. Constant windows give NaN on the
+    'numpy' backend (pandas leaves rounding noise, +-inf or NaN there).
+    """
+    if _backend != 'numpy':
+        return pd.DataFrame({name: close.rolling(length).corr(other) for name, (other, length) in others.items()},
+                            index=close.index)
+    arrays = {}  # one array per distinct series, so its running sums are shared
+    pairs = [(arrays.setdefault(id(other), _k.as_array(other)), length) for other, length in others.values()]
+    values = _k.rolling_corr(_k.as_array(close), pairs)
+    return pd.DataFrame(dict(zip(others, values)), index=close.index)
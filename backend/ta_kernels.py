@@ -0,0 +1,464 @@
+"""
+TA Kernels
+NumPy implementations of the indicators exposed by ta_compat.
+
+Every kernel takes contiguous float64 arrays and returns arrays with the same
+values as the 'ta' library (fillna=False): same warm-up NaNs / zeros, same
+recursions. Recursive smoothers (EMA, Wilder) run through scipy's lfilter,
+windowed statistics through cumulative sums, O(n) min/max filters or
+strided window views.
+
+Inputs are expected to be NaN-free (ta_compat falls back to 'ta' otherwise).
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from scipy.ndimage import minimum_filter1d, maximum_filter1d
+
+
+def as_array(values) -> np.ndarray:
+    """Series / list / array -> contiguous float64 array (no copy when already one)."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    out = _nan(len(x))
+    if periods < len(x):
+        out[periods:] = x[:len(x) - periods]
+    return out
+
+
+def ewm(x: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """pandas ewm(alpha, adjust=False).mean() for a series with (optional) leading NaNs."""
+    out = _nan(len(x))
+    valid = np.flatnonzero(~np.isnan(x))
+    if len(valid) == 0:
+        return out
+    start = valid[0]
+    seg = x[start:]
+    out[start:], _ = lfilter([alpha], [1.0, alpha - 1.0], seg, zi=[(1.0 - alpha) * seg[0]])
+    out[start:start + max(min_periods, 1) - 1] = np.nan
+    return out
+
+
+def wilder(x: np.ndarray, window: int, seed: float) -> np.ndarray:
+    """y[0] = seed, y[i] = y[i-1] * (1 - 1/window) + x[i]  (running Wilder sum)."""
+    decay = 1.0 - 1.0 / window
+    out = np.empty(len(x) + 1)
+    out[0] = seed
+    if len(x):
+        out[1:], _ = lfilter([1.0], [1.0, -decay], x, zi=[decay * seed])
+    return out
+
+
+def wilder_mean(x: np.ndarray, window: int, seed: float) -> np.ndarray:
+    """y[0] = seed, y[i] = (y[i-1] * (window - 1) + x[i]) / window  (Wilder average)."""
+    out = np.empty(len(x) + 1)
+    out[0] = seed
+    if len(x):
+        decay = (window - 1.0) / window
+        out[1:], _ = lfilter([1.0 / window], [1.0, -decay], x, zi=[decay * seed])
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """rolling(window, min_periods=window).mean(); windows containing NaN are NaN."""
+    n = len(x)
+    out = _nan(n)
+    if window > n:
+        return out
+    nan = np.isnan(x)
+    has_nan = nan.any()
+    filled = np.where(nan, 0.0, x) if has_nan else x
+    anchor = filled[0]  # recentred cumulative sums keep the float error small on long series
+    csum = np.concatenate(([0.0], np.cumsum(filled - anchor)))
+    out[window - 1:] = (csum[window:] - csum[:-window]) / window + anchor
+    if has_nan:
+        ccount = np.concatenate(([0], np.cumsum(nan)))
+        out[window - 1:][ccount[window:] - ccount[:-window] > 0] = np.nan
+    # Constant windows are exact (as in pandas), so 'x - mean' is 0 and not rounding noise
+    constant = _constant_windows(x, window)
+    out[window - 1:][constant] = x[window - 1:][constant]
+    return out
+
+
+def _windows(x: np.ndarray, window: int):
+    return sliding_window_view(x, window) if window <= len(x) else None
+
+
+def _constant_windows(x: np.ndarray, window: int) -> np.ndarray:
+    """Mask over the windows ending at window - 1 .. n - 1: no bar-to-bar change inside (NaN never constant)."""
+    changes = np.concatenate(([0], np.cumsum(x[1:] != x[:-1])))
+    return changes[window - 1:] == changes[:len(x) - window + 1]
+
+
+def _rolling_moments(x: np.ndarray, window: int):
+    """
+    (mean, centred sum of squares) of the windows ending at rows window - 1 .. n - 1, computed
+    CORR_CHUNK blocks of windows per pass so the temporaries stay in cache.
+    """
+    n = len(x)
+    mean, ss = np.empty(n - window + 1), np.empty(n - window + 1)
+    step = CORR_CHUNK * max(CORR_BLOCK, 2 * window)
+    for lo in range(0, n - window + 1, step):
+        hi = min(lo + step, n - window + 1)
+        mean[lo:hi], ss[lo:hi] = _moments_pass(x[lo:hi + window - 1], window)
+    return mean, ss
+
+
+def _moments_pass(x: np.ndarray, window: int):
+    """
+    _rolling_moments over one stretch of x.
+
+    Windowed sums of x and x² are taken around a per-block anchor (each CORR_BLOCK-row block
+    is shifted by its first value, as in rolling_corr), so the float error stays at the level
+    of the local moves; the window - 1 rows a window reaches back into the previous block
+    are shifted to its anchor. Nearly flat windows use the two-pass formula, constant
+    windows are exact (mean = value, sum of squares = 0), windows containing NaN are NaN.
+    """
+    n = len(x)
+    block = max(CORR_BLOCK, 2 * window)
+    filled = _filled(x)
+    anchor = filled[::block]
+    d = filled - np.repeat(anchor, block)[:n]
+    c1 = np.zeros(n + 1)
+    c2 = np.zeros(n + 1)
+    np.cumsum(d, out=c1[1:])
+    np.multiply(d, d, out=d)
+    np.cumsum(d, out=c2[1:])
+    sx = c1[window:] - c1[:n - window + 1]
+    sxx = c2[window:] - c2[:n - window + 1]
+    base = np.repeat(anchor, block)[window - 1:n]  # anchor of each window's last row
+
+    # Windows crossing a block start: (block b, offset j < window - 1), k = window - 1 - j rows before it
+    starts = np.arange(1, len(anchor)) * block
+    if window > 1 and len(starts):
+        offsets = np.arange(window - 1)
+        ends = (starts[:, None] + offsets).ravel()
+        keep = ends < n
+        ends = ends[keep]
+        k = np.broadcast_to(window - 1 - offsets, (len(starts), window - 1)).ravel()[keep]
+        b = ends // block
+        shift_ = anchor[b - 1] - anchor[b]
+        first = ends - window + 1
+        q1 = c1[b * block] - c1[first]  # previous-block rows, relative to the previous anchor
+        sx[first] += k * shift_
+        sxx[first] += (2 * q1 + k * shift_) * shift_
+
+    mean = sx / window
+    ss = sxx - sx * mean
+    np.maximum(ss, 0.0, out=ss)
+    mean += base
+    constant = _constant_windows(x, window)
+    redo = np.flatnonzero((sxx >= CORR_REFINE * ss) & ~constant)
+    if len(redo):
+        w = sliding_window_view(x, window)[redo]
+        dev = w - w.mean(axis=1, keepdims=True)
+        ss[redo] = np.einsum('ij,ij->i', dev, dev)
+    ss[constant] = 0.0
+    mean[constant] = x[window - 1:][constant]
+    nan = np.isnan(x)
+    if nan.any():
+        missing = np.concatenate(([0], np.cumsum(nan)))
+        has_nan = missing[window:] - missing[:-window] > 0
+        mean[has_nan] = ss[has_nan] = np.nan
+    return mean, ss
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    """rolling(window).std(ddof) from block-anchored windowed sums (see _rolling_moments)."""
+    out = _nan(len(x))
+    if window <= len(x):
+        _, ss = _rolling_moments(x, window)
+        ss /= window - ddof
+        np.sqrt(ss, out=out[window - 1:])
+    return out
+
+
+def _rolling_extreme(x: np.ndarray, window: int, fast_filter, reduce) -> np.ndarray:
+    out = _nan(len(x))
+    if window > len(x):
+        return out
+    if np.isnan(x).any():
+        out[window - 1:] = reduce(_windows(x, window), axis=1)  # NaN-propagating path
+    else:
+        # O(n) filter; origin shifts the centred window to the trailing [i - window + 1, i]
+        out[window - 1:] = fast_filter(x, window, origin=(window - 1) // 2)[window - 1:]
+    return out
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_extreme(x, window, minimum_filter1d, np.min)
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_extreme(x, window, maximum_filter1d, np.max)
+
+
+def rolling_mad(x: np.ndarray, window: int) -> np.ndarray:
+    """Mean absolute deviation around the window mean."""
+    out = _nan(len(x))
+    w = _windows(x, window)
+    if w is not None:
+        out[window - 1:] = np.abs(w - w.mean(axis=1, keepdims=True)).mean(axis=1)
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = shift(close)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+# --- indicators ---
+
+def rsi(close: np.ndarray, length: int = 14) -> np.ndarray:
+    diff = np.diff(close, prepend=np.nan)
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    up_avg = ewm(up, 1.0 / length, length)
+    down_avg = ewm(down, 1.0 / length, length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(down_avg == 0, 100.0, 100.0 - 100.0 / (1.0 + up_avg / down_avg))
+
+
+def sma(close: np.ndarray, length: int = 20) -> np.ndarray:
+    return rolling_mean(close, length)
+
+
+def ema(close: np.ndarray, length: int = 20) -> np.ndarray:
+    return ewm(close, 2.0 / (length + 1), length)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    """(macd, histogram, signal)"""
+    line = ema(close, fast) - ema(close, slow)
+    sig = ewm(line, 2.0 / (signal + 1), signal)
+    return line, line - sig, sig
+
+
+def bbands(close: np.ndarray, length: int = 20, std: float = 2.0):
+    """(lower, middle, upper)"""
+    mid = rolling_mean(close, length)
+    lower, upper = _nan(len(close)), _nan(len(close))
+    if length <= len(close):
+        width = rolling_std(close, length)[length - 1:]
+        width *= std
+        mean = mid[length - 1:]
+        np.subtract(mean, width, out=lower[length - 1:])
+        np.add(mean, width, out=upper[length - 1:])
+    return lower, mid, upper
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 14) -> np.ndarray:
+    """Requires len >= length (the 'ta' implementation raises otherwise)."""
+    tr = true_range(high, low, close)
+    out = np.zeros(len(close))
+    out[length - 1:] = wilder_mean(tr[length:], length, tr[:length].mean())
+    return out
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 14):
+    """
+    (adx, +DI, -DI) with the exact warm-up layout of ta.trend.ADXIndicator
+    (zeros during warm-up, last smoothed value left at zero). Requires len >= 2 * length.
+    """
+    n, size = length, len(close)
+    m = size - (n - 1)
+    prev_close = shift(close)
+    movement = np.fmax(high, prev_close) - np.fmin(low, prev_close)
+    movement[0] = np.nan
+
+    diff_up = np.diff(high, prepend=np.nan)
+    diff_down = -np.diff(low, prepend=np.nan)
+    pos = np.where((diff_up > diff_down) & (diff_up > 0), diff_up, 0.0)
+    neg = np.where((diff_down > diff_up) & (diff_down > 0), diff_down, 0.0)
+
+    def smoothed(values):
+        out = np.zeros(m)
+        out[:m - 1] = wilder(values[n + 1:n + m - 1], n, values[1:n + 1].sum())
+        return out
+
+    trs, dip, din = smoothed(movement), smoothed(pos), smoothed(neg)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        di_pos = np.where(trs != 0, 100 * (dip / trs), 0.0)
+        di_neg = np.where(trs != 0, 100 * (din / trs), 0.0)
+        di_sum = di_pos + di_neg
+        dx = np.where(di_sum != 0, 100 * np.abs((di_pos - di_neg) / di_sum), 0.0)
+
+    adx_line = np.zeros(m)
+    adx_line[n:] = wilder_mean(dx[n:m - 1], n, dx[:n].mean())
+
+    pos_out, neg_out = np.zeros(size), np.zeros(size)
+    pos_out[n + 1:] = di_pos[1:m - 1]
+    neg_out[n + 1:] = di_neg[1:m - 1]
+    return np.concatenate((np.zeros(n - 1), adx_line)), pos_out, neg_out
+
+
+def roc(close: np.ndarray, length: int = 10) -> np.ndarray:
+    prev = shift(close, length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (close - prev) / prev * 100
+
+
+def stoch(high: np.ndarray, low: np.ndarray, close: np.ndarray, k: int = 14, d: int = 3):
+    """(%K, %D)"""
+    lowest = rolling_min(low, k)
+    highest = rolling_max(high, k)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = 100 * (close - lowest) / (highest - lowest)
+    return stoch_k, rolling_mean(stoch_k, d)
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    signed = np.where(close < shift(close), -volume, volume)
+    return np.cumsum(signed)
+
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 20,
+        constant: float = 0.015) -> np.ndarray:
+    typical = (high + low + close) / 3.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (typical - rolling_mean(typical, length)) / (constant * rolling_mad(typical, length))
+
+
+def willr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 14) -> np.ndarray:
+    highest = rolling_max(high, length)
+    lowest = rolling_min(low, length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -100 * (highest - close) / (highest - lowest)
+
+
+# --- rolling correlation ---
+
+CORR_BLOCK = 128    # rows per re-anchored block of running sums (float error grows with the block)
+CORR_CHUNK = 64     # blocks per pass, so the temporaries stay in cache
+CORR_REFINE = 1e4   # raw / centred sum of squares above which a window is recomputed exactly
+
+
+def _filled(x: np.ndarray) -> np.ndarray:
+    """x with NaNs replaced by the previous (or first) finite value, so sums stay local."""
+    valid = ~np.isnan(x)
+    if valid.all() or not valid.any():
+        return x
+    idx = np.maximum.accumulate(np.where(valid, np.arange(len(x)), 0))
+    idx[:np.argmax(valid)] = np.argmax(valid)
+    return x[idx]
+
+
+def _running_sums(values: np.ndarray) -> np.ndarray:
+    """Cumulative sums along each row, with a leading zero column."""
+    out = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=out[:, 1:])
+    return out
+
+
+def _window_corr(x: np.ndarray, y: np.ndarray, ends: np.ndarray, window: int) -> np.ndarray:
+    """Two-pass correlation of the windows ending at 'ends'; NaN where x or y is constant."""
+    def centred(values):
+        w = sliding_window_view(values, window)[ends - window + 1]
+        d = w - w[:, :1]  # exact zeros for constant windows
+        return d - d.mean(axis=1, keepdims=True)
+    dx, dy = centred(x), centred(y)
+    var = np.einsum('ij,ij->i', dx, dx) * np.einsum('ij,ij->i', dy, dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(var == 0, np.nan, np.einsum('ij,ij->i', dx, dy) / np.sqrt(var))
+
+
+def rolling_corr(x: np.ndarray, pairs: list) -> list:
+    """
+    Series(x).rolling(window).corr(Series(y)) for several (y, window) pairs in one pass.
+
+    Windowed sums come from running (cumulative) sums of x, x², y, y², xy. To keep the float
+    error at the level of the local price moves, the sums restart every CORR_BLOCK rows
+    around the block's first value (each block also covers the window - 1 rows before it).
+    The sums over x are shared by all pairs, the sums over y by all windows of the same
+    array object. Nearly flat windows, where the centred sums cancel all but a few digits
+    of the raw ones, are recomputed with the two-pass formula.
+
+    Windows with a NaN in x or y are NaN, like pandas. Windows where x or y is constant
+    (e.g. a forward-filled macro series over a weekend) are NaN (zero variance), so the
+    feature pipelines drop them; pandas returns NaN / +-inf there, or rounding noise
+    around 0 depending on the running-sum state.
+    """
+    n = len(x)
+    outs = [_nan(n) for _ in pairs]
+    if not pairs or max(window for _, window in pairs) > n:
+        return outs
+
+    widest = max(window for _, window in pairs)
+    n_blocks = -(-n // CORR_BLOCK)
+    span = CORR_BLOCK + widest - 1
+    pad = (widest - 1, n_blocks * CORR_BLOCK - n)
+
+    def blocks(values):
+        """(n_blocks x span) view: each block with the window - 1 rows before it."""
+        return sliding_window_view(np.pad(_filled(values), pad, mode='edge'), span)[::CORR_BLOCK]
+
+    blocks_x = blocks(x)
+    series = {}  # id(y) -> (y, blocks of y, [(pair index, window)])
+    for i, (y, window) in enumerate(pairs):
+        series.setdefault(id(y), (y, blocks(y), []))[2].append((i, window))
+    ill = [np.zeros(n_blocks * CORR_BLOCK, dtype=bool) for _ in pairs]
+    raw = [np.empty(n_blocks * CORR_BLOCK) for _ in pairs]
+
+    def anchored(view):
+        return view - view[:, widest - 1:widest]  # relative to each block's first own row
+
+    for first in range(0, n_blocks, CORR_CHUNK):
+        last = min(first + CORR_CHUNK, n_blocks)
+        rows = slice(first * CORR_BLOCK, last * CORR_BLOCK)
+        dx = anchored(blocks_x[first:last])
+        sum_x, sum_xx = _running_sums(dx), _running_sums(dx * dx)
+        x_stats = {}  # window -> (sum, centred sum of squares, ill-conditioned), shared by all y
+        for _, blocks_y, windows in series.values():
+            dy = anchored(blocks_y[first:last])
+            sum_y, sum_yy, sum_xy = _running_sums(dy), _running_sums(dy * dy), _running_sums(dx * dy)
+            for i, window in windows:
+                def window_sum(csum):
+                    return (csum[:, widest:] - csum[:, widest - window:span + 1 - window]).ravel()
+                if window not in x_stats:
+                    sx, sxx = window_sum(sum_x), window_sum(sum_xx)
+                    var_x = sxx - sx * sx / window
+                    # Flat windows: the centred sums keep only a few digits of the raw ones
+                    x_stats[window] = sx, var_x, sxx >= CORR_REFINE * var_x
+                sx, var_x, ill_x = x_stats[window]
+                sy, syy = window_sum(sum_y), window_sum(sum_yy)
+                var_y = syy - sy * sy / window
+                cov = window_sum(sum_xy) - sx * sy / window
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    raw[i][rows] = cov / np.sqrt(var_x * var_y)
+                ill[i][rows] = ill_x | (syy >= CORR_REFINE * var_y)
+
+    def changes(values):
+        """Running count of bar-to-bar changes; a window without changes is constant."""
+        return np.concatenate(([0, 0], np.cumsum(values[1:] != values[:-1])))
+
+    x_nan, x_changes = np.isnan(x), changes(x)
+    for y, _, windows in series.values():
+        nan = x_nan | np.isnan(y)
+        missing = np.concatenate(([0], np.cumsum(nan))) if nan.any() else None
+        y_changes = changes(y)
+        for i, window in windows:
+            corr = raw[i][:n]
+            corr[:window - 1] = np.nan
+            constant = np.zeros(n, dtype=bool)
+            constant[window - 1:] = ((x_changes[window:] == x_changes[1:n - window + 2]) |
+                                     (y_changes[window:] == y_changes[1:n - window + 2]))
+            corr[constant] = np.nan
+            redo = ill[i][:n] & ~constant
+            redo[:window - 1] = False
+            if missing is not None:
+                has_nan = np.zeros(n, dtype=bool)
+                has_nan[window - 1:] = missing[window:] - missing[:-window] > 0
+                corr[has_nan] = np.nan
+                redo &= ~has_nan
+            redo = np.flatnonzero(redo)
+            if len(redo):
+                corr[redo] = _window_corr(x, y, redo, window)
+            outs[i] = corr
+    return outs
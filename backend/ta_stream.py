@@ -0,0 +1,491 @@
+"""
+TA Stream
+Incremental (O(1) per bar) versions of the ta_compat indicators for the live loop.
+
+Each indicator consumes one closed bar with update(...) and returns its current value
+(same values as ta_compat on the full history). peek(...) returns the value for a bar
+that is still open without changing the state. to_state() / from_state() round-trip
+through JSON, so a restarted worker resumes without replaying history.
+
+FeatureStream feeds a set of named indicators from a candle frame: it commits the
+closed rows it has not seen yet and peeks the newest (open) row.
+"""
+
+import copy
+import json
+import math
+import os
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+NAN = float('nan')
+_REGISTRY = {}
+
+
+def _div(a: float, b: float) -> float:
+    """a / b with NumPy float semantics (x/0 -> +-inf, 0/0 -> nan) instead of ZeroDivisionError."""
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _full(window: deque) -> bool:
+    return len(window) == window.maxlen and not any(math.isnan(x) for x in window)
+
+
+def _mean(window: deque) -> float:
+    first = window[0]
+    if all(x == first for x in window):
+        return first  # constant windows are exact (as in pandas / ta_kernels)
+    return math.fsum(window) / len(window)
+
+
+def _std(window: deque, ddof: int = 0) -> float:
+    mean = _mean(window)
+    return math.sqrt(math.fsum((x - mean) ** 2 for x in window) / (len(window) - ddof))
+
+
+class StreamIndicator:
+    """Base class: update() commits a closed bar, peek() evaluates an open one."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _REGISTRY[cls.__name__] = cls
+
+    def update(self, *values):
+        raise NotImplementedError
+
+    def peek(self, *values):
+        return copy.deepcopy(self).update(*values)
+
+    # --- serialization ---
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, deque):
+            return {'__deque__': list(value), 'maxlen': value.maxlen}
+        if isinstance(value, StreamIndicator):
+            return {'__indicator__': type(value).__name__, 'state': value.to_state()}
+        return value
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, dict) and '__deque__' in value:
+            return deque(value['__deque__'], maxlen=value['maxlen'])
+        if isinstance(value, dict) and '__indicator__' in value:
+            return _REGISTRY[value['__indicator__']].from_state(value['state'])
+        return value
+
+    def to_state(self) -> dict:
+        return {key: self._encode(value) for key, value in self.__dict__.items()}
+
+    @classmethod
+    def from_state(cls, state: dict):
+        obj = cls.__new__(cls)
+        obj.__dict__.update({key: cls._decode(value) for key, value in state.items()})
+        return obj
+
+
+# --- building blocks ---
+
+class EMA(StreamIndicator):
+    """ewm(adjust=False).mean(); leading NaNs are skipped, warm-up bars return NaN."""
+
+    def __init__(self, length: int = 20, alpha: float = None, min_periods: int = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (length + 1)
+        self.min_periods = length if min_periods is None else min_periods
+        self.value = None
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        if not math.isnan(x):
+            self.value = x if self.value is None else (1.0 - self.alpha) * self.value + self.alpha * x
+            self.count += 1
+        return self.value if self.value is not None and self.count >= self.min_periods else NAN
+
+
+class SMA(StreamIndicator):
+    def __init__(self, length: int = 20):
+        self.window = deque(maxlen=length)
+
+    def update(self, x: float) -> float:
+        self.window.append(x)
+        return _mean(self.window) if _full(self.window) else NAN
+
+
+class RollingMin(StreamIndicator):
+    def __init__(self, length: int):
+        self.window = deque(maxlen=length)
+
+    def update(self, x: float) -> float:
+        self.window.append(x)
+        return min(self.window) if _full(self.window) else NAN
+
+
+class RollingMax(StreamIndicator):
+    def __init__(self, length: int):
+        self.window = deque(maxlen=length)
+
+    def update(self, x: float) -> float:
+        self.window.append(x)
+        return max(self.window) if _full(self.window) else NAN
+
+
+class Change(StreamIndicator):
+    """pct_change(periods) (as a fraction, like pandas)."""
+
+    def __init__(self, periods: int = 1):
+        self.window = deque(maxlen=periods + 1)
+
+    def update(self, x: float) -> float:
+        self.window.append(x)
+        if len(self.window) < self.window.maxlen:
+            return NAN
+        return _div(x, self.window[0]) - 1
+
+
+class RollingCorr(StreamIndicator):
+    """
+    Series.rolling(length).corr(other) from running sums (O(1) per bar), like
+    ta_kernels.rolling_corr: the sums are kept around an anchor that is reset from the
+    window every 'length' bars. Constant windows give NaN.
+    """
+
+    def __init__(self, length: int):
+        self.x = deque(maxlen=length)
+        self.y = deque(maxlen=length)
+        self.anchor = [NAN, NAN]
+        self.sums = [0.0] * 5  # x, y, x², y², xy around the anchor
+        self.missing = 0       # bars with a NaN in the window
+        self.runs = [0, 0]     # equal-value run lengths of x and y
+        self.age = 0           # bars since the last re-anchoring
+
+    def _add(self, x: float, y: float, sign: float):
+        dx, dy = x - self.anchor[0], y - self.anchor[1]
+        for i, term in enumerate((dx, dy, dx * dx, dy * dy, dx * dy)):
+            self.sums[i] += sign * term
+
+    def _reanchor(self):
+        finite = [(a, b) for a, b in zip(self.x, self.y) if not (math.isnan(a) or math.isnan(b))]
+        self.anchor = list(finite[-1]) if finite else [NAN, NAN]
+        self.sums = [0.0] * 5
+        for a, b in finite:
+            self._add(a, b, 1.0)
+        self.age = 0
+
+    def update(self, x: float, y: float) -> float:
+        length = self.x.maxlen
+        if len(self.x) == length:
+            old_x, old_y = self.x[0], self.y[0]
+            if math.isnan(old_x) or math.isnan(old_y):
+                self.missing -= 1
+            elif not math.isnan(self.anchor[0]):
+                self._add(old_x, old_y, -1.0)
+        self.runs = [self.runs[0] + 1 if self.x and x == self.x[-1] else 1,
+                     self.runs[1] + 1 if self.y and y == self.y[-1] else 1]
+        self.x.append(x)
+        self.y.append(y)
+        self.age += 1
+        if math.isnan(x) or math.isnan(y):
+            self.missing += 1
+        elif math.isnan(self.anchor[0]) or self.age >= length:
+            self._reanchor()
+        else:
+            self._add(x, y, 1.0)
+
+        if len(self.x) < length or self.missing:
+            return NAN
+        if max(self.runs) >= length:
+            return NAN  # zero variance
+        sx, sy, sxx, syy, sxy = self.sums
+        cov = sxy - sx * sy / length
+        var_x = sxx - sx * sx / length
+        var_y = syy - sy * sy / length
+        return _div(cov, math.sqrt(var_x * var_y)) if var_x * var_y >= 0 else NAN
+
+
+# --- ta_compat indicators ---
+
+class RSI(StreamIndicator):
+    def __init__(self, length: int = 14):
+        self.prev = NAN
+        self.up = EMA(alpha=1.0 / length, min_periods=length)
+        self.down = EMA(alpha=1.0 / length, min_periods=length)
+
+    def update(self, close: float) -> float:
+        diff = close - self.prev
+        self.prev = close
+        # NaN diffs count as 0.0, like diff.where(diff > 0, 0.0) in 'ta'
+        up = self.up.update(diff if diff > 0 else 0.0)
+        down = self.down.update(-diff if diff < 0 else 0.0)
+        if down == 0:
+            return 100.0
+        return 100.0 - _div(100.0, 1.0 + _div(up, down))
+
+
+class MACD(StreamIndicator):
+    """Returns (macd, histogram, signal)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, close: float):
+        line = self.fast.update(close) - self.slow.update(close)
+        sig = self.signal.update(line)
+        return line, line - sig, sig
+
+
+class BBands(StreamIndicator):
+    """Returns (lower, middle, upper)."""
+
+    def __init__(self, length: int = 20, std: float = 2.0):
+        self.window = deque(maxlen=length)
+        self.std = std
+
+    def update(self, close: float):
+        self.window.append(close)
+        if not _full(self.window):
+            return NAN, NAN, NAN
+        mid, dev = _mean(self.window), _std(self.window)
+        return mid - self.std * dev, mid, mid + self.std * dev
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    ranges = [r for r in (high - low, abs(high - prev_close), abs(low - prev_close)) if not math.isnan(r)]
+    return max(ranges) if ranges else NAN
+
+
+class ATR(StreamIndicator):
+    """Wilder ATR; 0.0 during warm-up (as in 'ta')."""
+
+    def __init__(self, length: int = 14):
+        self.length = length
+        self.prev_close = NAN
+        self.seed = []
+        self.value = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = _true_range(high, low, self.prev_close)
+        self.prev_close = close
+        if self.value is None:
+            self.seed.append(tr)
+            if len(self.seed) < self.length:
+                return 0.0
+            self.value = math.fsum(self.seed) / self.length
+            self.seed = []
+            return self.value
+        self.value = (self.value * (self.length - 1) + tr) / self.length
+        return self.value
+
+
+class ADX(StreamIndicator):
+    """Returns (adx, +DI, -DI) with the warm-up layout of ta.trend.ADXIndicator (zeros)."""
+
+    def __init__(self, length: int = 14):
+        self.length = length
+        self.bars = 0
+        self.prev = None  # (high, low, close)
+        self.sums = [0.0, 0.0, 0.0]  # movement, +DM, -DM over bars 1..length
+        self.smoothed = None
+        self.dx_seed = []
+        self.adx = None
+
+    def update(self, high: float, low: float, close: float):
+        n, t = self.length, self.bars
+        self.bars += 1
+        prev, self.prev = self.prev, (high, low, close)
+        if prev is None:
+            return 0.0, 0.0, 0.0
+
+        prev_high, prev_low, prev_close = prev
+        movement = max(high, prev_close) - min(low, prev_close)
+        up, down = high - prev_high, prev_low - low
+        pos = up if (up > down and up > 0) else 0.0
+        neg = down if (down > up and down > 0) else 0.0
+        values = (movement, pos, neg)
+
+        if t <= n:
+            self.sums = [s + v for s, v in zip(self.sums, values)]
+            if t < n:
+                return 0.0, 0.0, 0.0
+            self.smoothed = list(self.sums)
+        else:
+            decay = 1.0 - 1.0 / n
+            self.smoothed = [s * decay + v for s, v in zip(self.smoothed, values)]
+
+        trs, dip, din = self.smoothed
+        di_pos = 100 * (dip / trs) if trs != 0 else 0.0
+        di_neg = 100 * (din / trs) if trs != 0 else 0.0
+        di_sum = di_pos + di_neg
+        dx = 100 * abs((di_pos - di_neg) / di_sum) if di_sum != 0 else 0.0
+
+        if self.adx is None:
+            self.dx_seed.append(dx)
+            if len(self.dx_seed) == n:
+                self.adx = sum(self.dx_seed) / n
+                self.dx_seed = []
+        else:
+            self.adx = (self.adx * (n - 1) + dx) / n
+
+        first_smoothed = t == n  # 'ta' reports 0 for the DIs of the seed bar
+        return (self.adx if self.adx is not None else 0.0,
+                0.0 if first_smoothed else di_pos,
+                0.0 if first_smoothed else di_neg)
+
+
+class ROC(StreamIndicator):
+    def __init__(self, length: int = 10):
+        self.window = deque(maxlen=length + 1)
+
+    def update(self, close: float) -> float:
+        self.window.append(close)
+        if len(self.window) < self.window.maxlen:
+            return NAN
+        prev = self.window[0]
+        return _div(close - prev, prev) * 100
+
+
+class Stoch(StreamIndicator):
+    """Returns (%K, %D)."""
+
+    def __init__(self, k: int = 14, d: int = 3):
+        self.lowest = RollingMin(k)
+        self.highest = RollingMax(k)
+        self.k_window = deque(maxlen=d)
+
+    def update(self, high: float, low: float, close: float):
+        lowest, highest = self.lowest.update(low), self.highest.update(high)
+        stoch_k = 100 * _div(close - lowest, highest - lowest)
+        self.k_window.append(stoch_k)
+        return stoch_k, (_mean(self.k_window) if _full(self.k_window) else NAN)
+
+
+class OBV(StreamIndicator):
+    def __init__(self):
+        self.prev = NAN
+        self.total = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        self.total += -volume if close < self.prev else volume
+        self.prev = close
+        return self.total
+
+
+class CCI(StreamIndicator):
+    def __init__(self, length: int = 20, constant: float = 0.015):
+        self.window = deque(maxlen=length)
+        self.constant = constant
+
+    def update(self, high: float, low: float, close: float) -> float:
+        typical = (high + low + close) / 3.0
+        self.window.append(typical)
+        if not _full(self.window):
+            return NAN
+        mean = _mean(self.window)
+        window_mean = float(np.mean(self.window))
+        mad = float(np.mean(np.abs(np.asarray(self.window) - window_mean)))
+        return _div(typical - mean, self.constant * mad)
+
+
+class WillR(StreamIndicator):
+    def __init__(self, length: int = 14):
+        self.highest = RollingMax(length)
+        self.lowest = RollingMin(length)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        highest, lowest = self.highest.update(high), self.lowest.update(low)
+        return -100 * _div(highest - close, highest - lowest)
+
+
+# --- frame driver ---
+
+class FeatureStream:
+    """
+    Named indicators fed from a candle frame.
+
+    spec: {name: (indicator, inputs)} where inputs(row) returns the update() arguments
+    for a row dict. Only indicator states are serialized; the spec is rebuilt by the caller.
+    """
+
+    def __init__(self, spec: dict, time_col: str = 'date'):
+        self.spec = spec
+        self.time_col = time_col
+        self._initial = {name: ind.to_state() for name, (ind, _) in spec.items()}
+        self.last_time = None   # epoch ms of the last committed row
+        self.last_close = None  # its close, to detect a different series
+
+    def _times(self, df: pd.DataFrame) -> np.ndarray:
+        dates = df[self.time_col] if self.time_col in df.columns else df.index
+        return pd.DatetimeIndex(dates).values.astype('datetime64[ms]').astype(np.int64)
+
+    def _start(self, df: pd.DataFrame, times: np.ndarray) -> int:
+        """First row to commit; resets (full replay) when the frame does not continue the stream."""
+        if self.last_time is not None:
+            pos = int(np.searchsorted(times, self.last_time))
+            if pos < len(times) and times[pos] == self.last_time and df['close'].iloc[pos] == self.last_close:
+                return pos + 1
+        self.reset()
+        return 0
+
+    def reset(self):
+        self.spec = {name: (ind.__class__.from_state(copy.deepcopy(self._initial[name])), inputs)
+                     for name, (ind, inputs) in self.spec.items()}
+        self.last_time = None
+        self.last_close = None
+
+    def sync(self, df: pd.DataFrame) -> dict:
+        """Commit the unseen closed rows (all but the last), then return the values for the last row."""
+        if df.empty:
+            return {}
+        times = self._times(df)
+        start = self._start(df, times)
+        columns = list(df.columns)
+        last = len(df) - 1
+
+        for i, row in enumerate(df.iloc[start:last].itertuples(index=False, name=None), start):
+            bar = dict(zip(columns, row))
+            for ind, inputs in self.spec.values():
+                ind.update(*inputs(bar))
+            self.last_time, self.last_close = int(times[i]), bar['close']
+
+        bar = dict(zip(columns, df.iloc[last].tolist()))
+        return {name: ind.peek(*inputs(bar)) for name, (ind, inputs) in self.spec.items()}
+
+    # --- persistence ---
+    def to_state(self) -> dict:
+        return {'last_time': self.last_time, 'last_close': self.last_close,
+                'indicators': {name: ind.to_state() for name, (ind, _) in self.spec.items()}}
+
+    def load_state(self, state: dict) -> bool:
+        """Restore indicator states; False (and nothing changed) if the spec does not match."""
+        saved = state.get('indicators', {})
+        if set(saved) != set(self.spec):
+            return False
+        if any(set(saved[name]) != set(self._initial[name]) for name in saved):
+            return False  # saved by an older version of an indicator
+        self.spec = {name: (ind.__class__.from_state(saved[name]), inputs)
+                     for name, (ind, inputs) in self.spec.items()}
+        self.last_time, self.last_close = state.get('last_time'), state.get('last_close')
+        return True
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.to_state(), f)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r') as f:
+                return self.load_state(json.load(f))
+        except Exception as e:
+            print(f"  [Stream] State at {path} unreadable: {e}")
+            return False
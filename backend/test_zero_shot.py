@@ -3,6 +3,7 @@ Zero-Shot Generalization Test
 Tests Proteus AI on an asset it was NEVER trained on.
 """
 
+import numpy as np
 import pandas as pd
 from strategies import get_strategy
 from utils.data_loader import fetch_crypto, fetch_macro_data, merge_data
@@ -64,12 +65,11 @@ def run_zero_shot():
     
     print(f"[*] Running Simulation on {len(test_df)} days...")
     
-    for i in range(20, len(test_df)):
-        current_date_val = test_df.iloc[i]['date']
-        window = full_df[full_df['date'] <= current_date_val]
-        
-        # Predict using BTC logic on LTC data
-        result = strategy.analyze(window)
+    # Predict using BTC logic on LTC data: each day sees full_df up to its date, one batched pass
+    positions = np.searchsorted(full_df['date'].to_numpy(), test_df['date'].to_numpy()[20:], side='right') - 1
+    results = strategy.predict_history(full_df, positions).to_dict('records')
+    
+    for i, result in zip(range(20, len(test_df)), results):
         signal = result.get('signal', 'NEUTRAL')
         price = test_df.iloc[i]['close']
         
@@ -0,0 +1,76 @@
+"""
+As-of Join Engine
+Aligns asset candles (any timeframe) with a lower-frequency panel such as the daily macro frame.
+
+The panel is indexed once on int64 bucket keys (days by default). Each asset frame is then
+aligned with a single searchsorted lookup: every asset row gets the latest panel row whose
+key is <= the asset row's key. The panel values are never copied per call.
+"""
+
+import numpy as np
+import pandas as pd
+
+DAY_MS = 86_400_000
+
+
+def epoch_ms(dates) -> np.ndarray:
+    """datetime-like Series/Index/array -> int64 epoch milliseconds (naive UTC)."""
+    values = pd.DatetimeIndex(dates)
+    if values.tz is not None:
+        values = values.tz_convert('UTC').tz_localize(None)
+    return values.values.astype('datetime64[ms]').astype(np.int64)
+
+
+class AsofPanel:
+    """
+    Pre-indexed panel for as-of lookups.
+
+    - keys: sorted unique int64 bucket keys (epoch_ms // resolution_ms)
+    - values: 2D float64 array (keys x columns), forward-filled down the panel
+    """
+
+    def __init__(self, panel_df: pd.DataFrame, time_col: str = 'date', resolution_ms: int = DAY_MS):
+        self.time_col = time_col
+        self.resolution_ms = resolution_ms
+        self.columns = [c for c in panel_df.columns if c not in (time_col, 'time')]
+
+        keys = epoch_ms(panel_df[time_col]) // resolution_ms
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        values = panel_df[self.columns].to_numpy(dtype=np.float64)[order]
+
+        # Duplicate buckets: keep the last row of each bucket
+        last_of_bucket = np.append(keys[1:] != keys[:-1], True)
+        self.keys = keys[last_of_bucket]
+        values = values[last_of_bucket]
+
+        # Forward-fill once here instead of on every merged frame
+        valid = ~np.isnan(values)
+        idx = np.where(valid, np.arange(len(values))[:, None], 0)
+        np.maximum.accumulate(idx, axis=0, out=idx)
+        filled = values[idx, np.arange(values.shape[1])]
+        filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+        self.values = np.ascontiguousarray(filled)
+
+    def positions(self, dates) -> np.ndarray:
+        """Panel row for each timestamp (-1 where the panel has not started yet)."""
+        keys = epoch_ms(dates) // self.resolution_ms
+        return np.searchsorted(self.keys, keys, side='right') - 1
+
+    def lookup(self, dates) -> np.ndarray:
+        """(len(dates) x columns) array of as-of panel values."""
+        pos = self.positions(dates)
+        out = self.values.take(np.maximum(pos, 0), axis=0)
+        out[pos < 0] = np.nan
+        return out
+
+    def align(self, asset_df: pd.DataFrame, time_col: str = 'date') -> pd.DataFrame:
+        """Asset columns + as-of panel columns, in the asset frame's row order."""
+        aligned = self.lookup(asset_df[time_col])
+        macro = pd.DataFrame(aligned, columns=self.columns, index=asset_df.index)
+        base = asset_df.drop(columns=[c for c in self.columns if c in asset_df.columns])
+        return pd.concat([base, macro], axis=1)
+
+    def align_many(self, frames: dict, time_col: str = 'date') -> dict:
+        """Align several asset frames against the same panel."""
+        return {key: self.align(df, time_col) for key, df in frames.items()}
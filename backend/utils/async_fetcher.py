@@ -0,0 +1,188 @@
+"""
+Async Market Data Fetcher
+Concurrent OHLCV download stage built on ccxt.async_support.
+
+- One shared exchange session per fetch stage
+- Token-bucket rate limiter charged with Binance request weights
+- Bounded concurrency, per-symbol timeouts and retries
+- All frames are returned at once, so a cycle costs about as much as its slowest request
+"""
+
+import asyncio
+import time
+import concurrent.futures
+import pandas as pd
+import ccxt.async_support as ccxt_async
+
+OHLCV_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+WEIGHT_PER_MINUTE = 1200  # conservative Binance spot REQUEST_WEIGHT budget
+
+
+def kline_weight(limit: int) -> int:
+    """Binance /api/v3/klines weight by requested limit."""
+    if limit < 100: return 1
+    if limit < 500: return 2
+    if limit <= 1000: return 5
+    return 10
+
+
+def run_sync(coro_factory):
+    """
+    Run a coroutine from sync code. Works both from plain threads (trader loop)
+    and from inside a running event loop (FastAPI handlers calling run_live_cycle).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro_factory())
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro_factory()).result()
+
+
+class TokenBucket:
+    """Weight-based token bucket: 'capacity' tokens, refilled at 'rate' tokens/second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, weight: float = 1):
+        # The bucket outlives event loops (one asyncio.run per cycle), its lock must not
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock[0] is not loop:
+            self._lock = (loop, asyncio.Lock())
+        async with self._lock[1]:
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                await asyncio.sleep((weight - self.tokens) / self.rate)
+
+
+class AsyncOHLCVFetcher:
+    """
+    Fetches OHLCV for many symbols concurrently.
+
+    exchange_factory: zero-arg callable returning an async ccxt-like exchange
+    (fetch_ohlcv / close coroutines). Pass a fake one for local testing.
+    """
+
+    def __init__(self, exchange_factory=None, max_concurrency: int = 20, timeout: float = 10.0,
+                 retries: int = 3, backoff: float = 0.5, weight_per_minute: float = WEIGHT_PER_MINUTE):
+        self.exchange_factory = exchange_factory or (lambda: ccxt_async.binance({'enableRateLimit': False}))
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = TokenBucket(rate=weight_per_minute / 60.0, capacity=weight_per_minute)
+        self._markets = None  # reused across sessions so exchangeInfo is loaded once per process
+
+    async def _fetch_page(self, exchange, symbol, timeframe, since, limit):
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire(kline_weight(limit))
+            try:
+                return await asyncio.wait_for(
+                    exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit), self.timeout)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                print(f"  [Async] {symbol} retry {attempt + 1}/{self.retries}: {type(e).__name__}")
+                await asyncio.sleep(self.backoff * (2 ** attempt))
+
+    async def _fetch_symbol(self, exchange, semaphore, symbol, timeframe, since, limit, end=None):
+        """Pages forward from 'since' until a short page (or past 'end', inclusive, when given)."""
+        async with semaphore:
+            rows = []
+            while True:
+                page = await self._fetch_page(exchange, symbol, timeframe, since, limit)
+                if not page: break
+                if end is not None and page[-1][0] >= end:
+                    rows.extend(row for row in page if row[0] <= end)
+                    break
+                rows.extend(page)
+                if len(page) < limit: break
+                since = page[-1][0] + 1
+            return pd.DataFrame(rows, columns=OHLCV_COLUMNS)
+
+    async def _fetch_first(self, exchange, semaphore, symbol, timeframe, since):
+        async with semaphore:
+            page = await self._fetch_page(exchange, symbol, timeframe, since, 1)
+            return page[0][0] if page else None
+
+    async def _session(self, jobs: list, worker, on_result=None) -> list:
+        """
+        Runs worker(exchange, semaphore, *job) for every job on one shared exchange session.
+        on_result(job, result) (async) is awaited as each job completes.
+        Returns results in job order; failed jobs (or a failed session) yield the exception.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        exchange = self.exchange_factory()
+        if self._markets and hasattr(exchange, 'set_markets'):
+            exchange.set_markets(self._markets)
+
+        async def run(job):
+            result = await worker(exchange, semaphore, *job)
+            if on_result is not None:
+                await on_result(job, result)
+            return result
+
+        try:
+            if hasattr(exchange, 'load_markets'):
+                await asyncio.wait_for(exchange.load_markets(), self.timeout)
+                self._markets = exchange.markets
+            return await asyncio.gather(*[run(job) for job in jobs], return_exceptions=True)
+        except Exception as e:
+            print(f"  [Async] Exchange session failed: {e}")
+            return [e] * len(jobs)
+        finally:
+            await exchange.close()
+
+    async def fetch_all(self, requests: dict, timeframe: str = "1d") -> dict:
+        """
+        requests: {symbol: (since_ms, limit)}
+        Returns {symbol: DataFrame} for every symbol; failed symbols map to None.
+        """
+        symbols = list(requests)
+        jobs = [(sym, timeframe, *requests[sym]) for sym in symbols]
+        results = await self._session(jobs, self._fetch_symbol)
+
+        frames = {}
+        for sym, res in zip(symbols, results):
+            if isinstance(res, Exception):
+                print(f"  [Async] {sym} failed: {res}")
+                frames[sym] = None
+            else:
+                frames[sym] = res
+        return frames
+
+    async def fetch_ranges(self, ranges: list, timeframe: str = "1h", limit: int = 1000,
+                           on_result=None) -> list:
+        """
+        ranges: [(symbol, start_ms, end_ms)], fetched concurrently under the shared rate budget.
+        on_result((symbol, start_ms, end_ms), DataFrame) is awaited as each range completes.
+        Returns a DataFrame (or the exception) per range, in order.
+        """
+        jobs = [(sym, timeframe, start, limit, end) for sym, start, end in ranges]
+        callback = None
+        if on_result is not None:
+            async def callback(job, frame):
+                await on_result((job[0], job[2], job[4]), frame)
+        return await self._session(jobs, self._fetch_symbol, callback)
+
+    async def first_timestamps(self, symbols: list, timeframe: str = "1h", since: int = 0) -> dict:
+        """Open time of the first candle at/after 'since' per symbol (None if none or failed)."""
+        results = await self._session([(sym, timeframe, since) for sym in symbols], self._fetch_first)
+        return {sym: None if isinstance(res, Exception) else res for sym, res in zip(symbols, results)}
+
+    def fetch(self, requests: dict, timeframe: str = "1d") -> dict:
+        """Blocking wrapper around fetch_all."""
+        return run_sync(lambda: self.fetch_all(requests, timeframe))
@@ -0,0 +1,146 @@
+"""
+Backfill Scheduler
+Concurrent, resumable history rebuild for the OHLCV store.
+
+- Each symbol's range is split into fixed segments (a few pages each) on a grid anchored at 'start'
+- All segments of all symbols are fetched concurrently under the shared Binance weight budget
+- Listing dates are probed first, so no requests are spent before a symbol existed
+- Completed segments are checkpointed (data/cache/backfill/<tf>.json); a re-run skips them
+"""
+
+import os
+import json
+import time
+import asyncio
+import ccxt
+from utils.ohlcv_store import store, to_ms, STORE_DIR
+from utils.async_fetcher import AsyncOHLCVFetcher, run_sync
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(STORE_DIR), 'cache', 'backfill')
+PAGE_LIMIT = 1000
+SEGMENT_PAGES = 10
+
+
+class BackfillScheduler:
+    """
+    Range-split backfill for one timeframe.
+
+    - plan_async(): probes listing dates and returns the segments still to fetch
+    - run(): fetches the planned segments concurrently, writing each one to the store as it lands
+    - repair(): refetches only the holes reported by the store's gap index
+    """
+
+    def __init__(self, timeframe: str = '1h', target_store=store, fetcher: AsyncOHLCVFetcher = None,
+                 checkpoint_path: str = None, segment_pages: int = SEGMENT_PAGES):
+        self.timeframe = timeframe
+        self.store = target_store
+        self.fetcher = fetcher or AsyncOHLCVFetcher()
+        self.checkpoint_path = checkpoint_path or os.path.join(CHECKPOINT_DIR, f"{timeframe}.json")
+        self.tf_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.segment_ms = segment_pages * PAGE_LIMIT * self.tf_ms
+        self.state = self._load_checkpoint()
+
+    # --- checkpoint ---
+    def _load_checkpoint(self) -> dict:
+        if os.path.exists(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"  [!] Backfill checkpoint unreadable, starting fresh: {e}")
+        return {}
+
+    def _save_checkpoint(self):
+        os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def _entry(self, symbol: str, start_ms: int) -> dict:
+        # The segment grid depends on the start date; a different start invalidates the entry
+        entry = self.state.get(symbol)
+        if entry is None or entry.get('start') != start_ms:
+            entry = {'start': start_ms, 'first': None, 'done': []}
+            self.state[symbol] = entry
+        return entry
+
+    # --- planning ---
+    def _segments(self, entry: dict, end_ms: int, closed_ms: int) -> list:
+        """(seg_start, seg_end, complete) for the not-yet-done segments of one symbol."""
+        done = set(entry['done'])
+        seg_start = entry['start'] + (entry['first'] - entry['start']) // self.segment_ms * self.segment_ms
+        segments = []
+        while seg_start <= end_ms:
+            seg_end = seg_start + self.segment_ms - 1
+            if seg_start not in done:
+                segments.append((seg_start, min(seg_end, end_ms), seg_end <= min(end_ms, closed_ms)))
+            seg_start += self.segment_ms
+        return segments
+
+    async def plan_async(self, symbols: list, start, end=None) -> list:
+        """[(symbol, seg_start, seg_end, complete)] still missing for the requested range."""
+        start_ms = to_ms(start)
+        now_ms = int(time.time() * 1000)
+        end_ms = min(to_ms(end), now_ms) if end is not None else now_ms
+        closed_ms = now_ms - self.tf_ms  # bars after this may still be open
+
+        entries = {sym: self._entry(sym, start_ms) for sym in symbols}
+        unprobed = [sym for sym, entry in entries.items() if entry['first'] is None]
+        if unprobed:
+            firsts = await self.fetcher.first_timestamps(unprobed, self.timeframe, start_ms)
+            for sym, first in firsts.items():
+                entries[sym]['first'] = first
+            self._save_checkpoint()
+
+        plan = []
+        for sym, entry in entries.items():
+            if entry['first'] is None:
+                print(f"  [!] {sym}: no listing found (or probe failed), skipped")
+                continue
+            plan.extend((sym, *segment) for segment in self._segments(entry, end_ms, closed_ms))
+        return plan
+
+    # --- execution ---
+    async def run_async(self, symbols: list, start, end=None) -> dict:
+        """Backfill [start, end] for all symbols. Returns {symbol: candles written}."""
+        plan = await self.plan_async(symbols, start, end)
+        complete = {(sym, seg_start): done for sym, seg_start, _, done in plan}
+        written = {sym: 0 for sym in symbols}
+        print(f"[*] Backfill {self.timeframe}: {len(plan)} segments for {len(symbols)} symbols")
+
+        async def on_segment(segment, frame):
+            sym, seg_start, _ = segment
+            written[sym] += await asyncio.to_thread(self.store.write, sym, self.timeframe, frame)
+            if complete[(sym, seg_start)]:
+                self.state[sym]['done'].append(seg_start)
+                self._save_checkpoint()
+
+        results = await self.fetcher.fetch_ranges([(sym, s, e) for sym, s, e, _ in plan],
+                                                  self.timeframe, PAGE_LIMIT, on_segment)
+        failed = sum(isinstance(res, Exception) for res in results)
+        if failed:
+            print(f"  [!] {failed} segments failed; re-run to resume from the checkpoint")
+        return written
+
+    def run(self, symbols: list, start, end=None) -> dict:
+        """Blocking wrapper around run_async."""
+        return run_sync(lambda: self.run_async(symbols, start, end))
+
+    async def repair_async(self, symbols: list) -> dict:
+        """Refetch the interior gaps of the stored series. Returns {symbol: candles written}."""
+        ranges = [(sym, lo, hi) for sym in symbols for lo, hi in self.store.gaps(sym, self.timeframe)]
+        written = {sym: 0 for sym in symbols}
+        if not ranges:
+            return written
+        print(f"[*] Repair {self.timeframe}: {len(ranges)} gaps for {len(symbols)} symbols")
+
+        async def on_range(segment, frame):
+            written[segment[0]] += await asyncio.to_thread(self.store.write, segment[0], self.timeframe, frame)
+
+        await self.fetcher.fetch_ranges(ranges, self.timeframe, PAGE_LIMIT, on_range)
+        return written
+
+    def repair(self, symbols: list) -> dict:
+        """Blocking wrapper around repair_async."""
+        return run_sync(lambda: self.repair_async(symbols))
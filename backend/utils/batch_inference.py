@@ -0,0 +1,137 @@
+"""
+Batch Inference
+Cross-symbol prediction stage: the newest feature rows of every symbol that shares a model
+are stacked into one matrix, sent through a single predict_proba and scattered back.
+
+- predict_proba_many(requests): synchronous, one call per distinct model object
+  (strategies loaded through the model registry share model objects per file)
+- MicroBatcher: requests submitted from any thread within a short window (INFERENCE_WINDOW_MS)
+  join one batch, so API-triggered predictions ride along with the trader's cycle
+- analyze_many(pairs): analyze() for many (strategy, candles) pairs through the batcher;
+  strategies without prepare_inference() / finish_inference() just call analyze()
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import Future
+import numpy as np
+import pandas as pd
+
+WINDOW_MS = float(os.environ.get("INFERENCE_WINDOW_MS", 5))
+MAX_BATCH = int(os.environ.get("INFERENCE_MAX_BATCH", 4096))
+
+
+def _stack(blocks):
+    """One matrix from the request rows; DataFrames stay DataFrames (feature names for XGBoost / sklearn)."""
+    if all(isinstance(block, pd.DataFrame) for block in blocks):
+        return pd.concat(blocks, ignore_index=True)
+    return np.vstack([np.asarray(block) for block in blocks])
+
+
+def predict_proba_many(requests):
+    """
+    [(model, X), ...] -> [model.predict_proba(X), ...] with one predict_proba per distinct model.
+    Row results are identical to per-request calls (the models score rows independently).
+    """
+    results = [None] * len(requests)
+    groups = {}
+    for k, (model, _) in enumerate(requests):
+        groups.setdefault(id(model), []).append(k)
+
+    for members in groups.values():
+        model = requests[members[0]][0]
+        blocks = [requests[k][1] for k in members]
+        probability = np.asarray(model.predict_proba(_stack(blocks) if len(blocks) > 1 else blocks[0]))
+        offset = 0
+        for k, block in zip(members, blocks):
+            results[k] = probability[offset:offset + len(block)]
+            offset += len(block)
+    return results
+
+
+class MicroBatcher:
+    """Collects predict_proba requests for window_ms after the first one, then runs them as one batch."""
+
+    def __init__(self, window_ms: float = WINDOW_MS, max_batch: int = MAX_BATCH):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue = []
+        self._cond = threading.Condition()
+        self._worker = None
+        self._stats = {'requests': 0, 'batches': 0, 'model_calls': 0}
+
+    def submit(self, model, X) -> Future:
+        return self.submit_many([(model, X)])[0]
+
+    def submit_many(self, requests):
+        """Queue [(model, X), ...] together (same batch unless max_batch splits them): futures of predict_proba."""
+        futures = [Future() for _ in requests]
+        with self._cond:
+            self._queue.extend((model, X, future) for (model, X), future in zip(requests, futures))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        return futures
+
+    def predict_proba(self, model, X):
+        return self.submit(model, X).result()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return dict(self._stats)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.window
+                while len(self._queue) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+                self._stats['requests'] += len(batch)
+                self._stats['batches'] += 1
+                self._stats['model_calls'] += len({id(model) for model, _, _ in batch})
+
+            try:
+                results = predict_proba_many([(model, X) for model, X, _ in batch])
+            except Exception:
+                # One bad request must not fail the others: retry them one by one
+                for model, X, future in batch:
+                    try:
+                        future.set_result(model.predict_proba(X))
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+            for (_, _, future), probability in zip(batch, results):
+                future.set_result(probability)
+
+
+def analyze_many(pairs, batcher: MicroBatcher = None):
+    """[strategy.analyze(candles) for strategy, candles in pairs] with the model calls batched."""
+    batcher = batcher or micro_batcher
+    results = [None] * len(pairs)
+    pending = []
+    for k, (strategy, candles) in enumerate(pairs):
+        if not hasattr(strategy, 'prepare_inference'):
+            results[k] = strategy.analyze(candles)
+            continue
+        result, request = strategy.prepare_inference(candles)
+        if request is None:
+            results[k] = result
+        else:
+            pending.append((k, strategy, request))
+
+    futures = batcher.submit_many([(request[0], request[1]) for _, _, request in pending])
+    for (k, strategy, request), future in zip(pending, futures):
+        results[k] = strategy.finish_inference(request, future.result()[0])
+    return results
+
+
+# Global instance
+micro_batcher = MicroBatcher()
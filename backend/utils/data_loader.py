@@ -3,135 +3,124 @@ Data Loader Utility
 Centralizes fetching logic for Crypto (CCXT) and Macro (YFinance) data.
 """
 
+import time
+import weakref
 import ccxt
-import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from utils.ohlcv_store import store, to_ms
+from utils.asof_join import AsofPanel
 
-def fetch_crypto(symbol, start_date="2020-01-01"):
-    """Fetch Crypto OHLCV from Binance"""
-    print(f"[*] Fetching Crypto: {symbol}...")
-    exchange = ccxt.binance()
-    since = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000)
+OHLCV_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+PAGE_LIMIT = 1000
+
+_exchange = None
+_async_fetcher = None
+_macro_panel = None  # (weakref to macro frame, AsofPanel)
+
+def get_exchange():
+    """Shared Binance client (markets are loaded once per process)"""
+    global _exchange
+    if _exchange is None:
+        _exchange = ccxt.binance({'enableRateLimit': True})
+    return _exchange
+
+def _download_since(exchange, symbol, timeframe, since):
+    """Page through fetch_ohlcv from 'since' until a short page arrives"""
     all_ohlcv = []
+    while True:
+        ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=PAGE_LIMIT)
+        if not ohlcv: break
+        all_ohlcv.extend(ohlcv)
+        if len(ohlcv) < PAGE_LIMIT: break
+        since = ohlcv[-1][0] + 1
+    return pd.DataFrame(all_ohlcv, columns=OHLCV_COLUMNS)
+
+def fetch_crypto(symbol, start_date="2020-01-01", timeframe="1d"):
+    """
+    Fetch Crypto OHLCV from Binance, backed by the persistent OHLCV store.
+    Only the delta since the newest stored candle is downloaded. That candle is
+    re-fetched too, because it may still have been open when it was stored.
+    """
+    start_ms = to_ms(start_date)
+    last_ts = store.last_timestamp(symbol, timeframe)
+    since = start_ms if last_ts is None else last_ts
+    
+    if last_ts is None:
+        print(f"[*] Fetching Crypto: {symbol} (full history since {start_date})...")
     
     try:
-        while True:
-            ohlcv = exchange.fetch_ohlcv(symbol, "1d", since=since, limit=1000)
-            if not ohlcv: break
-            all_ohlcv.extend(ohlcv)
-            since = ohlcv[-1][0] + 1
-            last_date = datetime.fromtimestamp(ohlcv[-1][0] / 1000)
-            if last_date.year >= 2026: break
-            
-        df = pd.DataFrame(all_ohlcv, columns=['time', 'open', 'high', 'low', 'close', 'volume'])
-        df['date'] = pd.to_datetime(df['time'], unit='ms')
-        return df
+        delta = _download_since(get_exchange(), symbol, timeframe, since)
+        store.write(symbol, timeframe, delta)
     except Exception as e:
         print(f"Error fetching {symbol}: {e}")
-        return None
+        if last_ts is None:
+            return None
+        print(f"  [Cache] Using stored candles for {symbol}")
+    
+    df = store.read(symbol, timeframe, start=start_ms)
+    return df if not df.empty else None
 
-def fetch_macro_data(start_date="2020-01-01"):
-    """Fetch Macro Data (DXY, VIX) from YFinance + ETH/BTC from Binance"""
-    print("[*] Fetching Macro Data (DXY, VIX, ETH/BTC)...")
-    try:
-        # 1. YFinance Data (DXY, VIX)
-        tickers = ["DX-Y.NYB", "^VIX"] 
-        data = yf.download(tickers, start=start_date, end=datetime.now().strftime("%Y-%m-%d"), progress=False)
-        
-        dxy, vix = None, None
-        
-        if isinstance(data.columns, pd.MultiIndex):
-            if 'DX-Y.NYB' in data['Close']:
-                dxy = data['Close']['DX-Y.NYB'].reset_index()
-            if '^VIX' in data['Close']:
-                vix = data['Close']['^VIX'].reset_index()
+def fetch_crypto_many(symbols, start_date="2020-01-01", timeframe="1d", fetcher=None):
+    """
+    Concurrent version of fetch_crypto for a whole portfolio.
+    Deltas for all symbols are downloaded in one async stage, merged into the
+    store, and returned as {symbol: DataFrame or None}.
+    """
+    from utils.async_fetcher import AsyncOHLCVFetcher
+    global _async_fetcher
+    if fetcher is None:
+        if _async_fetcher is None:
+            _async_fetcher = AsyncOHLCVFetcher()
+        fetcher = _async_fetcher
+    
+    start_ms = to_ms(start_date)
+    now_ms = int(time.time() * 1000)
+    tf_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+    
+    requests, cached = {}, {}
+    for sym in symbols:
+        last_ts = store.last_timestamp(sym, timeframe)
+        cached[sym] = last_ts is not None
+        since = start_ms if last_ts is None else last_ts
+        # Small deltas ask for a small page (lower request weight)
+        limit = int(min(PAGE_LIMIT, max(2, (now_ms - since) // tf_ms + 2)))
+        requests[sym] = (since, limit)
+    
+    deltas = fetcher.fetch(requests, timeframe)
+    
+    frames = {}
+    for sym in symbols:
+        delta = deltas.get(sym)
+        if delta is not None:
+            store.write(sym, timeframe, delta)
+        elif not cached[sym]:
+            frames[sym] = None
+            continue
         else:
-            # Fallback if structure is flat (unlikely with multi-ticker)
-            pass 
-            
-        if dxy is None or vix is None:
-             print("  [Error] Failed to parse YFinance Macro Data")
-             return None
+            print(f"  [Cache] Using stored candles for {sym}")
+        df = store.read(sym, timeframe, start=start_ms)
+        frames[sym] = df if not df.empty else None
+    return frames
 
-        dxy.columns = ['date', 'dxy_close']
-        vix.columns = ['date', 'vix_close']
-        macro = pd.merge(dxy, vix, on='date', how='outer')
-        
-        # 2. Binance Data (ETH/BTC) - Altseason Indicator
-        binance = ccxt.binance()
-        since = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000)
-        eth_btc_ohlcv = []
-        while True:
-            ohlcv = binance.fetch_ohlcv("ETH/BTC", "1d", since=since, limit=1000)
-            if not ohlcv: break
-            eth_btc_ohlcv.extend(ohlcv)
-            since = ohlcv[-1][0] + 1
-            last_date = datetime.fromtimestamp(ohlcv[-1][0] / 1000)
-            if last_date.year >= 2026: break
-            
-        eth_btc_df = pd.DataFrame(eth_btc_ohlcv, columns=['time', 'open', 'high', 'low', 'close', 'volume'])
-        eth_btc_df['date'] = pd.to_datetime(eth_btc_df['time'], unit='ms').dt.tz_localize(None)
-        eth_btc_clean = eth_btc_df[['date', 'close']].rename(columns={'close': 'eth_btc_close'})
-        
-        # Merge All
-        if macro['date'].dt.tz is not None:
-            macro['date'] = macro['date'].dt.tz_localize(None)
-            
-        macro = pd.merge(macro, eth_btc_clean, on='date', how='outer')
-        macro = pd.merge(macro, eth_btc_clean, on='date', how='outer')
-        
-        # 3. GLOBAL MARKET CONTEXT (BTC/USDT)
-        # Proteus Neo needs BTC price action to gauge global sentiment
-        btc_ohlcv = []
-        since = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000)
-        while True:
-            ohlcv = binance.fetch_ohlcv("BTC/USDT", "1d", since=since, limit=1000)
-            if not ohlcv: break
-            btc_ohlcv.extend(ohlcv)
-            since = ohlcv[-1][0] + 1
-            last_date = datetime.fromtimestamp(ohlcv[-1][0] / 1000)
-            if last_date.year >= 2026: break
-            
-        btc_df = pd.DataFrame(btc_ohlcv, columns=['time', 'open', 'high', 'low', 'close', 'volume'])
-        btc_df['date'] = pd.to_datetime(btc_df['time'], unit='ms').dt.tz_localize(None)
-        btc_clean = btc_df[['date', 'close', 'volume']].rename(columns={
-            'close': 'market_btc_close',
-            'volume': 'market_btc_vol'
-        })
-        
-        macro = pd.merge(macro, btc_clean, on='date', how='outer')
-        
-        macro = macro.sort_values('date').ffill()
-        
-        return macro
-    except Exception as e:
-        print(f"Error fetching macro: {e}")
-        return None
+def fetch_macro_data(start_date="2020-01-01"):
+    """
+    Macro Data (DXY, VIX from YFinance + ETH/BTC, BTC/USDT from Binance).
+    Served by the shared MacroDataProvider: the frame is built once and reused
+    until one of its series goes stale. Treat the returned frame as read-only.
+    """
+    from utils.macro_provider import macro_provider
+    return macro_provider.get(start_date)
+
+def get_macro_panel(macro_df):
+    """As-of index over the macro frame, built once per macro frame object"""
+    global _macro_panel
+    if _macro_panel is not None and _macro_panel[0]() is macro_df:
+        return _macro_panel[1]
+    panel = AsofPanel(macro_df)
+    _macro_panel = (weakref.ref(macro_df), panel)
+    return panel
 
 def merge_data(crypto_df, macro_df):
-    """Merge Crypto OHLCV with Macro Data"""
-    # Create copies to avoid SettingWithCopy warnings on input dfs
-    c_df = crypto_df.copy()
-    m_df = macro_df.copy()
-    
-    c_df['date_only'] = c_df['date'].dt.normalize()
-    m_df['date_only'] = m_df['date'].dt.normalize()
-    
-    m_clean = m_df.drop(columns=['date'])
-    merged = pd.merge(c_df, m_clean, on='date_only', how='left')
-    
-    merged['dxy_close'] = merged['dxy_close'].ffill()
-    merged['vix_close'] = merged['vix_close'].ffill()
-    if 'eth_btc_close' in merged.columns:
-        merged['eth_btc_close'] = merged['eth_btc_close'].ffill()
-        
-    if 'market_btc_close' in merged.columns:
-        merged['market_btc_close'] = merged['market_btc_close'].ffill()
-        merged['market_btc_vol'] = merged['market_btc_vol'].ffill()
-        
-    if 'date' not in merged.columns and 'date_x' in merged.columns:
-         merged = merged.rename(columns={'date_x': 'date'})
-         
-    return merged
+    """Merge Crypto OHLCV (any timeframe) with the daily Macro Data (as-of the candle's day)"""
+    return get_macro_panel(macro_df).align(crypto_df)
@@ -1,48 +1,120 @@
-
+import os
+import csv
+import hashlib
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
-from datetime import datetime
+
+CALENDAR_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'event_calendar.csv')
+WINDOW_DAYS = 30  # olayin kac gun oncesi / sonrasi isaretlenir
+DAY_NS = 86_400 * 10**9
+UNIT_NS = {'s': 10**9, 'ms': 10**6, 'us': 10**3, 'ns': 1}
+COMBINE = ('last', 'max')  # ayni tipteki olaylar: listedeki son olay / her gun en yakin etki
+
+def _unique_days(days: np.ndarray):
+    """(benzersiz gunler, her satirin gun sirasi); sirali indekste siralama yapilmaz."""
+    if len(days) and (days[1:] >= days[:-1]).all():
+        starts = np.r_[True, days[1:] != days[:-1]]
+        return days[starts], np.cumsum(starts) - 1
+    return np.unique(days, return_inverse=True)
 
 class EventCalendar:
     """
-    Ekonomik ve Finansal Olaylar Takvimi (2015-2026)
+    Ekonomik ve Finansal Olaylar Takvimi
     Piyasa yapıcı olayların tarihlerini ve etkilerini saklar.
+
+    Olaylar CSV dosyasindan okunur (date,event,power); her olay tipi bir kolon.
+    combine ayni tipteki olaylari belirler (surume dahil):
+    - 'last': listedeki son olay kolonu belirler (eski dongude her olay kolonu uzerine
+      yaziyordu; egitilmis modeller bunu gordu). Tekrarlanan tipler icin uyari basilir.
+    - 'max': tipin tum olaylari (yuzlerce FOMC, CPI ...), her gun en buyuk etki; olaylar
+      sirali gunler uzerinde searchsorted ile sadece pencerelerindeki gunlere yazilir.
+    Sonuclar (tarih indeksi, takvim surumu) basina onbellekte tutulur.
     """
-    def __init__(self):
+    def __init__(self, path: str = CALENDAR_FILE, window: int = WINDOW_DAYS, max_cached: int = 16,
+                 combine: str = 'last'):
+        if combine not in COMBINE:
+            raise ValueError(f"combine must be one of {COMBINE}, got {combine!r}")
+        self.path = path
+        self.window = window
+        self.combine = combine
         # Önemli olaylar: (Tarih, Olay Tipi, Etki Gücü 1-10)
-        self.events = [
-            # Halvingler
-            ("2016-07-09", "HALVING", 10),
-            ("2020-05-11", "HALVING", 10),
-            ("2024-04-20", "HALVING", 10),
-            # Krizler / Büyük Olaylar
-            ("2020-03-12", "PANDEMIC_CRASH", 10),
-            ("2021-04-14", "COINBASE_IPO", 7),
-            ("2022-05-07", "LUNA_CRASH", 9),
-            ("2022-11-08", "FTX_CRASH", 9),
-            ("2024-01-10", "BTC_ETF_APPROVAL", 8),
-            # FED (Önemli Faiz Karar Dönemleri - Örnekler)
-            ("2022-03-16", "FED_RATE_HIKE_START", 8),
-            ("2024-09-18", "FED_RATE_CUT_START", 8),
-        ]
-        
+        self.events = self._load(path)
+        self.max_cached = max_cached
+        self._cache = OrderedDict()  # (version, index fingerprint) -> features
+        self._build()
+
+    @staticmethod
+    def _load(path: str) -> list:
+        with open(path, 'r', newline='') as f:
+            return [(row['date'], row['event'], int(row['power'])) for row in csv.DictReader(f)]
+
+    def _build(self):
+        """Olay tipi basina (sirali gun numaralari, etki gucleri); kolon sirasi ilk gorulen tip."""
+        grouped = {}
+        for event_date, event_name, power in self.events:
+            grouped.setdefault(event_name, []).append((pd.Timestamp(event_date).normalize().value // DAY_NS, power))
+        if self.combine == 'last':
+            repeated = {name: len(rows) for name, rows in grouped.items() if len(rows) > 1}
+            if repeated:
+                print(f"[!] Event calendar: only the last listed event of {repeated} counts "
+                      f"(combine='last'); combine='max' uses all of them")
+            grouped = {name: rows[-1:] for name, rows in grouped.items()}
+        self._types = {}
+        for name, rows in grouped.items():
+            rows.sort(key=lambda row: row[0])
+            self._types[name] = (np.array([day for day, _ in rows], dtype=np.int64),
+                                 np.array([power for _, power in rows]))
+        self.version = hashlib.sha1(repr((self.events, self.window, self.combine)).encode()).hexdigest()[:12]
+        self._cache.clear()
+
+    def add_event(self, event_date: str, event_name: str, power: int):
+        """Takvime olay ekle (surum degisir, onbellek temizlenir)."""
+        self.events.append((event_date, event_name, int(power)))
+        self._build()
+
+    def _features(self, days: np.ndarray) -> dict:
+        """
+        {event_<tip>: deger} sirali benzersiz gunler icin: power / (|gun farki| + 1) pencere icinde,
+        disinda 0; birden fazla olayin penceresindeki gunlerde en buyugu.
+        """
+        columns = {}
+        for name, (event_days, powers) in self._types.items():
+            column = np.zeros(len(days))
+            starts = np.searchsorted(days, event_days - self.window, side='left')
+            ends = np.searchsorted(days, event_days + self.window, side='right')
+            for event_day, power, lo, hi in zip(event_days, powers, starts, ends):
+                if lo < hi:
+                    near = power / (np.abs(days[lo:hi] - event_day) + 1)
+                    np.maximum(column[lo:hi], near, out=column[lo:hi])
+            columns[f'event_{name}'] = column
+        return columns
+
     def get_event_features(self, df_dates):
         """
         Verilen tarih serisi için 'Olay Yakınlığı' özelliklerini üretir.
+        Gun farki (tarih - olay).days ile ayni (saat kismi asagi yuvarlanir); tz'li tarihler UTC alinir.
         """
-        features = pd.DataFrame(index=df_dates)
-        
-        # Günleri datetime'a çevir
-        df_dates = pd.to_datetime(df_dates)
-        
-        # Her bir olay tipi için 'Gün Kaldı' veya 'Gün Geçti' özelliği
-        for event_date, event_name, power in self.events:
-            e_date = pd.to_datetime(event_date)
-            # Olay anına olan uzaklık (gün bazında)
-            diff = (df_dates - e_date).days
-            # Sadece olayın 30 gün öncesi ve 30 gün sonrasını işaretle
-            features[f'event_{event_name}'] = np.where((diff >= -30) & (diff <= 30), power / (abs(diff) + 1), 0)
-            
+        dates = df_dates if isinstance(df_dates, pd.DatetimeIndex) else pd.DatetimeIndex(pd.to_datetime(df_dates))
+        if dates.tz is not None:
+            dates = dates.tz_convert(None)
+        stamps = dates.asi8  # in the index's own unit (s / ms / us / ns)
+        day = DAY_NS // UNIT_NS[dates.unit]
+
+        key = (self.version, dates.unit, len(stamps), hashlib.blake2b(stamps.tobytes(), digest_size=16).digest())
+        features = self._cache.get(key)
+        if features is None:
+            # Saatlik veride gun sayisi satir sayisinin 1/24'u: olaylar gun basina bir kez hesaplanir
+            days, inverse = _unique_days(np.floor_divide(stamps, day))
+            features = pd.DataFrame({name: values[inverse] for name, values in self._features(days).items()})
+            self._cache[key] = features
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        # copy-on-write kopya: cagiran taraf onbellekteki tabloyu degistiremez
+        features = features.copy(deep=False)
+        features.index = df_dates if isinstance(df_dates, pd.Index) else pd.Index(df_dates)
         return features
 
 event_engine = EventCalendar()
@@ -0,0 +1,295 @@
+"""
+Feature Store
+Versioned, partitioned columnar (Arrow IPC) storage for computed feature frames.
+
+Layout: <root>/<feature set>/<version>/<timeframe>/<SYMBOL>/<year>.arrow
+- version is a fingerprint of the feature code (source of the functions / modules / files a
+  FeatureSet lists) and of its parameters: changing either starts a new, empty version,
+  so stale features are never read (prune() deletes the old versions)
+- update() only computes the rows from the last stored candle on (the last one is redone,
+  it may have been an open bar), from 'warmup' candles of history before it; sets that look
+  ahead (labels) redo their last 'lookahead' rows too, as new candles complete them
+- Partitions hold 'time' (int64 epoch ms) and the features as one float64 row-major matrix,
+  uncompressed and memory-mapped on read: matrix() hands out the (rows x features) array
+  without copying when the range lies in one partition (and the selected columns are adjacent)
+"""
+
+import os
+import glob
+import json
+import shutil
+import hashlib
+import inspect
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from utils.ohlcv_store import store, safe_symbol, to_ms, timeframe_ms, _years
+
+FEATURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'features')
+INDEX_FILE = '_index.json'
+
+
+class FeatureSet:
+    """
+    A named feature function: fn(candles, **params) -> DataFrame on (a subset of) the candles'
+    DatetimeIndex. 'code' lists what the features depend on (functions, classes, modules or
+    data file paths); their source is part of the version. 'warmup' is the number of candles
+    of history a new row needs (recursive smoothers: enough for their seed to decay);
+    'lookahead' the number of later candles a row depends on (forward-looking labels).
+    """
+
+    def __init__(self, name: str, fn, params: dict = None, warmup: int = 0, code=(), lookahead: int = 0):
+        self.name = name
+        self.fn = fn
+        self.params = dict(params or {})
+        self.warmup = int(warmup)
+        self.lookahead = int(lookahead)
+        self.code = (fn,) + tuple(code)
+        self._version = None
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            digest = hashlib.sha1(self.name.encode())
+            digest.update(repr(sorted(self.params.items())).encode())
+            digest.update(str(self.warmup).encode())
+            if self.lookahead:
+                digest.update(f"lookahead={self.lookahead}".encode())
+            for item in self.code:
+                if isinstance(item, str):
+                    with open(item, 'rb') as f:
+                        digest.update(f.read())
+                else:
+                    digest.update(inspect.getsource(item).encode())
+            self._version = digest.hexdigest()[:12]
+        return self._version
+
+    def compute(self, candles: pd.DataFrame) -> pd.DataFrame:
+        return self.fn(candles, **self.params)
+
+
+def _dated(candles: pd.DataFrame) -> pd.DataFrame:
+    """Candle frame on a DatetimeIndex (store frames carry a 'date' column)."""
+    if 'date' in candles.columns:
+        return candles.set_index('date')
+    return candles
+
+
+def _index_ms(index: pd.Index) -> np.ndarray:
+    dates = pd.DatetimeIndex(index)
+    if dates.tz is not None:
+        dates = dates.tz_convert(None)
+    return dates.values.astype('datetime64[ms]').astype(np.int64)
+
+
+class FeatureStore:
+    """
+    Feature frames per (feature set version, timeframe, symbol), appended incrementally.
+
+    - update(): computes and stores the rows for candles newer than the stored ones
+    - read() / matrix(): range reads (DataFrame / raw arrays) straight from the memory map
+    - load(): update() then read(), the usual call for training and backtests
+    """
+
+    def __init__(self, root: str = FEATURE_DIR, source=store):
+        self.root = root
+        self.source = source  # OHLCVStore or Resampler the candles come from
+        self._lock = threading.Lock()
+
+    def _symbol_dir(self, symbol: str, timeframe: str, feature_set: FeatureSet) -> str:
+        return os.path.join(self.root, feature_set.name, feature_set.version, timeframe, safe_symbol(symbol))
+
+    def _partition_path(self, symbol_dir: str, year: int) -> str:
+        return os.path.join(symbol_dir, f"{year}.arrow")
+
+    def versions(self, name: str) -> list:
+        """Versions on disk for a feature set name."""
+        path = os.path.join(self.root, name)
+        return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+    def prune(self, feature_set: FeatureSet) -> list:
+        """Delete every stored version of the set except the current one. Returns the removed versions."""
+        removed = [v for v in self.versions(feature_set.name) if v != feature_set.version]
+        for version in removed:
+            shutil.rmtree(os.path.join(self.root, feature_set.name, version), ignore_errors=True)
+        return removed
+
+    # --- sidecar index ---
+    def _load_index(self, symbol_dir: str) -> dict:
+        """{'columns': [...], 'years': {year(str): {first, last, rows}}} or {} when nothing is stored."""
+        try:
+            with open(os.path.join(symbol_dir, INDEX_FILE), 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        on_disk = {os.path.basename(p).split('.')[0] for p in glob.glob(os.path.join(symbol_dir, "*.arrow"))}
+        return index if set(index.get('years', {})) == on_disk else {}
+
+    def _save_index(self, symbol_dir: str, index: dict):
+        path = os.path.join(symbol_dir, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+
+    def last_timestamp(self, symbol: str, timeframe: str, feature_set: FeatureSet):
+        """Time (ms) of the newest stored feature row, or None."""
+        years = self._load_index(self._symbol_dir(symbol, timeframe, feature_set)).get('years', {})
+        return years[max(years, key=int)]['last'] if years else None
+
+    # --- partitions ---
+    @staticmethod
+    def _to_table(times: np.ndarray, values: np.ndarray, columns: list) -> pa.Table:
+        matrix = pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), len(columns))
+        schema = pa.schema([('time', pa.int64()), ('features', matrix.type)],
+                           metadata={'columns': json.dumps(columns)})
+        return pa.Table.from_arrays([pa.array(times), matrix], schema=schema)
+
+    @staticmethod
+    def _from_table(table: pa.Table, width: int):
+        """(times, rows x features matrix); zero-copy views on the memory map for a single chunk."""
+        table = table.combine_chunks()
+        times = table.column('time').to_numpy()
+        features = table.column('features')
+        if len(times) == 0:
+            return times, np.empty((0, width))
+        values = features.chunk(0).flatten().to_numpy(zero_copy_only=True)
+        return times, values.reshape(-1, width)
+
+    def _read_partition(self, path: str, width: int):
+        return self._from_table(feather.read_table(path, memory_map=True), width)
+
+    def _write(self, symbol_dir: str, times: np.ndarray, values: np.ndarray, columns: list, index: dict):
+        """Merge rows into the yearly partitions (one row per time, newest write wins)."""
+        os.makedirs(symbol_dir, exist_ok=True)
+        years = _years(times)
+        index = {'columns': columns, 'years': dict(index.get('years', {}))}
+        for year in np.unique(years):
+            rows = years == year
+            part_times, part_values = times[rows], values[rows]
+            path = self._partition_path(symbol_dir, int(year))
+            if str(year) in index['years']:
+                old_times, old_values = self._read_partition(path, len(columns))
+                keep = old_times < part_times[0]  # appends start at (or before) the last stored row
+                part_times = np.concatenate([old_times[keep], part_times])
+                part_values = np.concatenate([old_values[keep], part_values])
+            tmp = path + ".tmp"
+            feather.write_feather(self._to_table(part_times, part_values, columns), tmp, compression='uncompressed')
+            os.replace(tmp, path)
+            index['years'][str(year)] = {'first': int(part_times[0]), 'last': int(part_times[-1]),
+                                         'rows': len(part_times)}
+        self._save_index(symbol_dir, index)
+
+    def _drop(self, symbol_dir: str):
+        shutil.rmtree(symbol_dir, ignore_errors=True)
+
+    # --- update / read ---
+    def _history(self, symbol: str, timeframe: str, last, warmup: int) -> pd.DataFrame:
+        """Source candles from 'warmup' bars before 'last' (all of them when nothing is stored)."""
+        step = timeframe_ms(timeframe)
+        if last is None or not step:
+            return _dated(self.source.read(symbol, timeframe))
+        lookback = warmup + 1
+        while True:
+            candles = _dated(self.source.read(symbol, timeframe, start=last - lookback * step))
+            # Gaps (e.g. exchange outages) thin out the lookback: widen until 'warmup' bars precede 'last'
+            if np.searchsorted(_index_ms(candles.index), last) >= warmup or lookback * step > last:
+                return candles
+            lookback *= 2
+
+    def update(self, symbol: str, timeframe: str, feature_set: FeatureSet, candles: pd.DataFrame = None) -> int:
+        """
+        Compute and store the feature rows from the last stored candle on ('lookahead' rows
+        earlier for forward-looking sets). Candles come from the source store unless given
+        (they must then include 'warmup' + 'lookahead' bars before the last stored row).
+        Returns the number of rows written.
+        """
+        symbol_dir = self._symbol_dir(symbol, timeframe, feature_set)
+        with self._lock:
+            index = self._load_index(symbol_dir)
+            years = index.get('years', {})
+            last = years[max(years, key=int)]['last'] if years else None
+            given = candles is not None
+            history = feature_set.warmup + feature_set.lookahead
+            candles = _dated(candles) if given else self._history(symbol, timeframe, last, history)
+            times = _index_ms(candles.index)
+            pos = 0 if last is None else int(np.searchsorted(times, last))
+            if pos >= len(times):
+                return 0
+            if last is not None and pos < history:
+                print(f"  [!] FeatureStore: {symbol} {timeframe} has only {pos} of {history} warm-up bars")
+            pos = max(0, pos - feature_set.lookahead)  # rows whose look-ahead window was incomplete
+
+            features = feature_set.compute(candles.iloc[max(0, pos - feature_set.warmup):])
+            if last is not None:
+                features = features[_index_ms(features.index) >= times[pos]]
+            columns = [str(c) for c in features.columns]
+            if index and index['columns'] != columns:
+                # Same code, different columns (e.g. a macro series appeared): rebuild this symbol
+                print(f"  [FeatureStore] {symbol} {timeframe}: columns changed, rebuilding {feature_set.name}")
+                self._drop(symbol_dir)
+                index = {}
+                features = feature_set.compute(candles if given else _dated(self.source.read(symbol, timeframe)))
+            if features.empty:
+                return 0
+
+            values = np.ascontiguousarray(features.to_numpy(dtype=np.float64))
+            self._write(symbol_dir, _index_ms(features.index), values, columns, index)
+            return len(values)
+
+    def matrix(self, symbol: str, timeframe: str, feature_set: FeatureSet, start=None, end=None, columns=None):
+        """
+        (times ms, rows x features float64 array, column names) for [start, end] (inclusive).
+        The array is a read-only view on the memory-mapped partition when the range lies in one
+        year. 'columns' that are adjacent and in stored order keep it a (strided) view; any
+        other selection is a copy.
+        """
+        symbol_dir = self._symbol_dir(symbol, timeframe, feature_set)
+        index = self._load_index(symbol_dir)
+        names = index.get('columns', [])
+        start_ms, end_ms = to_ms(start), to_ms(end)
+
+        parts = []
+        for year in sorted(int(y) for y in index.get('years', {})):
+            meta = index['years'][str(year)]
+            if (start_ms is not None and meta['last'] < start_ms) or (end_ms is not None and meta['first'] > end_ms):
+                continue
+            times, values = self._read_partition(self._partition_path(symbol_dir, year), len(names))
+            lo = 0 if start_ms is None else int(np.searchsorted(times, start_ms, side='left'))
+            hi = len(times) if end_ms is None else int(np.searchsorted(times, end_ms, side='right'))
+            parts.append((times[lo:hi], values[lo:hi]))
+
+        if not parts:
+            times, values = np.empty(0, dtype=np.int64), np.empty((0, len(names)))
+        elif len(parts) == 1:
+            times, values = parts[0]
+        else:
+            times = np.concatenate([p[0] for p in parts])
+            values = np.concatenate([p[1] for p in parts])
+        if columns is not None:
+            picked = [names.index(c) for c in columns]
+            if picked and picked == list(range(picked[0], picked[0] + len(picked))):
+                values = values[:, picked[0]:picked[0] + len(picked)]  # column slice: still a view
+            else:
+                values = values[:, picked]
+            names = list(columns)
+        return times, values, names
+
+    def read(self, symbol: str, timeframe: str, feature_set: FeatureSet, start=None, end=None,
+             columns=None) -> pd.DataFrame:
+        """Stored features on a naive UTC 'date' index (columns share the matrix memory)."""
+        times, values, names = self.matrix(symbol, timeframe, feature_set, start, end, columns)
+        index = pd.DatetimeIndex(pd.to_datetime(times, unit='ms'), name='date')
+        return pd.DataFrame(values, index=index, columns=names, copy=False)
+
+    def load(self, symbol: str, timeframe: str, feature_set: FeatureSet, start=None, end=None,
+             columns=None) -> pd.DataFrame:
+        """update() from the source store, then read()."""
+        self.update(symbol, timeframe, feature_set)
+        return self.read(symbol, timeframe, feature_set, start, end, columns)
+
+
+# Global instance
+feature_store = FeatureStore()
@@ -0,0 +1,108 @@
+"""
+Labels
+Training targets for many horizons and barrier definitions in one vectorized pass.
+
+- forward_returns(): close[t + h] / close[t] - 1 for every horizon h
+- triple_barrier(): +1 when the high reaches close * (1 + take_profit) before the low reaches
+  close * (1 - stop_loss) within 'horizon' bars, -1 for the stop (also when both are hit in
+  the same bar), 0 on timeout; plus the number of bars until the exit
+- label_frame(): all of them as one DataFrame; label_set() wraps it as a feature store set
+  (lookahead = longest horizon), so label sweeps are cached next to the features
+
+Rows without 'horizon' bars ahead are NaN: their label is not known yet.
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from utils.feature_store import FeatureSet
+
+CHUNK_ROWS = 8192  # rows per block of forward windows (rows x horizon booleans per barrier)
+
+
+def _values(series) -> np.ndarray:
+    return np.ascontiguousarray(series, dtype=np.float64)
+
+
+def _ahead(x: np.ndarray, h: int) -> np.ndarray:
+    """x[t + h] at t, NaN for the last h rows."""
+    out = np.full(len(x), np.nan)
+    if h < len(x):
+        out[:len(x) - h] = x[h:]
+    return out
+
+
+def forward_returns(close, horizons) -> dict:
+    """{h: close[t + h] / close[t] - 1}."""
+    close = _values(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {h: _ahead(close, h) / close - 1 for h in horizons}
+
+
+def direction(close, horizon: int = 1) -> np.ndarray:
+    """1.0 when close[t + horizon] > close[t], 0.0 otherwise, NaN without 'horizon' bars ahead."""
+    close = _values(close)
+    future = _ahead(close, horizon)
+    return np.where(np.isnan(future), np.nan, (future > close).astype(np.float64))
+
+
+def triple_barrier(close, high, low, barriers) -> dict:
+    """
+    barriers: [(take_profit, stop_loss, horizon)] as fractions of the entry close.
+    Returns {(tp, sl, h): (label, bars)}; all barriers are evaluated on shared forward windows.
+    """
+    close, high, low = _values(close), _values(high), _values(low)
+    n = len(close)
+    out = {b: (np.full(n, np.nan), np.full(n, np.nan)) for b in barriers}
+    longest = max((h for _, _, h in barriers), default=0)
+    if not barriers or n <= 1:
+        return out
+
+    # Windows of the next 'longest' bars (NaN padded at the end, so every row has one)
+    pad = np.full(longest, np.nan)
+    ahead_high = sliding_window_view(np.concatenate((high[1:], pad)), longest)
+    ahead_low = sliding_window_view(np.concatenate((low[1:], pad)), longest)
+    for start in range(0, n, CHUNK_ROWS):
+        rows = slice(start, min(start + CHUNK_ROWS, n))
+        entry = close[rows, None]
+        for tp, sl, h in barriers:
+            with np.errstate(invalid='ignore'):
+                up = ahead_high[rows, :h] >= entry * (1 + tp)
+                down = ahead_low[rows, :h] <= entry * (1 - sl)
+            hit_up = np.where(up.any(axis=1), up.argmax(axis=1), h)
+            hit_down = np.where(down.any(axis=1), down.argmax(axis=1), h)
+            label, bars = out[(tp, sl, h)]
+            label[rows] = np.where(hit_down <= hit_up, np.where(hit_down < h, -1.0, 0.0), 1.0)
+            bars[rows] = np.minimum(np.minimum(hit_up, hit_down) + 1.0, h)
+    for tp, sl, h in barriers:
+        label, bars = out[(tp, sl, h)]
+        label[max(0, n - h):] = np.nan  # horizon not complete yet
+        bars[max(0, n - h):] = np.nan
+    return out
+
+
+def barrier_name(take_profit: float, stop_loss: float, horizon: int) -> str:
+    return f"tb_{take_profit:g}_{stop_loss:g}_{horizon}"
+
+
+def label_frame(df: pd.DataFrame, horizons=(1,), barriers=()) -> pd.DataFrame:
+    """ret_<h> / up_<h> per horizon and tb_<tp>_<sl>_<h> (+ _bars) per barrier, on the candles' index."""
+    columns = {}
+    for h, values in forward_returns(df['close'], horizons).items():
+        columns[f'ret_{h}'] = values
+        columns[f'up_{h}'] = direction(df['close'], h)
+    barriers = [tuple(b) for b in barriers]
+    for (tp, sl, h), (label, bars) in triple_barrier(df['close'], df['high'], df['low'], barriers).items():
+        columns[barrier_name(tp, sl, h)] = label
+        columns[barrier_name(tp, sl, h) + '_bars'] = bars
+    return pd.DataFrame(columns, index=df.index)
+
+
+def label_set(horizons=(1,), barriers=()) -> FeatureSet:
+    """Feature store set of label_frame() for one label definition (each definition is its own version)."""
+    horizons = [int(h) for h in horizons]
+    barriers = [[float(tp), float(sl), int(h)] for tp, sl, h in barriers]
+    lookahead = max(horizons + [b[2] for b in barriers])
+    return FeatureSet('labels', label_frame, params={'horizons': horizons, 'barriers': barriers},
+                      code=(sys.modules[__name__],), lookahead=lookahead)
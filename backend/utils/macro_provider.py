@@ -0,0 +1,193 @@
+"""
+Macro Data Provider
+Tiered cache for the macro frame used by Proteus / Proteus Neo (DXY, VIX, ETH/BTC, BTC/USDT).
+
+- Memory layer: per-series frames plus one merged macro frame (sliced per start date),
+  reused across live cycles
+- Disk layer: yfinance series are kept under data/cache/macro (survive restarts),
+  Binance series live in the OHLCV store through the incremental fetch_crypto
+- Freshness: yfinance daily series refresh once after each US session close,
+  Binance daily series (whose last bar is still open) use a short TTL
+"""
+
+import os
+import time
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import yfinance as yf
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+MACRO_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cache', 'macro')
+NEW_YORK = ZoneInfo("America/New_York")
+SESSION_CLOSE = (16, 30)  # NY local time; small buffer after the 16:00 close for data to publish
+CRYPTO_TTL = 300          # seconds
+START_SLACK = timedelta(days=7)  # holidays at the requested start are not a cache miss
+
+SERIES = {
+    'dxy': {'source': 'yfinance', 'ticker': 'DX-Y.NYB', 'columns': {'close': 'dxy_close'}},
+    'vix': {'source': 'yfinance', 'ticker': '^VIX', 'columns': {'close': 'vix_close'}},
+    'eth_btc': {'source': 'binance', 'symbol': 'ETH/BTC', 'columns': {'close': 'eth_btc_close'}},
+    'market_btc': {'source': 'binance', 'symbol': 'BTC/USDT',
+                   'columns': {'close': 'market_btc_close', 'volume': 'market_btc_vol'}},
+}
+
+
+def last_session_close(now: datetime = None) -> datetime:
+    """Most recent US weekday session close (UTC) at or before 'now'."""
+    now = now or datetime.now(timezone.utc)
+    local = now.astimezone(NEW_YORK)
+    close = local.replace(hour=SESSION_CLOSE[0], minute=SESSION_CLOSE[1], second=0, microsecond=0)
+    if close > local:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= timedelta(days=1)
+    return close.astimezone(timezone.utc)
+
+
+class MacroDataProvider:
+    """
+    Builds the macro frame once and serves it from memory until a series goes stale.
+    The returned frame is shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, cache_dir: str = MACRO_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._series = {}   # name -> (fetched_at epoch seconds, start Timestamp, frame)
+        self._merged = None  # (series versions, merged frame over the cached range)
+        self._frames = {}    # start_date -> sliced + ffilled frame for the current versions
+        self._lock = threading.Lock()
+
+    # --- freshness rules ---
+    def _is_fresh(self, name: str, fetched_at: float) -> bool:
+        if SERIES[name]['source'] == 'yfinance':
+            return fetched_at >= last_session_close().timestamp()
+        return time.time() - fetched_at < CRYPTO_TTL
+
+    # --- disk layer (yfinance series) ---
+    def _disk_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}.arrow")
+
+    def _load_disk(self, name: str):
+        path = self._disk_path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = feather.read_table(path).to_pandas()
+            return os.path.getmtime(path), df
+        except Exception as e:
+            print(f"  [Macro] Disk cache for {name} unreadable: {e}")
+            return None
+
+    def _save_disk(self, name: str, df: pd.DataFrame):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self._disk_path(name) + ".tmp"
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp)
+        os.replace(tmp, self._disk_path(name))
+
+    # --- downloads ---
+    def _download(self, name: str, start_date: str):
+        spec = SERIES[name]
+        if spec['source'] == 'yfinance':
+            print(f"[*] Fetching Macro Series: {spec['ticker']}...")
+            data = yf.download(spec['ticker'], start=start_date,
+                               end=datetime.now().strftime("%Y-%m-%d"), progress=False)
+            if data is None or data.empty:
+                return None
+            close = data['Close']
+            if isinstance(close, pd.DataFrame):
+                close = close.iloc[:, 0]
+            df = close.rename(spec['columns']['close']).rename_axis('date').reset_index()
+        else:
+            from utils.data_loader import fetch_crypto
+            crypto = fetch_crypto(spec['symbol'], start_date)
+            if crypto is None:
+                return None
+            df = crypto[['date'] + list(spec['columns'])].rename(columns=spec['columns'])
+
+        df['date'] = pd.to_datetime(df['date'])
+        if df['date'].dt.tz is not None:
+            df['date'] = df['date'].dt.tz_localize(None)
+        return df
+
+    def _get_series(self, name: str, start_date: str):
+        """Returns (fetched_at, frame) for a series, refreshing it if stale."""
+        start = pd.Timestamp(start_date)
+        cached = self._series.get(name)
+
+        if cached is None and SERIES[name]['source'] == 'yfinance':
+            disk = self._load_disk(name)
+            if disk is not None and not disk[1].empty:
+                cached = (disk[0], disk[1]['date'].iloc[0], disk[1])
+                self._series[name] = cached
+
+        if cached is not None and cached[1] <= start + START_SLACK and self._is_fresh(name, cached[0]):
+            return cached[0], cached[2]
+
+        try:
+            df = self._download(name, start_date)
+        except Exception as e:
+            print(f"  [Macro] {name} download failed: {e}")
+            df = None
+
+        if df is None or df.empty:
+            if cached is not None:
+                print(f"  [Macro] Using stale {name} series")
+                return cached[0], cached[2]
+            return None, None
+
+        # Merge into the cached range: a short request must not shrink the cache
+        if cached is not None:
+            start = min(start, cached[1])
+            df = (pd.concat([cached[2], df], ignore_index=True)
+                  .drop_duplicates('date', keep='last')
+                  .sort_values('date')
+                  .reset_index(drop=True))
+
+        fetched_at = time.time()
+        self._series[name] = (fetched_at, start, df)
+        if SERIES[name]['source'] == 'yfinance':
+            self._save_disk(name, df)
+        return fetched_at, df
+
+    def get(self, start_date: str = "2020-01-01"):
+        """Merged macro frame (date + macro columns), ffilled. None if a series is unavailable."""
+        with self._lock:
+            versions, frames = [], []
+            for name in SERIES:
+                fetched_at, df = self._get_series(name, start_date)
+                if df is None:
+                    print(f"  [Error] Macro series '{name}' unavailable")
+                    return None
+                versions.append(fetched_at)
+                frames.append(df)
+
+            # One outer-merged frame over the full cached range per series version;
+            # each start date is a slice of it (ffill after the slice, as before)
+            versions = tuple(versions)
+            if self._merged is None or self._merged[0] != versions:
+                merged = frames[0]
+                for df in frames[1:]:
+                    merged = pd.merge(merged, df, on='date', how='outer')
+                self._merged = (versions, merged.sort_values('date').reset_index(drop=True))
+                self._frames = {}
+
+            macro = self._frames.get(start_date)
+            if macro is None:
+                merged = self._merged[1]
+                macro = merged[merged['date'] >= pd.Timestamp(start_date)].ffill().reset_index(drop=True)
+                self._frames[start_date] = macro
+            return macro
+
+    def invalidate(self):
+        """Drop the memory layer (disk cache is kept)."""
+        with self._lock:
+            self._series.clear()
+            self._merged = None
+            self._frames = {}
+
+
+# Global instance
+macro_provider = MacroDataProvider()
@@ -0,0 +1,120 @@
+"""
+Model Registry
+Process-wide cache of the trained models on disk, shared by the live trader thread and the
+API handlers (every strategy object built by get_strategy loads through it).
+
+- Keyed by absolute file path; an entry is reused while the file's (mtime, size) is unchanged.
+  When they change, the content hash decides: same bytes (touched / re-downloaded) keep the
+  loaded object, new bytes are loaded again
+- LRU-bounded by entry count and by bytes (the model files' on-disk size)
+- Loaded objects are shared between strategies and must be treated as read-only
+  (training builds new models / scalers and stores them with put())
+"""
+
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = int(os.environ.get("MODEL_CACHE_ENTRIES", 64))
+MAX_BYTES = int(os.environ.get("MODEL_CACHE_MB", 512)) * 1024 * 1024
+
+
+def _stamp(path: str):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_pickle(path: str):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+class ModelRegistry:
+    """LRU cache {path: (stamp, digest, bytes, object)} with mtime / hash invalidation."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {'hits': 0, 'loads': 0, 'reloads': 0, 'revalidated': 0, 'evictions': 0}
+
+    def get(self, path: str, loader=load_pickle):
+        """Object loaded from 'path' by loader(path), from memory while the file is unchanged. None if missing."""
+        path = os.path.abspath(path)
+        with self._lock:
+            try:
+                stamp = _stamp(path)
+            except FileNotFoundError:
+                self._drop(path)
+                return None
+
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self._stats['hits'] += 1
+                return entry[3]
+
+            digest = _digest(path)
+            if entry is not None and entry[1] == digest:
+                # Same bytes under a new mtime: keep the loaded object
+                self._entries[path] = (stamp, digest, entry[2], entry[3])
+                self._entries.move_to_end(path)
+                self._stats['revalidated'] += 1
+                return entry[3]
+
+            obj = loader(path)
+            self._stats['reloads' if entry is not None else 'loads'] += 1
+            self._store(path, stamp, digest, obj)
+            return obj
+
+    def put(self, path: str, obj):
+        """Register an object just written to 'path' (e.g. after training) without reading it back."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._store(path, _stamp(path), _digest(path), obj)
+
+    def invalidate(self, path: str = None):
+        """Forget one path, or everything."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._drop(os.path.abspath(path))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries), 'bytes': self._bytes,
+                    'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+    def _store(self, path, stamp, digest, obj):
+        self._drop(path)
+        self._entries[path] = (stamp, digest, stamp[1], obj)
+        self._bytes += stamp[1]
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            if next(iter(self._entries)) == path:
+                break  # never evict the entry being returned
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= old[2]
+            self._stats['evictions'] += 1
+
+    def _drop(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+
+# Global instance
+model_registry = ModelRegistry()
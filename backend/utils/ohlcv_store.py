@@ -0,0 +1,347 @@
+"""
+OHLCV Store
+Partitioned columnar (Arrow IPC) storage for candle history.
+
+Layout: <root>/<timeframe>/<SYMBOL>/<year>.arrow
+- 'time' is stored as int64 epoch milliseconds (UTC), never re-parsed from text
+- Partitions are uncompressed and memory-mapped on read
+- Range reads only open the yearly partitions that overlap the requested range
+- A sidecar _index.json per symbol/timeframe keeps per-partition first/last/rows/checksum/gaps,
+  so resume points and gap scans never touch the candle data
+"""
+
+import os
+import re
+import glob
+import json
+import zlib
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'store')
+COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+CSV_PATTERN = re.compile(r'^(?P<symbol>.+)_(?P<timeframe>\d+[mhdwM])\.csv$')
+INDEX_FILE = '_index.json'
+TIMEFRAME_UNITS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+
+def safe_symbol(symbol: str) -> str:
+    """'BTC/USDT' -> 'BTC_USDT', 'THYAO.IS' -> 'THYAO_IS' (same naming as the CSV files)."""
+    return symbol.replace('/', '_').replace('.', '_')
+
+
+def to_ms(value):
+    """Normalize str / datetime / Timestamp / epoch-ms to epoch milliseconds (UTC)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value // 1_000_000)
+
+
+def timeframe_ms(timeframe: str):
+    """'1h' -> 3600000. None for calendar-month bars, which have no fixed step."""
+    unit = TIMEFRAME_UNITS.get(timeframe[-1])
+    return int(timeframe[:-1]) * unit if unit else None
+
+
+def _years(time_ms: np.ndarray) -> np.ndarray:
+    return time_ms.astype('datetime64[ms]').astype('datetime64[Y]').astype(np.int64) + 1970
+
+
+class OHLCVStore:
+    """
+    Symbol / timeframe / year partitioned candle store.
+
+    - write(): merges new candles into the yearly partitions (dedup on 'time', last wins),
+      rewriting each touched partition
+    - read(): range read that skips partitions outside [start, end]
+    - import_csv_dir(): one-shot importer for the legacy *_<tf>.csv files
+    - last_timestamp() / gaps() / verify(): answered from the sidecar index
+    """
+
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self._lock = threading.RLock()
+        self._indexes = {}  # (symbol dir, timeframe) -> index dict (validated, replaced on write)
+
+    def _symbol_dir(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, timeframe, safe_symbol(symbol))
+
+    def _partition_path(self, symbol: str, timeframe: str, year: int) -> str:
+        return os.path.join(self._symbol_dir(symbol, timeframe), f"{year}.arrow")
+
+    def years(self, symbol: str, timeframe: str) -> list:
+        """Years that have a partition on disk (sorted)."""
+        files = glob.glob(os.path.join(self._symbol_dir(symbol, timeframe), "*.arrow"))
+        return sorted(int(os.path.basename(f).split('.')[0]) for f in files)
+
+    def symbols(self, timeframe: str) -> list:
+        """All symbols stored for a timeframe (safe names, e.g. 'BTC_USDT')."""
+        tf_dir = os.path.join(self.root, timeframe)
+        if not os.path.isdir(tf_dir):
+            return []
+        return sorted(d for d in os.listdir(tf_dir) if os.path.isdir(os.path.join(tf_dir, d)))
+
+    def has(self, symbol: str, timeframe: str) -> bool:
+        return len(self.years(symbol, timeframe)) > 0
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({c: df[c].to_numpy(dtype=np.int64 if c == 'time' else np.float64)
+                             for c in COLUMNS})
+
+    @staticmethod
+    def _load_partition(path: str, columns=None) -> pa.Table:
+        return feather.read_table(path, columns=columns, memory_map=True)
+
+    @staticmethod
+    def _slice(table: pa.Table, start_ms=None, end_ms=None) -> pa.Table:
+        """Partitions are sorted by time, so a range is a zero-copy slice."""
+        if start_ms is None and end_ms is None:
+            return table
+        times = table.column('time').to_numpy()
+        lo = 0 if start_ms is None else int(np.searchsorted(times, start_ms, side='left'))
+        hi = len(times) if end_ms is None else int(np.searchsorted(times, end_ms, side='right'))
+        return table.slice(lo, hi - lo)
+
+    # --- sidecar index ---
+    def _index_path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self._symbol_dir(symbol, timeframe), INDEX_FILE)
+
+    @staticmethod
+    def _checksum(part: pd.DataFrame) -> int:
+        return zlib.crc32(np.ascontiguousarray(part[COLUMNS].to_numpy(dtype=np.float64)).tobytes())
+
+    @staticmethod
+    def _partition_meta(part: pd.DataFrame, timeframe: str, path: str) -> dict:
+        times = part['time'].to_numpy(dtype=np.int64)
+        meta = {'first': int(times[0]), 'last': int(times[-1]), 'rows': len(times),
+                'crc': OHLCVStore._checksum(part), 'size': os.path.getsize(path), 'gaps': []}
+        step = timeframe_ms(timeframe)
+        if step:
+            holes = np.flatnonzero(np.diff(times) > step)
+            meta['gaps'] = [[int(times[i] + step), int(times[i + 1] - step)] for i in holes]
+        return meta
+
+    def _save_index(self, symbol: str, timeframe: str, index: dict):
+        path = self._index_path(symbol, timeframe)
+        tmp = path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+        self._indexes[(safe_symbol(symbol), timeframe)] = index
+
+    def _newest_current(self, symbol: str, timeframe: str, index: dict) -> bool:
+        """O(1) check of a validated in-memory index: newest partition unchanged and no newer year."""
+        if not index:
+            return False
+        last = int(max(index, key=int))
+        try:
+            size = os.path.getsize(self._partition_path(symbol, timeframe, last))
+        except OSError:
+            return False
+        return size == index[str(last)]['size'] and \
+            not os.path.exists(self._partition_path(symbol, timeframe, last + 1))
+
+    def _load_index(self, symbol: str, timeframe: str) -> dict:
+        """
+        {year(str): meta}. Entries missing or out of date with their partition file are rebuilt.
+        The directory is listed once per series and process; afterwards only the newest partition is checked.
+        """
+        key = (safe_symbol(symbol), timeframe)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None and self._newest_current(symbol, timeframe, index):
+                return index
+            if index is None:
+                try:
+                    with open(self._index_path(symbol, timeframe), 'r') as f:
+                        index = json.load(f)
+                except (OSError, ValueError):
+                    index = {}
+
+            years = {str(y) for y in self.years(symbol, timeframe)}
+            stale = [y for y in years if y not in index or
+                     index[y]['size'] != os.path.getsize(self._partition_path(symbol, timeframe, int(y)))]
+            if stale or set(index) - years:
+                index = {y: meta for y, meta in index.items() if y in years}
+                for y in stale:
+                    path = self._partition_path(symbol, timeframe, int(y))
+                    part = self._load_partition(path).to_pandas()
+                    index[y] = self._partition_meta(part, timeframe, path)
+                self._save_index(symbol, timeframe, index)
+            self._indexes[key] = index
+            return index
+
+    def index(self, symbol: str, timeframe: str) -> dict:
+        """Summary of a series: first/last open time, rows, combined checksum."""
+        index = self._load_index(symbol, timeframe)
+        if not index:
+            return {'first': None, 'last': None, 'rows': 0, 'crc': None}
+        metas = [index[y] for y in sorted(index, key=int)]
+        crc = 0
+        for meta in metas:
+            crc = zlib.crc32(meta['crc'].to_bytes(4, 'little'), crc)
+        return {'first': metas[0]['first'], 'last': metas[-1]['last'],
+                'rows': sum(m['rows'] for m in metas), 'crc': crc}
+
+    def gaps(self, symbol: str, timeframe: str, start=None, end=None) -> list:
+        """
+        Missing [from_ms, to_ms] ranges (inclusive open times) within [start, end].
+        Includes the head/tail ranges when start/end lie outside the stored data.
+        """
+        step = timeframe_ms(timeframe)
+        if not step:
+            return []
+        start_ms, end_ms = to_ms(start), to_ms(end)
+        index = self._load_index(symbol, timeframe)
+        if not index:
+            return [[start_ms, end_ms]] if start_ms is not None and end_ms is not None else []
+
+        ranges, prev_last = [], None
+        for y in sorted(index, key=int):
+            meta = index[y]
+            if prev_last is not None and meta['first'] - prev_last > step:
+                ranges.append([prev_last + step, meta['first'] - step])
+            ranges.extend(meta['gaps'])
+            prev_last = meta['last']
+        first, last = index[min(index, key=int)]['first'], prev_last
+        if start_ms is not None and start_ms < first:
+            ranges.insert(0, [start_ms, first - step])
+        if end_ms is not None and end_ms > last + step:
+            ranges.append([last + step, end_ms])
+
+        clipped = []
+        for lo, hi in ranges:
+            lo = lo if start_ms is None else max(lo, start_ms)
+            hi = hi if end_ms is None else min(hi, end_ms)
+            if lo <= hi:
+                clipped.append([lo, hi])
+        return clipped
+
+    def verify(self, symbol: str, timeframe: str) -> list:
+        """Years whose partition no longer matches the checksum in the index."""
+        bad = []
+        for y, meta in self._load_index(symbol, timeframe).items():
+            part = self._load_partition(self._partition_path(symbol, timeframe, int(y))).to_pandas()
+            if self._checksum(part) != meta['crc'] or len(part) != meta['rows']:
+                bad.append(int(y))
+        return sorted(bad)
+
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        Merge candles into the store. Returns the number of rows added (open times not stored
+        before); rows that replace stored candles are not counted.
+        Arrow IPC files can't be appended in place, so each touched partition is rewritten whole.
+        Partitions are yearly, which bounds one write to a year of candles, and readers keep
+        memory-mapping complete files (os.replace) instead of seeing a half-appended one.
+        """
+        if df is None or df.empty:
+            return 0
+        new = self._normalize(df)
+        years = _years(new['time'].to_numpy())
+
+        with self._lock:
+            os.makedirs(self._symbol_dir(symbol, timeframe), exist_ok=True)
+            index = dict(self._load_index(symbol, timeframe))  # readers keep the previous dict
+            added = 0
+            for year in np.unique(years):
+                part = new[years == year]
+                path = self._partition_path(symbol, timeframe, int(year))
+                if str(year) in index:
+                    existing = self._load_partition(path).to_pandas()
+                    part = pd.concat([existing, part], ignore_index=True)
+                # Overlapping pages are idempotent: one row per open time, newest write wins
+                part = part.drop_duplicates('time', keep='last').sort_values('time', kind='stable')
+                tmp = path + ".tmp"
+                feather.write_feather(pa.Table.from_pandas(part, preserve_index=False), tmp,
+                                      compression='uncompressed')
+                os.replace(tmp, path)
+                added += len(part) - index.get(str(year), {}).get('rows', 0)
+                index[str(year)] = self._partition_meta(part, timeframe, path)
+            self._save_index(symbol, timeframe, index)
+        return added
+
+    def read(self, symbol: str, timeframe: str, start=None, end=None,
+             columns=None, with_date: bool = True) -> pd.DataFrame:
+        """
+        Range read [start, end] (both inclusive). start/end accept str, datetime or epoch ms.
+        Adds a naive UTC 'date' column unless with_date=False.
+        """
+        start_ms, end_ms = to_ms(start), to_ms(end)
+        cols = None if columns is None else ['time'] + [c for c in columns if c != 'time']
+
+        first_year = None if start_ms is None else int(_years(np.array([start_ms]))[0])
+        last_year = None if end_ms is None else int(_years(np.array([end_ms]))[0])
+
+        tables = []
+        for year in self.years(symbol, timeframe):
+            if first_year is not None and year < first_year:
+                continue
+            if last_year is not None and year > last_year:
+                continue
+            table = self._load_partition(self._partition_path(symbol, timeframe, year), cols)
+            tables.append(self._slice(table,
+                                      start_ms if year == first_year else None,
+                                      end_ms if year == last_year else None))
+
+        if tables:
+            table = pa.concat_tables(tables).combine_chunks()
+            df = pd.DataFrame({c: table.column(c).to_numpy() for c in table.column_names})
+        else:
+            df = pd.DataFrame({c: pd.Series(dtype=np.int64 if c == 'time' else np.float64)
+                               for c in (cols or COLUMNS)})
+        if with_date:
+            df['date'] = pd.to_datetime(df['time'].to_numpy(), unit='ms')
+        return df
+
+    def read_many(self, symbols, timeframe: str, start=None, end=None, **kwargs) -> dict:
+        """Read several symbols; symbols without data are left out."""
+        out = {}
+        for sym in symbols:
+            df = self.read(sym, timeframe, start, end, **kwargs)
+            if not df.empty:
+                out[safe_symbol(sym)] = df
+        return out
+
+    def last_timestamp(self, symbol: str, timeframe: str):
+        """Open time (ms) of the newest stored candle, or None (from the sidecar index)."""
+        return self.index(symbol, timeframe)['last']
+
+    def import_csv(self, path: str, symbol: str = None, timeframe: str = None) -> int:
+        """Import one legacy CSV (time in ms + OHLCV columns)."""
+        if symbol is None or timeframe is None:
+            m = CSV_PATTERN.match(os.path.basename(path))
+            if not m:
+                raise ValueError(f"Cannot infer symbol/timeframe from {path}")
+            symbol = symbol or m.group('symbol')
+            timeframe = timeframe or m.group('timeframe')
+        df = pd.read_csv(path)
+        df = df.dropna(subset=['time'])
+        return self.write(symbol, timeframe, df)
+
+    def import_csv_dir(self, csv_dir: str) -> dict:
+        """Import every '<SYMBOL>_<tf>.csv' file in a directory. Returns {(symbol, tf): rows}."""
+        imported = {}
+        for path in sorted(glob.glob(os.path.join(csv_dir, "*.csv"))):
+            m = CSV_PATTERN.match(os.path.basename(path))
+            if not m:
+                continue
+            try:
+                rows = self.import_csv(path, m.group('symbol'), m.group('timeframe'))
+                imported[(m.group('symbol'), m.group('timeframe'))] = rows
+                print(f"  [Store] {m.group('symbol')} {m.group('timeframe')}: {rows} rows")
+            except Exception as e:
+                print(f"  [!] Import failed for {path}: {e}")
+        return imported
+
+
+# Global instance
+store = OHLCVStore()
@@ -0,0 +1,336 @@
+"""
+Omega Features
+Vectorized feature pipeline shared by the omega training, backtest and live scripts.
+
+- add_omega_features(): 1h omega brain inputs (rsi, micro_vol, macro_trend, whale_activity,
+  net_flow_proxy + event columns)
+- add_swing_features(): 4h swing brain inputs (rsi, sma_ratio, volatility + event columns)
+
+Batch mode (tail=None) computes the whole history. Tail mode (tail=N) computes only the
+last N rows from the minimal warm-up window (live loop). Every rolling statistic is reduced
+per window (not with running sums), so tail rows are identical to the batch rows.
+
+omega_panel() / swing_panel() compute the same columns for every symbol of a utils.panel.Panel
+at once: one (time x symbols) running-sum kernel call per indicator (RUNNING), equal to the
+per-symbol columns up to float rounding. For research loops, not for live model inputs.
+
+OMEGA_SET / SWING_SET are the model inputs as utils.feature_store feature sets. Their event
+columns keep the last listed event of each type (what the trained models saw); pass
+combine='max' (a FeatureSet param, so a separate version) to use every event of the calendar.
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+import utils.event_calendar as event_calendar
+from utils.event_calendar import event_engine, EventCalendar
+from utils.feature_store import FeatureSet
+from utils.panel import by_symbol
+
+OMEGA_FEATURES = ['rsi', 'micro_vol', 'macro_trend', 'whale_activity', 'net_flow_proxy']
+SWING_FEATURES = ['rsi', 'sma_ratio', 'volatility']
+WHALE_FACTOR = 2.5
+RSI_WINDOW = 14
+WARMUP = 30  # longest window below (sma_ratio's slow mean); tail mode reads WARMUP extra rows
+RUNNING_BLOCK = 128  # rows per re-anchored block of the running sums (float error grows with the block)
+RUNNING_REFINE = 1e4  # raw / centred sum of squares above which a window is recomputed exactly
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    return np.ascontiguousarray(series, dtype=np.float64)
+
+
+def _rolling(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    """reduce() over each trailing window; NaN for the first window - 1 rows."""
+    out = np.full(len(x), np.nan)
+    if window <= len(x):
+        out[window - 1:] = reduce(sliding_window_view(x, window), axis=1)
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(x, window, np.mean)
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Sample standard deviation (ddof=1), like Series.rolling().std()."""
+    return _rolling(x, window, lambda w, axis: np.std(w, axis=axis, ddof=1))
+
+
+def _columns(x: np.ndarray) -> np.ndarray:
+    """1D or (time x columns) -> (columns x time), contiguous (a no-op view for column-major panels)."""
+    return np.ascontiguousarray(x.reshape(len(x), -1).T)
+
+
+def _drop_nan_windows(body: np.ndarray, nan: np.ndarray, window: int):
+    """
+    NaN into the (columns x windows) results whose window contains a NaN. Leading and trailing
+    NaN runs (warm-up rows, a panel column's padding) are cut off by position; only columns
+    with NaNs between their values pay for a running count.
+    """
+    n = nan.shape[1]
+    lead = np.argmax(~nan, axis=1)
+    trail = np.argmax(~nan[:, ::-1], axis=1)
+    ends = np.arange(n - window + 1)
+    body[(ends < lead[:, None]) | (ends > (n - window - trail)[:, None])] = np.nan
+    inner = np.flatnonzero(nan.sum(axis=1) > lead + trail)  # (an all-NaN column lands here too)
+    if len(inner):
+        count = np.zeros((len(inner), n + 1))
+        np.cumsum(nan[inner], axis=1, out=count[:, 1:])
+        body[inner] = np.where(count[:, window:] > count[:, :-window], np.nan, body[inner])
+
+
+def running_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean along axis 0 (1D or time x columns) from one running sum per column,
+    recentred on the column's first value; windows containing NaN (and the first
+    window - 1 rows) are NaN.
+    """
+    xt = _columns(x)
+    n = xt.shape[1]
+    out = np.full(xt.shape, np.nan)
+    if window <= n:
+        nan = np.isnan(xt)
+        anchor = np.nan_to_num(xt[:, :1])
+        c = np.zeros((len(xt), n + 1))
+        np.subtract(xt, anchor, out=c[:, 1:])
+        np.copyto(c[:, 1:], 0.0, where=nan)
+        np.cumsum(c[:, 1:], axis=1, out=c[:, 1:])
+        body = out[:, window - 1:]
+        np.subtract(c[:, window:], c[:, :-window], out=body)
+        body /= window
+        body += anchor
+        if nan.any():
+            _drop_nan_windows(body, nan, window)
+    return out.T.reshape(x.shape)
+
+
+def running_std(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sample standard deviation (ddof=1) along axis 0 (1D or time x columns) from running sums.
+    Every RUNNING_BLOCK-row block of a column is shifted by its first value and summed on its
+    own, so the float error stays at the level of the local moves; the window - 1 rows a window
+    reaches back into the previous block are shifted to its anchor. Nearly flat windows are
+    recomputed exactly, windows containing NaN (and the first window - 1 rows) are NaN.
+    """
+    xt = _columns(x)
+    m, n = xt.shape
+    out = np.full((m, n), np.nan)
+    if window > n:
+        return out.T.reshape(x.shape)
+
+    block = max(RUNNING_BLOCK, window)  # a window spans at most two blocks
+    nb = -(-n // block)
+    nan = np.isnan(xt)
+    d = np.zeros((m, nb * block))
+    np.copyto(d[:, :n], xt, where=~nan)
+    d = d.reshape(m, nb, block)
+    anchor = d[..., :1].copy()  # (m, nb, 1)
+    d -= anchor
+    k = window - 1 - np.arange(window - 1)  # rows each crossing window reaches into the previous block
+    shift = anchor[:, :-1] - anchor[:, 1:]  # previous anchor relative to the current one
+
+    def window_sums(values):
+        c = np.zeros((m, nb, block + 1))
+        np.cumsum(values, axis=2, out=c[..., 1:])
+        sums = np.empty((m, nb, block))
+        np.subtract(c[..., window:], c[..., :block - window + 1], out=sums[..., window - 1:])
+        np.subtract(c[..., 1:window], c[..., :1], out=sums[..., :window - 1])
+        return sums, c[..., -1:] - c[..., block - window + 1:block]  # (window sums, block tails)
+
+    s1, tail1 = window_sums(d)
+    s2, tail2 = window_sums(np.square(d, out=d))
+    s2[:, 1:, :window - 1] += tail2[:, :-1] + (2 * tail1[:, :-1] + k * shift) * shift
+    s1[:, 1:, :window - 1] += tail1[:, :-1] + k * shift
+
+    s1 = s1.reshape(m, -1)[:, window - 1:n]
+    raw = s2.reshape(m, -1)[:, window - 1:n]
+    ss = out[:, window - 1:]
+    np.subtract(raw, s1 * s1 / window, out=ss)
+    np.maximum(ss, 0.0, out=ss)
+    redo = np.nonzero((raw >= RUNNING_REFINE * ss) & (raw > 0))  # raw == 0: flat on the anchor, exact
+    if len(redo[0]):
+        w = sliding_window_view(xt, window, axis=1)[redo]
+        dev = w - w.mean(axis=1, keepdims=True)
+        ss[redo] = np.einsum('ij,ij->i', dev, dev)
+    ss /= window - 1
+    np.sqrt(ss, out=ss)
+    if nan.any():
+        _drop_nan_windows(ss, nan, window)
+    return out.T.reshape(x.shape)
+
+
+# (mean, std) window reductions: PER_WINDOW reduces every window on its own (tail rows equal the
+# batch rows); RUNNING uses running sums along axis 0, one call for a whole (time x symbols) panel
+PER_WINDOW = (rolling_mean, rolling_std)
+RUNNING = (running_mean, running_std)
+
+
+def omega_rsi(close: np.ndarray, window: int = RSI_WINDOW, kernels=PER_WINDOW) -> np.ndarray:
+    """mean(gains) / mean(|changes|) * 100 over 'window' changes; 50 where undefined."""
+    mean = kernels[0]
+    diff = np.diff(close, axis=0, prepend=np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = mean(np.maximum(diff, 0.0), window) / mean(np.abs(diff), window) * 100
+    return np.where(np.isnan(rsi), 50.0, rsi)
+
+
+def whale_activity(volume: np.ndarray, factor: float = WHALE_FACTOR, kernels=PER_WINDOW) -> np.ndarray:
+    """1 when volume exceeds 'factor' x its 24-bar mean."""
+    with np.errstate(invalid='ignore'):
+        return (volume > kernels[0](volume, 24) * factor).astype(int)
+
+
+def volatility_index(close: np.ndarray, window: int = 20, kernels=PER_WINDOW) -> np.ndarray:
+    """Rolling std / rolling mean in percent."""
+    mean, std = kernels
+    return std(close, window) / mean(close, window) * 100
+
+
+_calendars = {event_engine.combine: event_engine}
+
+
+def event_features(index: pd.Index, combine: str = 'last') -> pd.DataFrame:
+    """Event proximity columns (event_*) for a DatetimeIndex; tz-aware stamps are taken in UTC."""
+    dates = pd.DatetimeIndex(index)
+    if dates.tz is not None:
+        dates = dates.tz_convert(None)
+    calendar = _calendars.get(combine)
+    if calendar is None:
+        calendar = _calendars.setdefault(combine, EventCalendar(event_engine.path, event_engine.window,
+                                                                combine=combine))
+    events = calendar.get_event_features(dates)
+    events.index = index
+    return events
+
+
+def omega_columns(close: np.ndarray, volume: np.ndarray, open_: np.ndarray = None,
+                  whale_factor: float = WHALE_FACTOR, fill: bool = True, kernels=PER_WINDOW) -> dict:
+    """The omega indicator columns (without macro_trend from a daily series, without events)."""
+    mean, std = kernels
+    micro_vol = std(close, 4)
+    macro_trend = mean(close, 24)
+    whale = whale_activity(volume, whale_factor, kernels)
+    return {
+        'rsi': omega_rsi(close, kernels=kernels),
+        'micro_vol': np.nan_to_num(micro_vol, nan=0.0) if fill else micro_vol,
+        'macro_trend': np.where(np.isnan(macro_trend), close, macro_trend) if fill else macro_trend,
+        'whale_activity': whale,
+        'net_flow_proxy': (close - open_) * whale if open_ is not None else np.zeros(close.shape),
+    }
+
+
+def swing_columns(close: np.ndarray, kernels=PER_WINDOW) -> dict:
+    """The 4h swing indicator columns (without events)."""
+    mean = kernels[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sma_ratio = mean(close, 10) / mean(close, 30)
+    return {
+        'rsi': omega_rsi(close, kernels=kernels),
+        'sma_ratio': np.where(np.isnan(sma_ratio), 1.0, sma_ratio),
+        'volatility': volatility_index(close, kernels=kernels),
+    }
+
+
+def omega_panel(panel, whale_factor: float = WHALE_FACTOR, fill: bool = True) -> dict:
+    """omega_columns() for every symbol of a Panel, one pass per indicator: {column: (time x symbols) array}."""
+    return by_symbol(lambda close, volume, open_: omega_columns(close, volume, open_, whale_factor, fill, RUNNING),
+                     panel['close'], panel['volume'], panel['open'], valid=panel.layout)
+
+
+def swing_panel(panel) -> dict:
+    """swing_columns() for every symbol of a Panel, one pass per indicator: {column: (time x symbols) array}."""
+    return by_symbol(lambda close: swing_columns(close, RUNNING), panel['close'], valid=panel.layout)
+
+
+def volatility_panel(panel, window: int = 20) -> np.ndarray:
+    """volatility_index() for every symbol of a Panel, (time x symbols)."""
+    return by_symbol(lambda close: volatility_index(close, window, RUNNING), panel['close'], valid=panel.layout)
+
+
+def symbol_features(panel, symbol: str, columns: dict, events: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    One symbol's frame (OHLCV + panel columns), like add_omega_features / add_swing_features on
+    that symbol alone. Pass events=event_features(panel.index) to compute them once per panel.
+    """
+    j = panel.symbols.index(symbol)
+    rows = np.flatnonzero(panel.valid[:, j])
+    arrays = {**panel.fields, **columns}
+    names = list(arrays) + (list(events.columns) if events is not None else [])
+    # one column-major float block: contiguous column writes and no consolidation copy in pandas
+    block = np.empty((len(rows), len(names)), order='F')
+    for k, values in enumerate(arrays.values()):
+        block[:, k] = values[rows, j]
+    if events is not None:
+        for k, values in enumerate(events.to_numpy(dtype=np.float64).T, start=len(arrays)):
+            block[:, k] = values[rows]
+    df = pd.DataFrame(block, index=panel.index[rows], columns=names)
+    if 'whale_activity' in df:
+        df['whale_activity'] = df['whale_activity'].astype(int)
+    return df
+
+
+def _window(df: pd.DataFrame, tail: int = None) -> pd.DataFrame:
+    return df if tail is None else df.iloc[-(tail + WARMUP):]
+
+
+def add_omega_features(df: pd.DataFrame, whale_factor: float = WHALE_FACTOR, daily_close: pd.Series = None,
+                       fill: bool = True, events: bool = True, tail: int = None,
+                       combine: str = 'last') -> pd.DataFrame:
+    """
+    Copy of a DatetimeIndex-ed OHLCV frame (tail mode: its last 'tail' rows) with the omega columns.
+
+    - daily_close: macro_trend from the forward-filled daily close instead of the 24-bar mean
+    - fill: micro_vol / macro_trend warm-up filled (0 / close) instead of NaN
+    - frames without 'open' (e.g. stock quotes) get net_flow_proxy = 0
+    - combine: how repeated event types are merged (utils.event_calendar.EventCalendar)
+    """
+    out = _window(df, tail).copy()
+    open_ = _values(out['open']) if 'open' in out.columns else None
+    columns = omega_columns(_values(out['close']), _values(out['volume']), open_, whale_factor, fill)
+    if daily_close is not None:
+        columns['macro_trend'] = daily_close.reindex(out.index, method='ffill')
+    for name, values in columns.items():
+        out[name] = values
+
+    if events:
+        out = pd.concat([out, event_features(out.index, combine)], axis=1)
+    return out if tail is None else out.iloc[-tail:]
+
+
+def add_swing_features(df: pd.DataFrame, events: bool = True, tail: int = None,
+                       combine: str = 'last') -> pd.DataFrame:
+    """Copy of a DatetimeIndex-ed OHLCV frame (tail mode: its last 'tail' rows) with the 4h swing columns."""
+    out = _window(df, tail).copy()
+    for name, values in swing_columns(_values(out['close'])).items():
+        out[name] = values
+
+    if events:
+        out = pd.concat([out, event_features(out.index, combine)], axis=1)
+    return out if tail is None else out.iloc[-tail:]
+
+
+def feature_columns(df: pd.DataFrame, base: list = OMEGA_FEATURES) -> list:
+    """Model input columns: the base features followed by the event columns present in df."""
+    return list(base) + [col for col in df.columns if col.startswith('event_')]
+
+
+def omega_frame(df: pd.DataFrame, whale_factor: float = WHALE_FACTOR, fill: bool = True,
+                combine: str = 'last') -> pd.DataFrame:
+    """Only the omega model inputs of add_omega_features() (feature store function)."""
+    out = add_omega_features(df, whale_factor, fill=fill, combine=combine)
+    return out[feature_columns(out)]
+
+
+def swing_frame(df: pd.DataFrame, combine: str = 'last') -> pd.DataFrame:
+    """Only the swing model inputs of add_swing_features() (feature store function)."""
+    out = add_swing_features(df, combine=combine)
+    return out[feature_columns(out, SWING_FEATURES)]
+
+
+# Every row depends on the last WARMUP candles only, so appended rows equal a full rebuild.
+# (macro_trend from a daily close is left out: it changes while the day is still open.)
+_CODE = (sys.modules[__name__], event_calendar, event_engine.path)  # event dates are part of the version
+OMEGA_SET = FeatureSet('omega', omega_frame, warmup=WARMUP, code=_CODE)
+SWING_SET = FeatureSet('swing', swing_frame, warmup=WARMUP, code=_CODE)
@@ -0,0 +1,205 @@
+"""
+Symbol Panel
+Time x symbols arrays for cross-sectional indicator passes and multi-asset backtest loops.
+
+- panel_from_store(): one NaN-padded (time x symbols) float array per OHLCV field, on the
+  union of all bar times, read from the OHLCV store (or the resampler for derived timeframes)
+- panel_from_frames(): the same for numeric columns (close, signals, confidences, ...) of
+  frames on a DatetimeIndex; with a timeframe, bars outside each symbol's exchange sessions
+  are dropped from the timeline
+- by_symbol(): runs an axis-0 kernel (e.g. omega_features' RUNNING running sums) on every
+  symbol in one call. Each column is first compacted to the symbol's own bars, so listing
+  gaps and market closures give the same values as one series per symbol.
+- Panel.layout caches the compaction for repeated by_symbol() calls on one panel.
+- Panel.valid marks the bars each symbol has; sessions() marks the hours its exchange trades
+  (utils.trading_calendar), so mixed crypto / stock loops test a boolean instead of
+  'ts in df.index', and last_valid() gives as-of rows instead of ffilled copies
+"""
+
+import numpy as np
+import pandas as pd
+from utils.ohlcv_store import store
+from utils.trading_calendar import CALENDARS, market_for
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class Panel:
+    """NaN-padded arrays (time x symbols) on a shared DatetimeIndex."""
+
+    def __init__(self, index: pd.DatetimeIndex, symbols: list, fields: dict, valid: np.ndarray = None):
+        self.index = index
+        self.symbols = list(symbols)
+        self.fields = fields
+        # bars that exist for each symbol
+        self.valid = ~np.isnan(fields['close']) if valid is None else valid
+
+    @property
+    def layout(self) -> 'Layout':
+        """by_symbol() positions for 'valid', built once per panel."""
+        if getattr(self, '_layout', None) is None:
+            self._layout = Layout(self.valid)
+        return self._layout
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    def frame(self, field: str) -> pd.DataFrame:
+        return pd.DataFrame(self.fields[field], index=self.index, columns=self.symbols)
+
+    @property
+    def markets(self) -> list:
+        return [market_for(sym) for sym in self.symbols]
+
+    def sessions(self, timeframe: str = '1h') -> np.ndarray:
+        """(time x symbols) mask of the bars inside each symbol's exchange sessions."""
+        markets = np.array(self.markets, dtype=object)
+        out = np.zeros((len(self.index), len(self.symbols)), dtype=bool)
+        for market in set(self.markets):
+            out[:, markets == market] = CALENDARS[market].is_open(self.index, timeframe)[:, None]
+        return out
+
+    def last_valid(self) -> np.ndarray:
+        """(time x symbols) row of each symbol's latest bar at or before every time, -1 before its first."""
+        rows = np.where(self.valid, np.arange(len(self.index))[:, None], -1)
+        return np.maximum.accumulate(rows, axis=0) if len(rows) else rows
+
+    def last(self, field: str, symbol: str) -> float:
+        """Value of 'field' at the symbol's last bar."""
+        j = self.symbols.index(symbol)
+        return self.fields[field][np.flatnonzero(self.valid[:, j])[-1], j]
+
+    def best(self, score: np.ndarray, eligible: np.ndarray = True) -> np.ndarray:
+        """
+        Column of the highest positive score among the valid, eligible symbols per row (-1 if none).
+        Ties go to the first symbol, as in a 'score > best' scan in symbol order.
+        """
+        with np.errstate(invalid='ignore'):
+            picked = np.where(self.valid & eligible & (score > 0), score, 0.0)
+        if not picked.size:
+            return np.full(len(self.index), -1)
+        cols = picked.argmax(axis=1)
+        cols[picked[np.arange(len(picked)), cols] <= 0] = -1
+        return cols
+
+    def coverage(self, timeframe: str = '1h') -> pd.DataFrame:
+        """Per market: symbols, bars, session bars on the timeline, and bars outside the sessions."""
+        sessions = self.sessions(timeframe)
+        markets = np.array(self.markets, dtype=object)
+        rows = []
+        for market in sorted(set(self.markets)):
+            cols = markets == market
+            rows.append({'market': market, 'symbols': int(cols.sum()),
+                         'bars': int(self.valid[:, cols].sum()),
+                         'session_bars': int(sessions[:, cols].sum()),
+                         'off_session': int((self.valid[:, cols] & ~sessions[:, cols]).sum())})
+        return pd.DataFrame(rows).set_index('market') if rows else pd.DataFrame()
+
+
+def _assemble(keys: list, frames: list, fields) -> tuple:
+    """Scatter each frame's columns onto the sorted union of the int64 time keys."""
+    times = np.unique(np.concatenate(keys))
+    # column-major: each symbol's column is contiguous, for the scatter here and per-symbol reads
+    data = {f: np.full((len(times), len(frames)), np.nan, order='F') for f in fields}
+    valid = np.zeros((len(times), len(frames)), dtype=bool)
+    for j, (key, df) in enumerate(zip(keys, frames)):
+        rows = np.searchsorted(times, key)
+        valid[rows, j] = True
+        for f in fields:
+            data[f][rows, j] = df[f].to_numpy(dtype=np.float64)
+    return times, data, valid
+
+
+def _empty(fields) -> Panel:
+    return Panel(pd.DatetimeIndex([]), [], {f: np.empty((0, 0)) for f in fields}, valid=np.empty((0, 0), dtype=bool))
+
+
+def panel_from_store(symbols: list, timeframe: str = '1h', start=None, end=None, source=store,
+                     fields=FIELDS) -> Panel:
+    """Read 'symbols' from 'source' (OHLCVStore or Resampler) into one Panel; empty series are left out."""
+    frames = {}
+    for sym in symbols:
+        df = source.read(sym, timeframe, start, end, with_date=False)
+        if not df.empty:
+            frames[sym] = df
+    if not frames:
+        return _empty(fields)
+    keys = [df['time'].to_numpy(dtype=np.int64) for df in frames.values()]
+    times, data, valid = _assemble(keys, list(frames.values()), fields)
+    return Panel(pd.DatetimeIndex(times.astype('datetime64[ms]')), list(frames), data, valid)
+
+
+def panel_from_frames(frames: dict, fields=('close',), timeframe: str = None) -> Panel:
+    """
+    {symbol: DataFrame on a DatetimeIndex} -> Panel of the given numeric columns. valid marks the
+    rows each frame has (even where a value is NaN), i.e. 'ts in df.index' on the union timeline.
+    timeframe: bars outside the symbol's exchange sessions (stale or extended-hours quotes) are
+    invalid, and times where no symbol trades leave the timeline.
+    """
+    frames = {sym: df for sym, df in frames.items() if not df.empty}
+    if not frames:
+        return _empty(fields)
+    keys = [pd.DatetimeIndex(df.index).as_unit('ns').asi8 for df in frames.values()]
+    times, data, valid = _assemble(keys, list(frames.values()), fields)
+    panel = Panel(pd.DatetimeIndex(times.view('datetime64[ns]')), list(frames), data, valid)
+    if timeframe is None:
+        return panel
+    valid &= panel.sessions(timeframe)
+    rows = valid.any(axis=1)
+    for f in fields:
+        data[f] = np.where(valid, data[f], np.nan)[rows]
+    return Panel(panel.index[rows], panel.symbols, data, valid[rows])
+
+
+class Layout:
+    """
+    Flat positions mapping a (time x symbols) mask onto per-symbol compacted columns: each
+    column holds that symbol's own bars first (listing gaps and market closures squeezed out),
+    then NaN padding up to the longest one.
+    """
+
+    def __init__(self, valid: np.ndarray):
+        self.shape = valid.shape
+        height, width = valid.shape
+        cols, rows = np.nonzero(valid.T)  # column by column, so ranks are positions within a column
+        counts = np.bincount(cols, minlength=width)
+        self.length = int(counts.max()) if width else 0
+        ranks = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        self.cells = rows * width + cols  # flat positions on the panel (row-major)
+        self.column_cells = cols * height + rows  # the same, column-major
+        self.compacted = cols * self.length + ranks  # flat positions on the compacted columns (column-major)
+
+    def compact(self, a: np.ndarray) -> np.ndarray:
+        """(length x symbols) array, columns contiguous for axis-0 kernels."""
+        width = self.shape[1]
+        out = np.full(width * self.length, np.nan)
+        if a.flags.f_contiguous and not a.flags.c_contiguous:
+            out[self.compacted] = a.T.ravel()[self.column_cells]
+        else:
+            out[self.compacted] = np.ascontiguousarray(a, dtype=np.float64).ravel()[self.cells]
+        return out.reshape(width, self.length).T
+
+    def scatter(self, values: np.ndarray) -> np.ndarray:
+        """
+        Compacted columns back onto the panel, NaN outside the mask. The result is column-major
+        (Fortran order), so per-symbol reads like values[rows, j] stay contiguous.
+        """
+        height, width = self.shape
+        out = np.full(height * width, np.nan)
+        out[self.column_cells] = np.asfortranarray(values, dtype=np.float64).T.ravel()[self.compacted]
+        return out.reshape(width, height).T
+
+
+def by_symbol(kernel, *arrays: np.ndarray, valid):
+    """
+    kernel(*arrays) evaluated per column over that column's valid rows only, in one call.
+    Each column is compacted to its own bars (see Layout), so a kernel that works along axis 0
+    and gives NaN for windows containing NaN sees every symbol as a series of its own.
+    valid: (time x symbols) mask, or a Layout built from one (Panel.layout) to reuse it.
+    Returns an array (or a dict of arrays) shaped like 'valid', NaN outside it.
+    """
+    layout = valid if isinstance(valid, Layout) else Layout(valid)
+    result = kernel(*(layout.compact(a) for a in arrays))
+    if isinstance(result, dict):
+        return {name: layout.scatter(values) for name, values in result.items()}
+    return layout.scatter(result)
@@ -0,0 +1,87 @@
+"""
+Single-Pass Predictor
+Class, confidence and explanation from ONE predict_proba evaluation (instead of predict() followed
+by predict_proba(), which walks a tree ensemble twice for the same row).
+
+- predictor_for(model, feature_names): one Predictor per loaded model object and feature names
+  (weakly cached by model); the explanation (feature importances, ranked) is computed there
+  once, not on every call
+- Predictions match model.predict(), including its tie rule at p = 0.5
+"""
+
+import threading
+import weakref
+import numpy as np
+
+
+class Predictor:
+    """Wraps a fitted classifier: predict() -> (prediction, confidence %, probability row)."""
+
+    def __init__(self, model, feature_names=None):
+        self.model = model
+        self.classes = np.asarray(model.classes_)
+        # predict() at an exact tie: binary GradientBoosting takes the positive class (raw >= 0),
+        # RandomForest / XGBoost the first one (argmax)
+        self._tie_positive = type(model).__name__ == "GradientBoostingClassifier" and len(self.classes) == 2
+
+        try:
+            importances = np.asarray(model.feature_importances_, dtype=np.float64)
+        except (AttributeError, ValueError):
+            importances = None
+        if importances is not None and feature_names is None:
+            feature_names = [f"f{i}" for i in range(len(importances))]
+        self.importances = dict(zip(feature_names, importances)) if importances is not None else {}
+        # Stable sort: equal importances keep column order (same pick as max(importances, key=...))
+        self.ranked = sorted(self.importances, key=self.importances.get, reverse=True)
+
+    @property
+    def top_feature(self):
+        return self.ranked[0] if self.ranked else None
+
+    def top_features(self, k: int = 3):
+        return self.ranked[:k]
+
+    def decide(self, probability):
+        """(prediction, confidence %) from one predict_proba row."""
+        probability = np.asarray(probability)
+        k = int(np.argmax(probability))
+        if self._tie_positive and probability[1] == probability[0]:
+            k = 1
+        return self.classes[k], probability[k] * 100
+
+    def decide_many(self, probability):
+        """(predictions, confidences %) arrays from a predict_proba matrix."""
+        probability = np.asarray(probability)
+        k = probability.argmax(axis=1)
+        if self._tie_positive:
+            k[probability[:, 1] == probability[:, 0]] = 1
+        return self.classes[k], probability[np.arange(len(k)), k] * 100
+
+    def predict(self, X):
+        """First row of X: (prediction, confidence %, probability row) from a single predict_proba."""
+        probability = self.model.predict_proba(X)[0]
+        prediction, confidence = self.decide(probability)
+        return prediction, confidence, probability
+
+
+_predictors = weakref.WeakKeyDictionary()  # model -> {feature names or None: Predictor}
+_lock = threading.Lock()
+
+
+def predictor_for(model, feature_names=None) -> Predictor:
+    """
+    Cached Predictor of a model object and its feature names (a reloaded model is a new
+    object -> new explanation; names given later get their own, named explanation).
+    """
+    names = tuple(feature_names) if feature_names is not None else None
+    with _lock:
+        try:
+            by_names = _predictors.get(model)
+        except TypeError:  # not weak-referenceable
+            return Predictor(model, feature_names)
+        if by_names is None:
+            by_names = _predictors[model] = {}
+        predictor = by_names.get(names)
+        if predictor is None:
+            predictor = by_names[names] = Predictor(model, names)
+        return predictor
@@ -0,0 +1,109 @@
+"""
+Market Regimes
+Vectorized bull / bear / sideways labels for every row and an index of regime segments.
+
+- market_modes(): the AdaptiveAIStrategy.detect_market_mode rule evaluated for every row
+  in one pass over the (rows x window) view of the closes (same arithmetic as the
+  per-window pandas mean / std, so the labels are identical)
+- RegimeSegments: runs of equal regime (start, end, mode); mask() / rows() give the rows
+  of a regime for building per-mode training sets or routing rows to per-mode models
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+MODES = ("bull", "bear", "sideways")
+BULL, BEAR, SIDEWAYS = range(3)
+
+
+def market_modes(close, window: int = 20, trend_threshold: float = 5.0, vol_threshold: float = 10.0,
+                 trend_periods: int = None) -> np.ndarray:
+    """
+    Regime code per row (BULL / BEAR / SIDEWAYS) from the last 'window' closes:
+    trend % over 'trend_periods' bars (default window - 1: first to last close of the window)
+    and volatility = std (ddof=1) / mean in %. Bull: trend > threshold and volatility below
+    vol_threshold; bear: trend < -threshold likewise; sideways otherwise and before a full window.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    n = len(close)
+    trend_periods = window - 1 if trend_periods is None else trend_periods
+    codes = np.full(n, SIDEWAYS, dtype=np.int8)
+    if n < window or n <= trend_periods:
+        return codes
+
+    # pandas Series.mean() / std(): sum / count, then the sum of squared deviations from it
+    windows = sliding_window_view(close, window)
+    mean = np.full(n, np.nan)
+    volatility = np.full(n, np.nan)
+    trend = np.full(n, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean[window - 1:] = windows.sum(axis=1) / window
+        deviations = (mean[window - 1:, None] - windows) ** 2
+        volatility[window - 1:] = np.sqrt(deviations.sum(axis=1) / (window - 1)) / mean[window - 1:] * 100
+        first = close[:n - trend_periods]
+        trend[trend_periods:] = (close[trend_periods:] - first) / first * 100
+
+    calm = volatility < vol_threshold
+    codes[(trend > trend_threshold) & calm] = BULL
+    codes[(trend < -trend_threshold) & calm] = BEAR
+    return codes
+
+
+class RegimeSegments:
+    """Runs of equal regime over a frame's rows: starts / ends (exclusive) / codes arrays."""
+
+    def __init__(self, codes: np.ndarray, index: pd.Index = None):
+        codes = np.asarray(codes, dtype=np.int8)
+        self.length = len(codes)
+        self.index = index
+        breaks = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        self.starts = np.r_[0, breaks] if self.length else np.empty(0, dtype=np.int64)
+        self.ends = np.r_[breaks, self.length] if self.length else np.empty(0, dtype=np.int64)
+        self.codes = codes[self.starts]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, **params) -> 'RegimeSegments':
+        """Segments of market_modes(df['close'], **params) on the frame's index."""
+        return cls(market_modes(df['close'], **params), df.index)
+
+    def labels(self) -> np.ndarray:
+        """Per-row regime codes."""
+        return np.repeat(self.codes, self.ends - self.starts)
+
+    def modes(self) -> pd.Series:
+        """Per-row regime names on the frame index."""
+        return pd.Series(np.array(MODES, dtype=object)[self.labels()], index=self.index)
+
+    def segments(self, mode: str) -> list:
+        """[(start, end)] row ranges of one regime."""
+        picked = self.codes == MODES.index(mode)
+        return list(zip(self.starts[picked].tolist(), self.ends[picked].tolist()))
+
+    def mask(self, mode: str) -> np.ndarray:
+        """Boolean row mask of one regime."""
+        return self.labels() == MODES.index(mode)
+
+    def rows(self, mode: str) -> np.ndarray:
+        """Row positions of one regime."""
+        return np.flatnonzero(self.mask(mode))
+
+    def counts(self) -> dict:
+        sizes = self.ends - self.starts
+        return {mode: int(sizes[self.codes == code].sum()) for code, mode in enumerate(MODES)}
+
+    def current(self) -> str:
+        """Regime of the last row."""
+        return MODES[self.codes[-1]] if self.length else "sideways"
+
+
+# Hourly regime rule of the multi-asset scripts: 20-bar trend and volatility, looser for stocks
+CRYPTO_THRESHOLDS = (1.0, 2.0)  # (trend %, volatility %)
+STOCK_THRESHOLDS = (0.5, 1.0)
+
+
+def hourly_regimes(df: pd.DataFrame, crypto: bool = True) -> RegimeSegments:
+    """Segments for train_gpu / backtest_world / backtest_sniper (trend = pct_change(20))."""
+    trend_threshold, vol_threshold = CRYPTO_THRESHOLDS if crypto else STOCK_THRESHOLDS
+    return RegimeSegments.from_frame(df, window=20, trend_periods=20,
+                                     trend_threshold=trend_threshold, vol_threshold=vol_threshold)
@@ -0,0 +1,128 @@
+"""
+OHLCV Resampler
+Builds higher-timeframe bars (4h, 1d, 1w, ...) from the 1h base series in the OHLCV store.
+
+- Buckets are aligned like Binance klines: UTC midnight for intraday/daily, Monday 00:00 UTC for weekly
+- Derived bars are cached in their own store (data/derived) and updated incrementally:
+  only the last (possibly still open) bucket and the newer base bars are re-aggregated
+- No network I/O: the base series is kept current by fetch_crypto / fetch_full_history
+"""
+
+import os
+import threading
+import numpy as np
+import pandas as pd
+from utils.ohlcv_store import OHLCVStore, store, COLUMNS, STORE_DIR
+
+DERIVED_DIR = os.path.join(os.path.dirname(STORE_DIR), 'derived')
+HOUR_MS = 3_600_000
+DAY_MS = 24 * HOUR_MS
+
+TIMEFRAME_MS = {
+    '1h': HOUR_MS, '2h': 2 * HOUR_MS, '4h': 4 * HOUR_MS, '6h': 6 * HOUR_MS,
+    '8h': 8 * HOUR_MS, '12h': 12 * HOUR_MS, '1d': DAY_MS, '1w': 7 * DAY_MS,
+}
+# 1970-01-01 was a Thursday; weekly buckets start on Monday
+BUCKET_OFFSET_MS = {'1w': 4 * DAY_MS}
+
+
+def bucket_start(time_ms: np.ndarray, timeframe: str) -> np.ndarray:
+    """Open time (ms) of the 'timeframe' bucket containing each timestamp."""
+    size = TIMEFRAME_MS[timeframe]
+    offset = BUCKET_OFFSET_MS.get(timeframe, 0)
+    return (time_ms - offset) // size * size + offset
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Aggregate time-sorted OHLCV rows ('time' in epoch ms) into 'timeframe' bars.
+    open=first, high=max, low=min, close=last, volume=sum. Returns store columns only.
+    """
+    if df.empty:
+        return pd.DataFrame({c: pd.Series(dtype=np.int64 if c == 'time' else np.float64) for c in COLUMNS})
+
+    buckets = bucket_start(df['time'].to_numpy(dtype=np.int64), timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+
+    return pd.DataFrame({
+        'time': buckets[starts],
+        'open': df['open'].to_numpy(dtype=np.float64)[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(dtype=np.float64), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(dtype=np.float64), starts),
+        'close': df['close'].to_numpy(dtype=np.float64)[ends],
+        'volume': np.add.reduceat(df['volume'].to_numpy(dtype=np.float64), starts),
+    })
+
+
+class Resampler:
+    """
+    Derived-timeframe cache on top of the base OHLCV store.
+
+    - sync(): brings a derived series up to date with the base series
+    - read(): sync + range read, same shape as OHLCVStore.read()
+    - rebuild(): re-aggregates the whole base history (e.g. after backfilling older base bars)
+    """
+
+    def __init__(self, base_store: OHLCVStore = store, derived_root: str = DERIVED_DIR,
+                 base_timeframe: str = '1h'):
+        self.base = base_store
+        self.derived = OHLCVStore(derived_root)
+        self.base_timeframe = base_timeframe
+        self._synced = {}  # (symbol, timeframe) -> base last_timestamp at last sync
+        self._lock = threading.Lock()
+
+    def _check(self, timeframe: str):
+        if timeframe not in TIMEFRAME_MS:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        if TIMEFRAME_MS[timeframe] % TIMEFRAME_MS[self.base_timeframe]:
+            raise ValueError(f"{timeframe} is not a multiple of {self.base_timeframe}")
+
+    def sync(self, symbol: str, timeframe: str) -> int:
+        """Re-aggregate the base bars newer than the last derived bucket. Returns bars added."""
+        self._check(timeframe)
+        base_last = self.base.last_timestamp(symbol, self.base_timeframe)
+        if base_last is None:
+            return 0
+
+        with self._lock:
+            if self._synced.get((symbol, timeframe)) == base_last:
+                return 0
+            # The last derived bucket may have been built from a partial (open) bucket
+            since = self.derived.last_timestamp(symbol, timeframe)
+            base = self.base.read(symbol, self.base_timeframe, start=since, with_date=False)
+            bars = resample_ohlcv(base, timeframe)
+            written = self.derived.write(symbol, timeframe, bars)
+            self._synced[(symbol, timeframe)] = base_last
+        return written
+
+    def rebuild(self, symbol: str, timeframe: str) -> int:
+        """Full re-aggregation from the base history."""
+        self._check(timeframe)
+        with self._lock:
+            base = self.base.read(symbol, self.base_timeframe, with_date=False)
+            written = self.derived.write(symbol, timeframe, resample_ohlcv(base, timeframe))
+            self._synced[(symbol, timeframe)] = self.base.last_timestamp(symbol, self.base_timeframe)
+        return written
+
+    def read(self, symbol: str, timeframe: str, start=None, end=None, **kwargs) -> pd.DataFrame:
+        """Derived bars in [start, end]; the base timeframe is passed straight through."""
+        if timeframe == self.base_timeframe:
+            return self.base.read(symbol, timeframe, start, end, **kwargs)
+        self.sync(symbol, timeframe)
+        return self.derived.read(symbol, timeframe, start, end, **kwargs)
+
+    def symbols(self, timeframe: str) -> list:
+        """
+        Symbols readable at 'timeframe' (safe names): every symbol of the base store,
+        derived on demand by read(), plus derived series whose base history is gone.
+        """
+        self._check(timeframe)
+        base = self.base.symbols(self.base_timeframe)
+        if timeframe == self.base_timeframe:
+            return base
+        return sorted(set(base) | set(self.derived.symbols(timeframe)))
+
+
+# Global instance
+resampler = Resampler()
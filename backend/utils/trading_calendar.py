@@ -0,0 +1,108 @@
+"""
+Trading Calendars
+Exchange sessions for mixed crypto / stock universes.
+
+- MarketCalendar: weekly sessions in the exchange's local time (DST-aware), with dated
+  session changes (eras). is_open() tells for every bar whether it overlaps a session
+  (utils.panel drops off-session bars from the backtest timelines with it);
+  session_bars() lists the bar times a market trades, without reading any data
+- market_for(): exchange of a symbol, from the store / CSV naming ('BTC/USDT', 'THYAO.IS',
+  'THYAO_IS', '7203.T', '0700.HK', 'AAPL')
+
+Exchange holidays are not listed: a weekday without bars is simply a missing bar.
+"""
+
+import numpy as np
+import pandas as pd
+from utils.ohlcv_store import timeframe_ms
+
+WEEKDAYS = (0, 1, 2, 3, 4)
+ALL_DAYS = (0, 1, 2, 3, 4, 5, 6)
+
+
+def _minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+class MarketCalendar:
+    """
+    sessions: (('09:30', '16:00'), ...) local open/close times (close exclusive);
+    eras: [(since date, sessions)] replacing the sessions from that local date on.
+    """
+
+    def __init__(self, name: str, tz: str = 'UTC', sessions=(('00:00', '24:00'),), weekdays=WEEKDAYS,
+                 eras=()):
+        self.name = name
+        self.tz = tz
+        self.weekdays = tuple(weekdays)
+        self.eras = [(None, self._parse(sessions))]
+        self.eras += [(pd.Timestamp(since), self._parse(s)) for since, s in eras]
+
+    @staticmethod
+    def _parse(sessions) -> list:
+        return [(_minutes(start), _minutes(end)) for start, end in sessions]
+
+    @property
+    def always_open(self) -> bool:
+        return len(self.weekdays) == 7 and all(s == [(0, 1440)] for _, s in self.eras)
+
+    def _local(self, times: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        """Naive UTC (or tz-aware) times -> exchange local time."""
+        times = pd.DatetimeIndex(times)
+        if times.tz is None:
+            times = times.tz_localize('UTC')
+        return times.tz_convert(self.tz)
+
+    def is_open(self, times, timeframe: str = None) -> np.ndarray:
+        """True where the bar [t, t + timeframe) overlaps a session (the instant t without a timeframe)."""
+        times = pd.DatetimeIndex(times)
+        if self.always_open:
+            return np.ones(len(times), dtype=bool)
+        local = self._local(times)
+        minute = local.hour.to_numpy() * 60 + local.minute.to_numpy()
+        length = timeframe_ms(timeframe) // 60000 if timeframe else 0
+        day_ok = np.isin(local.dayofweek.to_numpy(), self.weekdays)
+
+        out = np.zeros(len(times), dtype=bool)
+        naive_local = local.tz_localize(None)
+        for k, (since, sessions) in enumerate(self.eras):
+            era = np.ones(len(times), dtype=bool) if since is None else naive_local >= since
+            if k + 1 < len(self.eras):
+                era &= naive_local < self.eras[k + 1][0]
+            hit = np.zeros(len(times), dtype=bool)
+            for start, end in sessions:
+                hit |= (minute < end) & (minute + max(length, 1) > start)
+            out |= era & hit
+        return out & day_ok
+
+    def session_bars(self, start, end, timeframe: str = '1h') -> pd.DatetimeIndex:
+        """Naive UTC bar open times in [start, end] that overlap a session."""
+        step = pd.Timedelta(milliseconds=timeframe_ms(timeframe))
+        bars = pd.date_range(pd.Timestamp(start).floor(step), pd.Timestamp(end), freq=step)
+        return bars[self.is_open(bars, timeframe)]
+
+
+CALENDARS = {
+    'CRYPTO': MarketCalendar('CRYPTO', weekdays=ALL_DAYS),
+    'NYSE': MarketCalendar('NYSE', 'America/New_York', (('09:30', '16:00'),)),
+    'BIST': MarketCalendar('BIST', 'Europe/Istanbul', (('10:00', '18:00'),)),
+    'HKEX': MarketCalendar('HKEX', 'Asia/Hong_Kong', (('09:30', '12:00'), ('13:00', '16:00'))),
+    # Tokyo extended the afternoon session to 15:30 on 2024-11-05
+    'TSE': MarketCalendar('TSE', 'Asia/Tokyo', (('09:00', '11:30'), ('12:30', '15:00')),
+                          eras=[('2024-11-05', (('09:00', '11:30'), ('12:30', '15:30')))]),
+}
+
+SUFFIXES = {'IS': 'BIST', 'HK': 'HKEX', 'T': 'TSE'}
+
+
+def market_for(symbol: str) -> str:
+    """'BTC/USDT' / 'ETH_USDT' -> CRYPTO, 'THYAO.IS' -> BIST, '0700.HK' -> HKEX, '7203.T' -> TSE, else NYSE."""
+    if '/' in symbol or 'USDT' in symbol:
+        return 'CRYPTO'
+    for sep in ('.', '_'):
+        if sep in symbol:
+            market = SUFFIXES.get(symbol.rsplit(sep, 1)[1].upper())
+            if market:
+                return market
+    return 'NYSE'